@@ -0,0 +1,113 @@
+"""Actuator Mirror for Dual Smart Thermostat."""
+
+from datetime import timedelta
+
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant, State
+import homeassistant.util.dt as dt_util
+
+from custom_components.dual_smart_thermostat.control_engine import ActuatorState
+
+
+class ActuatorMirror:
+    """Local copy of the states of the switches a thermostat controls.
+
+    The thermostat feeds the mirror from its state change listeners, so the
+    control loop can check if a switch is on, and for how long, without
+    looking it up in the state machine.
+    """
+
+    def __init__(self, entity_ids: list) -> None:
+        self.entity_ids = [entity_id for entity_id in entity_ids if entity_id]
+        self._states: dict[str, str | None] = {}
+        # utc timestamps of the last transitions of the switches
+        self._since: dict[str, float] = {}
+        self._on: dict[str, bool] = {}
+        # utc timestamps of the last reports and keep-alive resends
+        self._reported: dict[str, float] = {}
+        self._resent: dict[str, float] = {}
+
+    def seed(self, hass: HomeAssistant) -> None:
+        """Copy the current states of all switches from the state machine."""
+        for entity_id in self.entity_ids:
+            self.update(entity_id, hass.states.get(entity_id))
+
+    def update(self, entity_id: str, state: State | None) -> None:
+        """Store the new state of a switch."""
+        if state is None:
+            self._states[entity_id] = None
+            self._since[entity_id] = 0.0
+            self._on[entity_id] = False
+            self._reported.pop(entity_id, None)
+            return
+        self._states[entity_id] = state.state
+        self._since[entity_id] = state.last_changed.timestamp()
+        self._on[entity_id] = state.state == STATE_ON
+        self._reported[entity_id] = state.last_updated.timestamp()
+
+    def record_resend(self, entity_id: str) -> None:
+        """Record that keep-alive resent the state the switch reports."""
+        self._resent[entity_id] = dt_util.utcnow().timestamp()
+
+    def is_on(self, entity_id: str | None) -> bool:
+        """If the switch is currently on."""
+        return self._on.get(entity_id, False)
+
+    def snapshot(self, entity_id: str | None) -> ActuatorState | None:
+        """Return the state of a switch for the control engine.
+
+        Returns None if no switch is configured.
+        """
+        if entity_id is None:
+            return None
+        return ActuatorState(
+            self._states.get(entity_id),
+            self._since.get(entity_id, 0.0),
+            self._reported.get(entity_id),
+            self._resent.get(entity_id, 0.0),
+        )
+
+    def is_state_for(
+        self, entity_id: str, state: str, duration: timedelta | None
+    ) -> bool:
+        """If the switch has been in state for at least duration.
+
+        Unlike condition.state the duration is inclusive, so the recheck
+        scheduled with seconds_until is not blocked at the boundary. A switch
+        without a duration only has to be in the given state.
+        """
+        if self._states.get(entity_id) != state:
+            return False
+        if duration is None:
+            return True
+        return (
+            dt_util.utcnow().timestamp() - self._since[entity_id]
+            >= duration.total_seconds()
+        )
+
+    def is_switched_for(self, entity_id: str, duration: timedelta | None) -> bool:
+        """If the switch has been on or off for at least duration."""
+        if self._on.get(entity_id, False):
+            return self.is_state_for(entity_id, STATE_ON, duration)
+        return self.is_state_for(entity_id, STATE_OFF, duration)
+
+    def is_stale(self, entity_id: str, threshold: timedelta) -> bool:
+        """If the switch has not reported its state for longer than threshold."""
+        if (reported := self._reported.get(entity_id)) is None:
+            return True
+        return dt_util.utcnow().timestamp() - reported > threshold.total_seconds()
+
+    def seconds_until(self, entity_id: str, duration: timedelta) -> float | None:
+        """Seconds until the switch has been in its current state for duration.
+
+        Returns None if the switch has no state or has been in its current
+        state for duration already.
+        """
+        if self._states.get(entity_id) is None:
+            return None
+        remaining = (
+            self._since[entity_id]
+            + duration.total_seconds()
+            - dt_util.utcnow().timestamp()
+        )
+        return remaining if remaining > 0 else None
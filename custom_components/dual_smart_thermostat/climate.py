@@ -1,10 +1,12 @@
 """Adds support for dual smart thermostat units."""
 
 import asyncio
+from collections.abc import Coroutine
 import datetime
 from datetime import timedelta
+from functools import partial
 import logging
-import math
+from time import perf_counter
 
 from homeassistant.components.climate import (
     PLATFORM_SCHEMA,
@@ -32,48 +34,75 @@ from homeassistant.const import (
     ATTR_TEMPERATURE,
     CONF_NAME,
     CONF_UNIQUE_ID,
-    EVENT_HOMEASSISTANT_START,
     PRECISION_HALVES,
     PRECISION_TENTHS,
     PRECISION_WHOLE,
     SERVICE_TURN_OFF,
     SERVICE_TURN_ON,
-    STATE_ON,
-    STATE_OPEN,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
+    Platform,
 )
 from homeassistant.core import (
     DOMAIN as HA_DOMAIN,
-    CoreState,
+    HassJob,
     HomeAssistant,
+    ServiceResponse,
     State,
+    SupportsResponse,
     callback,
 )
-from homeassistant.helpers import condition
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import discovery, entity_platform
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import (
-    EventStateChangedData,
-    async_call_later,
-    async_track_state_change_event,
-    async_track_time_interval,
-)
+from homeassistant.helpers.event import EventStateChangedData, async_call_later
 from homeassistant.helpers.reload import async_setup_reload_service
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType, EventType
+import homeassistant.util.dt as dt_util
 import voluptuous as vol
 
+from custom_components.dual_smart_thermostat.actuator_mirror import ActuatorMirror
+from custom_components.dual_smart_thermostat.control_engine import (
+    Action,
+    ControlPlan,
+    ControlSnapshot,
+    Device,
+    Intent,
+    plan_cooling,
+    plan_heat_cool,
+    plan_heating,
+    plan_pwm,
+)
+from custom_components.dual_smart_thermostat.control_scheduler import ControlScheduler
+from custom_components.dual_smart_thermostat.control_stats import (
+    DATA_STATISTICS,
+    DATA_STATISTICS_SENSORS,
+    ControlStats,
+)
+from custom_components.dual_smart_thermostat.decision_log import DecisionLog
+from custom_components.dual_smart_thermostat.keep_alive import KeepAliveScheduler
 from custom_components.dual_smart_thermostat.opening_manager import OpeningManager
+from custom_components.dual_smart_thermostat.pid import PidGains
+from custom_components.dual_smart_thermostat.pwm import PwmController
+from custom_components.dual_smart_thermostat.sensor_aggregator import SensorAggregator
+from custom_components.dual_smart_thermostat.sensor_filter import SensorFilter
+from custom_components.dual_smart_thermostat.sensor_parser import SensorStateParser
+from custom_components.dual_smart_thermostat.startup_coordinator import (
+    StartupCoordinator,
+)
+from custom_components.dual_smart_thermostat.state_dispatcher import StateDispatcher
+from custom_components.dual_smart_thermostat.thermal_model import ThermalModel
 
 from . import DOMAIN, PLATFORMS
 from .const import (
-    ATTR_TIMEOUT,
     CONF_AC_MODE,
     CONF_AUX_HEATER,
     CONF_AUX_HEATING_DUAL_MODE,
     CONF_AUX_HEATING_TIMEOUT,
     CONF_COLD_TOLERANCE,
+    CONF_CONTROL_MODE,
     CONF_COOLER,
     CONF_FLOOR_SENSOR,
     CONF_HEAT_COOL_MODE,
@@ -81,29 +110,69 @@ from .const import (
     CONF_HOT_TOLERANCE,
     CONF_INITIAL_HVAC_MODE,
     CONF_KEEP_ALIVE,
+    CONF_KEEP_ALIVE_MAX_RATE,
+    CONF_KEEP_ALIVE_MODE,
+    CONF_KEEP_ALIVE_STALENESS,
     CONF_MAX_FLOOR_TEMP,
     CONF_MAX_TEMP,
     CONF_MIN_DUR,
     CONF_MIN_FLOOR_TEMP,
     CONF_MIN_TEMP,
     CONF_OPENINGS,
+    CONF_OUTSIDE_SENSOR,
+    CONF_PID_KD,
+    CONF_PID_KI,
+    CONF_PID_KP,
     CONF_PRECISION,
+    CONF_PWM_INTEGRAL_TIME,
+    CONF_PWM_PERIOD,
+    CONF_PWM_PROPORTIONAL_BAND,
     CONF_SENSOR,
+    CONF_SENSOR_AGGREGATION,
+    CONF_SENSOR_COALESCE,
+    CONF_SENSOR_FILTER,
+    CONF_STARTUP_WINDOW,
+    CONF_STATISTICS,
     CONF_TARGET_TEMP,
     CONF_TARGET_TEMP_HIGH,
     CONF_TARGET_TEMP_LOW,
     CONF_TEMP_STEP,
+    CONF_THERMAL_MODEL,
+    CONF_THERMAL_MODEL_HORIZON,
+    CONF_UNRECORDED_ATTRIBUTES,
+    CONF_ZONES,
     DEFAULT_MAX_FLOOR_TEMP,
     DEFAULT_NAME,
+    DEFAULT_PID_KD,
+    DEFAULT_PID_KI,
+    DEFAULT_PID_KP,
+    DEFAULT_PWM_PERIOD,
+    DEFAULT_PWM_PROPORTIONAL_BAND,
+    DEFAULT_THERMAL_MODEL_HORIZON,
     DEFAULT_TOLERANCE,
     PRESET_ANTI_FREEZE,
+    SENSOR_FILTER_SCHEMA,
+    SERVICE_GET_STATISTICS,
     TIMED_OPENING_SCHEMA,
+    WEIGHTED_SENSOR_SCHEMA,
+    ControlMode,
+    KeepAliveMode,
+    SensorAggregation,
     ToleranceDevice,
 )
 
 ATTR_PREV_TARGET = "prev_target_temp"
 ATTR_PREV_TARGET_LOW = "prev_target_temp_low"
 ATTR_PREV_TARGET_HIGH = "prev_target_temp_high"
+ATTR_PWM_DUTY_CYCLE = "pwm_duty_cycle"
+ATTR_CONTROL_INTEGRAL = "control_integral"
+ATTR_HEATING_RATE = "heating_rate"
+ATTR_COOLING_RATE = "cooling_rate"
+ATTR_OUTDOOR_COUPLING = "outdoor_coupling"
+ATTR_THERMAL_MODEL_SAMPLES = "thermal_model_samples"
+
+# keeps float rounding at a switching threshold on the full control path
+THRESHOLD_MARGIN = 1e-6
 
 CONF_PRESETS = {
     p: f"{p.replace(' ', '_').lower()}"
@@ -142,50 +211,130 @@ FLOOR_TEMPERATURE_SCHEMA = {
     vol.Optional(CONF_MIN_FLOOR_TEMP): vol.Coerce(float),
 }
 
+THERMAL_MODEL_SCHEMA = {
+    vol.Optional(CONF_OUTSIDE_SENSOR): cv.entity_id,
+    vol.Optional(CONF_THERMAL_MODEL, default=False): cv.boolean,
+    vol.Optional(
+        CONF_THERMAL_MODEL_HORIZON, default=DEFAULT_THERMAL_MODEL_HORIZON
+    ): vol.All(cv.time_period, cv.positive_timedelta),
+}
+
 OPENINGS_SCHEMA = {
     vol.Optional(CONF_OPENINGS): [vol.Any(cv.entity_id, TIMED_OPENING_SCHEMA)]
 }
 
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
+THERMOSTAT_SCHEMA = {
+    vol.Required(CONF_HEATER): cv.entity_id,
+    vol.Optional(CONF_COOLER): cv.entity_id,
+    vol.Required(CONF_SENSOR): vol.Any(
+        cv.entity_id, [vol.Any(cv.entity_id, WEIGHTED_SENSOR_SCHEMA)]
+    ),
+    vol.Optional(CONF_SENSOR_AGGREGATION): vol.Coerce(SensorAggregation),
+    vol.Optional(CONF_SENSOR_FILTER): SENSOR_FILTER_SCHEMA,
+    vol.Optional(CONF_AC_MODE): cv.boolean,
+    vol.Optional(CONF_HEAT_COOL_MODE): cv.boolean,
+    vol.Optional(CONF_MAX_TEMP): vol.Coerce(float),
+    vol.Optional(CONF_MIN_DUR): vol.All(cv.time_period, cv.positive_timedelta),
+    vol.Optional(CONF_MIN_TEMP): vol.Coerce(float),
+    vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
+    vol.Optional(CONF_COLD_TOLERANCE, default=DEFAULT_TOLERANCE): vol.Coerce(float),
+    vol.Optional(CONF_HOT_TOLERANCE, default=DEFAULT_TOLERANCE): vol.Coerce(float),
+    vol.Optional(CONF_CONTROL_MODE, default=ControlMode.HYSTERESIS): vol.Coerce(
+        ControlMode
+    ),
+    vol.Optional(CONF_PWM_PERIOD, default=DEFAULT_PWM_PERIOD): vol.All(
+        cv.time_period, cv.positive_timedelta
+    ),
+    vol.Optional(
+        CONF_PWM_PROPORTIONAL_BAND, default=DEFAULT_PWM_PROPORTIONAL_BAND
+    ): vol.All(vol.Coerce(float), vol.Range(min=0, min_included=False)),
+    vol.Optional(CONF_PWM_INTEGRAL_TIME): vol.All(
+        cv.time_period, cv.positive_timedelta
+    ),
+    vol.Optional(CONF_PID_KP, default=DEFAULT_PID_KP): vol.All(
+        vol.Coerce(float), vol.Range(min=0)
+    ),
+    vol.Optional(CONF_PID_KI, default=DEFAULT_PID_KI): vol.All(
+        vol.Coerce(float), vol.Range(min=0)
+    ),
+    vol.Optional(CONF_PID_KD, default=DEFAULT_PID_KD): vol.All(
+        vol.Coerce(float), vol.Range(min=0)
+    ),
+    vol.Optional(CONF_TARGET_TEMP): vol.Coerce(float),
+    vol.Optional(CONF_TARGET_TEMP_HIGH): vol.Coerce(float),
+    vol.Optional(CONF_TARGET_TEMP_LOW): vol.Coerce(float),
+    vol.Optional(CONF_KEEP_ALIVE): vol.All(cv.time_period, cv.positive_timedelta),
+    vol.Optional(CONF_KEEP_ALIVE_MAX_RATE): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional(CONF_KEEP_ALIVE_MODE, default=KeepAliveMode.ON_DIVERGENCE): vol.Coerce(
+        KeepAliveMode
+    ),
+    vol.Optional(CONF_KEEP_ALIVE_STALENESS): vol.All(
+        cv.time_period, cv.positive_timedelta
+    ),
+    vol.Optional(CONF_SENSOR_COALESCE): vol.All(cv.time_period, cv.positive_timedelta),
+    vol.Optional(CONF_STARTUP_WINDOW): vol.All(cv.time_period, cv.positive_timedelta),
+    vol.Optional(CONF_STATISTICS, default=False): cv.boolean,
+    vol.Optional(CONF_INITIAL_HVAC_MODE): vol.In(
+        [HVACMode.COOL, HVACMode.HEAT, HVACMode.OFF, HVACMode.HEAT_COOL]
+    ),
+    vol.Optional(CONF_PRECISION): vol.In(
+        [PRECISION_TENTHS, PRECISION_HALVES, PRECISION_WHOLE]
+    ),
+    vol.Optional(CONF_TEMP_STEP): vol.In(
+        [PRECISION_TENTHS, PRECISION_HALVES, PRECISION_WHOLE]
+    ),
+    vol.Optional(CONF_UNIQUE_ID): cv.string,
+    vol.Optional(CONF_UNRECORDED_ATTRIBUTES, default=False): cv.boolean,
+    **{vol.Optional(v): PRESET_SCHEMA for (k, v) in CONF_PRESETS.items()},
+    **SECONDARY_HEATING_SCHEMA,
+    **FLOOR_TEMPERATURE_SCHEMA,
+    **THERMAL_MODEL_SCHEMA,
+    **OPENINGS_SCHEMA,
+    # Add the old presets schema to avoid breaking change
+    **{vol.Optional(v): vol.Coerce(float) for (k, v) in CONF_PRESETS_OLD.items()},
+}
+
+# identify a single thermostat, so they are not shared between zones
+ZONE_KEYS = (CONF_HEATER, CONF_SENSOR, CONF_NAME, CONF_UNIQUE_ID)
+
+
+def _zone_key(key: vol.Marker) -> vol.Marker:
+    """Zones need a name and get no defaults, so the shared settings apply."""
+    if key == CONF_NAME:
+        return vol.Required(CONF_NAME)
+    if isinstance(key, vol.Optional):
+        return vol.Optional(key.schema)
+    return key
+
+
+ZONE_SCHEMA = vol.Schema(
+    {_zone_key(key): value for key, value in THERMOSTAT_SCHEMA.items()}
+)
+
+THERMOSTAT_PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(THERMOSTAT_SCHEMA)
+
+ZONES_PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
-        vol.Required(CONF_HEATER): cv.entity_id,
-        vol.Optional(CONF_COOLER): cv.entity_id,
-        vol.Required(CONF_SENSOR): cv.entity_id,
-        vol.Optional(CONF_AC_MODE): cv.boolean,
-        vol.Optional(CONF_HEAT_COOL_MODE): cv.boolean,
-        vol.Optional(CONF_MAX_TEMP): vol.Coerce(float),
-        vol.Optional(CONF_MIN_DUR): vol.All(cv.time_period, cv.positive_timedelta),
-        vol.Optional(CONF_MIN_TEMP): vol.Coerce(float),
-        vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
-        vol.Optional(CONF_COLD_TOLERANCE, default=DEFAULT_TOLERANCE): vol.Coerce(float),
-        vol.Optional(CONF_HOT_TOLERANCE, default=DEFAULT_TOLERANCE): vol.Coerce(float),
-        vol.Optional(CONF_TARGET_TEMP): vol.Coerce(float),
-        vol.Optional(CONF_TARGET_TEMP_HIGH): vol.Coerce(float),
-        vol.Optional(CONF_TARGET_TEMP_LOW): vol.Coerce(float),
-        vol.Optional(CONF_KEEP_ALIVE): vol.All(cv.time_period, cv.positive_timedelta),
-        vol.Optional(CONF_INITIAL_HVAC_MODE): vol.In(
-            [HVACMode.COOL, HVACMode.HEAT, HVACMode.OFF, HVACMode.HEAT_COOL]
-        ),
-        vol.Optional(CONF_PRECISION): vol.In(
-            [PRECISION_TENTHS, PRECISION_HALVES, PRECISION_WHOLE]
+        **{
+            key: value
+            for key, value in THERMOSTAT_SCHEMA.items()
+            if key not in ZONE_KEYS
+        },
+        vol.Required(CONF_ZONES): vol.All(
+            cv.ensure_list, vol.Length(min=1), [ZONE_SCHEMA]
         ),
-        vol.Optional(CONF_TEMP_STEP): vol.In(
-            [PRECISION_TENTHS, PRECISION_HALVES, PRECISION_WHOLE]
-        ),
-        vol.Optional(CONF_UNIQUE_ID): cv.string,
     }
-).extend({vol.Optional(v): PRESET_SCHEMA for (k, v) in CONF_PRESETS.items()})
+)
 
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(SECONDARY_HEATING_SCHEMA)
 
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(FLOOR_TEMPERATURE_SCHEMA)
+def _validate_platform(config: ConfigType) -> ConfigType:
+    """Validate a single thermostat or zones sharing the platform settings."""
+    if CONF_ZONES in config:
+        return ZONES_PLATFORM_SCHEMA(config)
+    return THERMOSTAT_PLATFORM_SCHEMA(config)
 
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(OPENINGS_SCHEMA)
 
-# Add the old presets schema to avoid breaking change
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
-    {vol.Optional(v): vol.Coerce(float) for (k, v) in CONF_PRESETS_OLD.items()}
-)
+PLATFORM_SCHEMA = _validate_platform
 
 
 async def async_setup_platform(
@@ -198,12 +347,35 @@ async def async_setup_platform(
 
     await async_setup_reload_service(hass, DOMAIN, PLATFORMS)
 
+    entity_platform.async_get_current_platform().async_register_entity_service(
+        SERVICE_GET_STATISTICS,
+        {},
+        "async_get_statistics",
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    if CONF_ZONES not in config:
+        async_add_entities([_create_thermostat(hass, config)])
+        return
+
+    shared = {key: value for key, value in config.items() if key != CONF_ZONES}
+    async_add_entities(
+        [_create_thermostat(hass, {**shared, **zone}) for zone in config[CONF_ZONES]]
+    )
+
+
+def _create_thermostat(
+    hass: HomeAssistant, config: ConfigType
+) -> "DualSmartThermostat":
+    """Create the thermostat of a validated thermostat config."""
     name = config[CONF_NAME]
     heater_entity_id = config[CONF_HEATER]
     aux_heater_entity_id = config.get(CONF_AUX_HEATER)
     aux_heater_timeout = config.get(CONF_AUX_HEATING_TIMEOUT)
     aux_heater_dual_mode = config.get(CONF_AUX_HEATING_DUAL_MODE)
-    sensor_entity_id = config[CONF_SENSOR]
+    sensors = config[CONF_SENSOR]
+    sensor_aggregation = config.get(CONF_SENSOR_AGGREGATION)
+    sensor_filter = config.get(CONF_SENSOR_FILTER)
     if cooler_entity_id := config.get(CONF_COOLER):
         if cooler_entity_id == heater_entity_id:
             _LOGGER.warning(
@@ -212,6 +384,16 @@ async def async_setup_platform(
             )
             cooler_entity_id = None
     sensor_floor_entity_id = config.get(CONF_FLOOR_SENSOR)
+    outside_sensor_entity_id = config.get(CONF_OUTSIDE_SENSOR)
+    thermal_model = None
+    if config.get(CONF_THERMAL_MODEL):
+        if outside_sensor_entity_id is None:
+            _LOGGER.warning(
+                "'thermal_model' needs an 'outside_sensor' entity. "
+                "'thermal_model' will be ignored"
+            )
+        else:
+            thermal_model = ThermalModel(config[CONF_THERMAL_MODEL_HORIZON])
     openings = config.get(CONF_OPENINGS)
     min_temp = config.get(CONF_MIN_TEMP)
     max_temp = config.get(CONF_MAX_TEMP)
@@ -226,6 +408,17 @@ async def async_setup_platform(
     cold_tolerance = config.get(CONF_COLD_TOLERANCE)
     hot_tolerance = config.get(CONF_HOT_TOLERANCE)
     keep_alive = config.get(CONF_KEEP_ALIVE)
+    keep_alive_max_rate = config.get(CONF_KEEP_ALIVE_MAX_RATE)
+    keep_alive_mode = config.get(CONF_KEEP_ALIVE_MODE)
+    keep_alive_staleness = config.get(CONF_KEEP_ALIVE_STALENESS)
+    sensor_coalesce = config.get(CONF_SENSOR_COALESCE)
+    startup_window = config.get(CONF_STARTUP_WINDOW)
+    control_stats = ControlStats() if config.get(CONF_STATISTICS) else None
+    pwm_controller = None
+    if (gains := _control_gains(config)) is not None:
+        pwm_controller = PwmController(
+            hass, config[CONF_PWM_PERIOD], gains, min_cycle_duration
+        )
     initial_hvac_mode = config.get(CONF_INITIAL_HVAC_MODE)
     presets_dict = {
         key: config[value] for key, value in CONF_PRESETS.items() if value in config
@@ -258,44 +451,77 @@ async def async_setup_platform(
     target_temperature_step = config.get(CONF_TEMP_STEP)
     unit = hass.config.units.temperature_unit
     unique_id = config.get(CONF_UNIQUE_ID)
+    thermostat_class = (
+        UnrecordedDualSmartThermostat
+        if config.get(CONF_UNRECORDED_ATTRIBUTES)
+        else DualSmartThermostat
+    )
 
-    async_add_entities(
-        [
-            DualSmartThermostat(
-                name,
-                heater_entity_id,
-                aux_heater_entity_id,
-                aux_heater_timeout,
-                aux_heater_dual_mode,
-                cooler_entity_id,
-                sensor_entity_id,
-                sensor_floor_entity_id,
-                min_temp,
-                max_temp,
-                max_floor_temp,
-                min_floor_temp,
-                target_temp,
-                target_temp_high,
-                target_temp_low,
-                ac_mode,
-                heat_cool_mode,
-                min_cycle_duration,
-                cold_tolerance,
-                hot_tolerance,
-                keep_alive,
-                initial_hvac_mode,
-                presets,
-                presets_range,
-                precision,
-                target_temperature_step,
-                unit,
-                unique_id,
-                OpeningManager(hass, openings),
-            )
-        ]
+    return thermostat_class(
+        name,
+        heater_entity_id,
+        aux_heater_entity_id,
+        aux_heater_timeout,
+        aux_heater_dual_mode,
+        cooler_entity_id,
+        SensorAggregator(sensors, sensor_aggregation),
+        sensor_filter,
+        sensor_floor_entity_id,
+        min_temp,
+        max_temp,
+        max_floor_temp,
+        min_floor_temp,
+        target_temp,
+        target_temp_high,
+        target_temp_low,
+        ac_mode,
+        heat_cool_mode,
+        min_cycle_duration,
+        cold_tolerance,
+        hot_tolerance,
+        keep_alive,
+        keep_alive_max_rate,
+        keep_alive_mode,
+        keep_alive_staleness,
+        sensor_coalesce,
+        startup_window,
+        control_stats,
+        initial_hvac_mode,
+        presets,
+        presets_range,
+        precision,
+        target_temperature_step,
+        unit,
+        unique_id,
+        OpeningManager(hass, openings),
+        pwm_controller,
+        outside_sensor_entity_id,
+        thermal_model,
     )
 
 
+def _control_gains(config: ConfigType) -> PidGains | None:
+    """Return the gains of time-proportional control, in seconds and degrees.
+
+    The pwm control mode is a PI controller of the proportional band and
+    integral time. The pid gains are configured per hour.
+    """
+    match config.get(CONF_CONTROL_MODE):
+        case ControlMode.PWM:
+            kp = 1 / config[CONF_PWM_PROPORTIONAL_BAND]
+            integral_time = config.get(CONF_PWM_INTEGRAL_TIME)
+            return PidGains(
+                kp, kp / integral_time.total_seconds() if integral_time else 0.0
+            )
+        case ControlMode.PID:
+            return PidGains(
+                config[CONF_PID_KP],
+                config[CONF_PID_KI] / 3600,
+                config[CONF_PID_KD] * 3600,
+            )
+    return None
+
+
 class DualSmartThermostat(ClimateEntity, RestoreEntity):
     """Representation of a Dual Smart Thermostat device."""
 
@@ -307,7 +533,8 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         aux_heater_timeout,
         aux_heater_dual_mode,
         cooler_entity_id,
-        sensor_entity_id,
+        sensor_aggregator,
+        sensor_filter,
         sensor_floor_entity_id,
         min_temp,
         max_temp,
@@ -322,6 +549,12 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         cold_tolerance,
         hot_tolerance,
         keep_alive,
+        keep_alive_max_rate,
+        keep_alive_mode,
+        keep_alive_staleness,
+        sensor_coalesce,
+        startup_window,
+        control_stats,
         initial_hvac_mode,
         presets,
         presets_range,
@@ -330,6 +563,9 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         unit,
         unique_id,
         opening_manager,
+        pwm_controller,
+        outside_sensor_entity_id,
+        thermal_model,
     ) -> None:
         """Initialize the thermostat."""
         self._attr_name = name
@@ -339,9 +575,35 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         self.aux_heater_timeout: timedelta = aux_heater_timeout
         self.aux_heater_dual_mode: bool = aux_heater_dual_mode or False
         self.cooler_entity_id = cooler_entity_id
-        self.sensor_entity_id = sensor_entity_id
+        self.actuators = ActuatorMirror(
+            [heater_entity_id, aux_heater_entity_id, cooler_entity_id]
+        )
+        self._device_entity_ids = {
+            Device.HEATER: heater_entity_id,
+            Device.AUX_HEATER: aux_heater_entity_id,
+            Device.COOLER: cooler_entity_id,
+        }
+        self.sensor_aggregator = sensor_aggregator
+        self.sensor_entity_ids = sensor_aggregator.sensor_entities
+        self._sensor_filters = (
+            {
+                sensor_entity_id: SensorFilter(**sensor_filter)
+                for sensor_entity_id in self.sensor_entity_ids
+            }
+            if sensor_filter
+            else {}
+        )
+        self._sensor_parsers = {
+            sensor_entity_id: SensorStateParser(sensor_entity_id)
+            for sensor_entity_id in self.sensor_entity_ids
+        }
         self.sensor_floor_entity_id = sensor_floor_entity_id
+        self._floor_sensor_parser = SensorStateParser(sensor_floor_entity_id)
         self.opening_manager = opening_manager
+        self.outside_sensor_entity_id = outside_sensor_entity_id
+        self._outside_sensor_parser = SensorStateParser(outside_sensor_entity_id)
+        self._outside_temp: float | None = None
+        self._thermal_model: ThermalModel | None = thermal_model
 
         self.ac_mode = ac_mode
         self._heat_cool_mode = heat_cool_mode
@@ -349,6 +611,36 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         self._cold_tolerance = cold_tolerance
         self._hot_tolerance = hot_tolerance
         self._keep_alive = keep_alive
+        self._keep_alive_max_rate = keep_alive_max_rate
+        self._keep_alive_mode = keep_alive_mode or KeepAliveMode.ON_DIVERGENCE
+        self._keep_alive_staleness: timedelta = keep_alive_staleness or keep_alive
+        self._sensor_coalesce: timedelta = sensor_coalesce
+        self._sensor_coalesce_unsub = None
+        self._sensor_coalesce_pending = False
+        self._sensor_coalesce_band = 0
+        self._startup_window: timedelta = startup_window
+        # with a startup window the first control pass waits for the startup
+        self._startup_pending = bool(startup_window)
+        self._initial_check_task: asyncio.Task | None = None
+        self._stats: ControlStats | None = control_stats
+        self._pwm: PwmController | None = pwm_controller
+        self._cycle_recheck_unsub = None
+        self._cycle_recheck_job = HassJob(
+            self._async_cycle_recheck,
+            "dual smart thermostat cycle recheck",
+            cancel_on_shutdown=True,
+        )
+        self._aux_recheck_unsub = None
+        self._aux_recheck_job = HassJob(
+            self._async_aux_recheck,
+            "dual smart thermostat aux recheck",
+            cancel_on_shutdown=True,
+        )
+        self._state_fingerprint: tuple | None = None
+        self._attributes_key: tuple | None = None
+        self._attributes: dict = {}
+        self._write_task: asyncio.Task | None = None
+        self._switch_thresholds: dict[ToleranceDevice, tuple[float, float]] = {}
         self._saved_target_temp = target_temp or next(iter(presets.values()), None)
         self._saved_target_temp_low = None
         self._saved_target_temp_high = None
@@ -379,7 +671,8 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         self._active = False
         self._cur_temp = None
         self._cur_floor_temp = None
-        self._temp_lock = asyncio.Lock()
+        self._control_scheduler = ControlScheduler()
+        self._decision_log = DecisionLog(_LOGGER)
         self._min_temp = min_temp
         self._max_temp = max_temp
         self._max_floor_temp = max_floor_temp
@@ -414,99 +707,137 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         await super().async_added_to_hass()
 
         # Add listener
+        dispatcher = StateDispatcher.async_get(self.hass)
         self.async_on_remove(
-            async_track_state_change_event(
-                self.hass, [self.sensor_entity_id], self._async_sensor_changed
-            )
+            dispatcher.async_track(self.sensor_entity_ids, self._async_sensor_changed)
         )
 
         self.async_on_remove(
-            async_track_state_change_event(
-                self.hass, [self.heater_entity_id], self._async_switch_changed
-            )
+            dispatcher.async_track([self.heater_entity_id], self._async_switch_changed)
         )
 
+        if self.aux_heater_entity_id:
+            self.async_on_remove(
+                dispatcher.async_track(
+                    [self.aux_heater_entity_id],
+                    self._async_aux_heater_changed,
+                )
+            )
+
         if self.cooler_entity_id:
             self.async_on_remove(
-                async_track_state_change_event(
-                    self.hass,
+                dispatcher.async_track(
                     [self.cooler_entity_id],
                     self._async_cooler_changed,
                 )
             )
 
+        self.actuators.seed(self.hass)
+
         if self.sensor_floor_entity_id is not None:
             _LOGGER.debug(
                 "Adding floor sensor listener: %s", self.sensor_floor_entity_id
             )
             self.async_on_remove(
-                async_track_state_change_event(
-                    self.hass,
+                dispatcher.async_track(
                     [self.sensor_floor_entity_id],
                     self._async_sensor_floor_changed,
                 )
             )
 
+        if self.outside_sensor_entity_id is not None:
+            self.async_on_remove(
+                dispatcher.async_track(
+                    [self.outside_sensor_entity_id],
+                    self._async_outside_sensor_changed,
+                )
+            )
+
+        if self._stats is not None:
+            self._async_publish_statistics()
+
         if self._keep_alive:
             self.async_on_remove(
-                async_track_time_interval(
-                    self.hass, self._async_control_climate, self._keep_alive
+                KeepAliveScheduler.async_get(self.hass).async_register(
+                    self.entity_id,
+                    self._keep_alive,
+                    self._async_control_climate,
+                    self._keep_alive_max_rate,
                 )
             )
 
+        if self._pwm is not None:
+            self.async_on_remove(self._pwm.async_listen(self._async_pwm_switch))
+
         if self.opening_manager.opening_entities:
             self.async_on_remove(
-                async_track_state_change_event(
-                    self.hass,
+                dispatcher.async_track(
                     self.opening_manager.opening_entities,
                     self._async_opening_changed,
                 )
             )
+            self.async_on_remove(
+                self.opening_manager.async_listen_timeouts(
+                    self._async_control_climate_forced
+                )
+            )
+            self.opening_manager.seed()
 
         @callback
         def _async_startup(*_) -> None:
             """Init on startup."""
 
-            sensor_state = self.hass.states.get(self.sensor_entity_id)
+            sensor_states = [
+                sensor_state
+                for sensor_entity_id in self.sensor_entity_ids
+                if (sensor_state := self.hass.states.get(sensor_entity_id))
+                and sensor_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+            ]
             if self.sensor_floor_entity_id:
                 floor_sensor_state = self.hass.states.get(self.sensor_floor_entity_id)
             else:
                 floor_sensor_state = None
 
-            if sensor_state and sensor_state.state not in (
-                STATE_UNAVAILABLE,
-                STATE_UNKNOWN,
-            ):
+            for sensor_state in sensor_states:
                 self._async_update_temp(sensor_state)
-                self.async_write_ha_state()
 
             if floor_sensor_state and floor_sensor_state.state not in (
                 STATE_UNAVAILABLE,
                 STATE_UNKNOWN,
             ):
                 self._async_update_floor_temp(floor_sensor_state)
-                self.async_write_ha_state()
 
-            switch_state = self.hass.states.get(self.heater_entity_id)
-            if switch_state and switch_state.state not in (
-                STATE_UNAVAILABLE,
-                STATE_UNKNOWN,
-            ):
-                self.hass.create_task(self._check_switch_initial_state())
+            if self.outside_sensor_entity_id:
+                self._async_update_outside_temp(
+                    self.hass.states.get(self.outside_sensor_entity_id)
+                )
+            self._async_thermal_model_switch()
+            self._async_update_thermal_model()
 
-            if self.cooler_entity_id is not None and (
-                cooler_switch_state := self.hass.states.get(self.cooler_entity_id)
+            if sensor_states or floor_sensor_state:
+                self._async_write_ha_state_if_changed()
+
+            switch_states = (
+                self.hass.states.get(entity_id)
+                for entity_id in (self.heater_entity_id, self.cooler_entity_id)
+                if entity_id is not None
+            )
+            if any(
+                switch_state
+                and switch_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+                for switch_state in switch_states
             ):
-                if switch_state and cooler_switch_state.state not in (
-                    STATE_UNAVAILABLE,
-                    STATE_UNKNOWN,
-                ):
-                    self.hass.create_task(self._check_switch_initial_state())
-
-        if self.hass.state == CoreState.running:
-            _async_startup()
-        else:
-            self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, _async_startup)
+                self._async_check_switch_initial_state_once()
+
+            if self._startup_pending:
+                self._startup_pending = False
+                self.hass.async_create_task(self._async_startup_control())
+
+        self.async_on_remove(
+            StartupCoordinator.async_get(self.hass).async_register(
+                self.entity_id, _async_startup, self._startup_window
+            )
+        )
 
         # Check If we have an old state
         if (old_state := await self.async_get_last_state()) is not None:
@@ -569,6 +900,31 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
                 self._attr_preset_mode = old_pres_mode
                 self._saved_target_temp = self._target_temp
 
+            # continue time-proportional control where it stopped
+            old_integral = old_state.attributes.get(ATTR_CONTROL_INTEGRAL)
+            if self._pwm is not None and old_integral is not None:
+                self._pwm.state.integral = float(old_integral)
+
+            # continue fitting the thermal model where it stopped, states
+            # saved without the model start a new fit
+            old_model = [
+                old_state.attributes.get(attribute)
+                for attribute in (
+                    ATTR_HEATING_RATE,
+                    ATTR_COOLING_RATE,
+                    ATTR_OUTDOOR_COUPLING,
+                    ATTR_THERMAL_MODEL_SAMPLES,
+                )
+            ]
+            if self._thermal_model is not None and None not in old_model:
+                heating_rate, cooling_rate, outdoor_coupling, samples = old_model
+                self._thermal_model.restore(
+                    float(heating_rate),
+                    float(cooling_rate),
+                    float(outdoor_coupling),
+                    int(samples),
+                )
+
             self._hvac_mode = hvac_mode
             self._max_floor_temp = (
                 old_state.attributes.get("max_floor_temp") or DEFAULT_MAX_FLOOR_TEMP
@@ -586,6 +942,7 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
 
         # Set correct support flag
         self._set_support_flags()
+        self._update_switching_thresholds()
 
     @property
     def should_poll(self) -> bool:
@@ -674,6 +1031,25 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
     @property
     def extra_state_attributes(self) -> dict:
         """Return entity specific state attributes to be saved."""
+        key = (
+            self._target_temp,
+            self._target_temp_low,
+            self._target_temp_high,
+            self._saved_target_temp,
+            self._saved_target_temp_low,
+            self._saved_target_temp_high,
+            self._attr_preset_mode,
+            self._attr_supported_features,
+            self._pwm.duty_cycle if self._pwm is not None else None,
+            self._pwm.state.integral if self._pwm is not None else None,
+            (self._thermal_model.samples if self._thermal_model is not None else None),
+        )
+        if key != self._attributes_key:
+            self._attributes_key = key
+            self._attributes = self._build_extra_state_attributes()
+        return self._attributes
+
+    def _build_extra_state_attributes(self) -> dict:
         attributes = {}
         if self._target_temp_low is not None:
             if self._attr_preset_mode != PRESET_NONE and self._is_range_mode():
@@ -690,39 +1066,68 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
                 attributes[ATTR_PREV_TARGET] = self._saved_target_temp
             else:
                 attributes[ATTR_PREV_TARGET] = self._target_temp
+        if self._pwm is not None:
+            attributes[ATTR_PWM_DUTY_CYCLE] = round(self._pwm.duty_cycle, 3)
+            attributes[ATTR_CONTROL_INTEGRAL] = self._pwm.state.integral
+        if self._thermal_model is not None:
+            attributes[ATTR_HEATING_RATE] = round(self._thermal_model.heating_rate, 4)
+            attributes[ATTR_COOLING_RATE] = round(self._thermal_model.cooling_rate, 4)
+            attributes[ATTR_OUTDOOR_COUPLING] = round(
+                self._thermal_model.outdoor_coupling, 4
+            )
+            attributes[ATTR_THERMAL_MODEL_SAMPLES] = self._thermal_model.samples
 
         return attributes
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Call climate mode based on current mode."""
         _LOGGER.debug("Setting hvac mode: %s", hvac_mode)
+        self._restart_pwm_period()
         match hvac_mode:
             case HVACMode.HEAT:
                 self._hvac_mode = HVACMode.HEAT
+                self._update_switching_thresholds()
                 await self._async_control_heating(force=True)
                 if self._is_cooler_active:
                     await self._async_cooler_turn_off()
 
             case HVACMode.COOL:
                 self._hvac_mode = HVACMode.COOL
+                self._update_switching_thresholds()
                 await self._async_control_cooling(force=True)
                 if self._is_device_active:
-                    await self._async_heater_turn_off()
+                    intents = [(self.heater_entity_id, self._async_heater_turn_off())]
                     if self._is_aux_heating_configured():
-                        await self._async_aux_heater_turn_off()
+                        intents.append(
+                            (
+                                self.aux_heater_entity_id,
+                                self._async_aux_heater_turn_off(),
+                            )
+                        )
+                    await self._async_dispatch(intents)
 
             case HVACMode.HEAT_COOL:
                 self._hvac_mode = HVACMode.HEAT_COOL
+                self._update_switching_thresholds()
                 await self._async_control_heat_cool(force=True)
 
             case HVACMode.OFF:
                 self._hvac_mode = HVACMode.OFF
+                self._update_switching_thresholds()
+                intents = []
                 if self._is_device_active:
-                    await self._async_heater_turn_off()
+                    intents.append(
+                        (self.heater_entity_id, self._async_heater_turn_off())
+                    )
                 if self.cooler_entity_id:
-                    await self._async_cooler_turn_off()
+                    intents.append(
+                        (self.cooler_entity_id, self._async_cooler_turn_off())
+                    )
                 if self._is_aux_heating_configured():
-                    await self._async_aux_heater_turn_off()
+                    intents.append(
+                        (self.aux_heater_entity_id, self._async_aux_heater_turn_off())
+                    )
+                await self._async_dispatch(intents)
 
             case _:
                 _LOGGER.error("Unrecognized hvac mode: %s", hvac_mode)
@@ -756,6 +1161,8 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
             self._target_temp_low = temp_low
             self._target_temp_high = temp_high
 
+        self._update_switching_thresholds()
+        self._restart_pwm_period()
         await self._async_control_climate(force=True)
         self.async_write_ha_state()
 
@@ -782,26 +1189,188 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
     ) -> None:
         """Handle temperature changes."""
         new_state = event.data.get("new_state")
-        _LOGGER.info("Sensor change: %s", new_state)
+        _LOGGER.debug("Sensor change: %s", new_state)
+        old_temp = self._cur_temp
         if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            # a multi sensor setup goes on with the remaining sensors
+            cur_temp = self.sensor_aggregator.remove(event.data["entity_id"])
+            if cur_temp is None or cur_temp == old_temp:
+                return
+            self._cur_temp = cur_temp
+        else:
+            self._async_update_temp(new_state)
+        self._async_update_thermal_model()
+        if self._startup_pending:
+            _LOGGER.debug("Waiting for the startup window, skipping control")
+            self._async_write_ha_state_if_changed()
+            return
+        if self._sensor_coalesce and self._async_coalesce_sensor_update():
             return
+        if self._can_skip_control():
+            _LOGGER.debug("Sensor update inside the switching band, skipping control")
+            self._async_write_ha_state_if_changed()
+            return
+        await self._async_control_climate()
+        self._async_write_ha_state_if_changed()
+
+    @callback
+    def _async_coalesce_sensor_update(self) -> bool:
+        """Check if the sensor update can be deferred to the coalescing window.
+
+        The first update opens a window and is processed right away. Updates
+        arriving inside the window are collapsed into a single control pass
+        at the end of it, unless they cross a switching threshold.
+        """
+        band = self._temp_band_position()
+        crossed = band != self._sensor_coalesce_band
+        self._sensor_coalesce_band = band
+
+        if self._sensor_coalesce_unsub is None:
+            self._sensor_coalesce_unsub = async_call_later(
+                self.hass,
+                self._sensor_coalesce,
+                self._async_sensor_coalesce_expired,
+            )
+            return False
+
+        if crossed:
+            _LOGGER.debug("Sensor update crossed a switching threshold")
+            self._sensor_coalesce_pending = False
+            return False
+
+        self._sensor_coalesce_pending = True
+        return True
 
-        self._async_update_temp(new_state)
+    async def _async_sensor_coalesce_expired(self, time=None) -> None:
+        """Run the deferred control pass at the end of the coalescing window."""
+        self._sensor_coalesce_unsub = None
+        if not self._sensor_coalesce_pending:
+            return
+        self._sensor_coalesce_pending = False
+        _LOGGER.debug("Running coalesced sensor update")
         await self._async_control_climate()
-        self.async_write_ha_state()
+        self._async_write_ha_state_if_changed()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel pending timers when the entity is removed."""
+        await super().async_will_remove_from_hass()
+        if self._sensor_coalesce_unsub is not None:
+            self._sensor_coalesce_unsub()
+            self._sensor_coalesce_unsub = None
+        if self._cycle_recheck_unsub is not None:
+            self._cycle_recheck_unsub()
+            self._cycle_recheck_unsub = None
+        self._cancel_aux_recheck()
+        if self._write_task is not None:
+            self._write_task.cancel()
+            self._write_task = None
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember what was written."""
+        self._state_fingerprint = self._fingerprint_state()
+        super().async_write_ha_state()
+
+    @callback
+    def _async_write_ha_state_if_changed(self) -> None:
+        """Write the state if anything exposed changed since the last write.
+
+        Writes requested within one loop iteration are coalesced into one.
+        """
+        if self._write_task is not None:
+            return
+        if self._fingerprint_state() == self._state_fingerprint:
+            return
+        self._write_task = self.hass.async_create_task(
+            self._async_flush_write(), "dual smart thermostat state write"
+        )
+
+    async def _async_flush_write(self) -> None:
+        self._write_task = None
+        if self._fingerprint_state() != self._state_fingerprint:
+            self.async_write_ha_state()
+
+    def _fingerprint_state(self) -> tuple:
+        """Return the exposed state, to detect if a write would change it."""
+        return (
+            self._hvac_mode,
+            self.hvac_action,
+            self._cur_temp,
+            self._target_temp,
+            self._target_temp_low,
+            self._target_temp_high,
+            self._attr_preset_mode,
+            self._attr_supported_features,
+            self._is_aux_heat,
+            tuple(self.extra_state_attributes.items()),
+        )
 
     async def _async_sensor_floor_changed(
         self, event: EventType[EventStateChangedData]
     ) -> None:
         """Handle floor temperature changes."""
         new_state = event.data.get("new_state")
-        _LOGGER.info("Sensor floor change: %s", new_state)
+        _LOGGER.debug("Sensor floor change: %s", new_state)
         if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
             return
 
         self._async_update_floor_temp(new_state)
         await self._async_control_climate()
-        self.async_write_ha_state()
+        self._async_write_ha_state_if_changed()
+
+    @callback
+    def _async_publish_statistics(self) -> None:
+        """Share the statistics with their diagnostic sensors."""
+        data = self.hass.data.setdefault(DOMAIN, {})
+        statistics = data.setdefault(DATA_STATISTICS, {})
+        statistics[self.entity_id] = self._stats
+
+        @callback
+        def _async_unpublish() -> None:
+            if statistics.get(self.entity_id) is self._stats:
+                del statistics[self.entity_id]
+
+        self.async_on_remove(_async_unpublish)
+
+        # the sensors outlive a reload of the thermostat
+        sensors = data.setdefault(DATA_STATISTICS_SENSORS, set())
+        if self.entity_id in sensors:
+            return
+        sensors.add(self.entity_id)
+        self.hass.async_create_task(
+            discovery.async_load_platform(
+                self.hass,
+                Platform.SENSOR,
+                DOMAIN,
+                {
+                    ATTR_ENTITY_ID: self.entity_id,
+                    CONF_NAME: self.name,
+                    CONF_UNIQUE_ID: self.unique_id,
+                },
+                {},
+            )
+        )
+
+    async def async_get_statistics(self) -> ServiceResponse:
+        """Return the control statistics of the thermostat."""
+        if self._stats is None:
+            raise ServiceValidationError(
+                f"Statistics are not enabled for {self.entity_id}"
+            )
+        return self._stats.as_dict()
+
+    async def _async_startup_control(self) -> None:
+        """Run the first control pass, held back until the startup slot."""
+        await self._async_control_climate()
+        self._async_write_ha_state_if_changed()
+
+    @callback
+    def _async_check_switch_initial_state_once(self) -> None:
+        """Check the initial switch state, unless a check is pending."""
+        if self._initial_check_task is None or self._initial_check_task.done():
+            self._initial_check_task = self.hass.async_create_task(
+                self._check_switch_initial_state()
+            )
 
     async def _check_switch_initial_state(self) -> None:
         """Prevent the device from keep running if HVACMode.OFF."""
@@ -810,46 +1379,26 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
                 "The climate mode is OFF, but the switch device is ON. Turning off device %s",
                 self.heater_entity_id,
             )
-            await self._async_heater_turn_off()
-            await self._async_cooler_turn_off()
+            await self._async_turn_off_heater_and_cooler()
 
     async def _async_opening_changed(
         self, event: EventType[EventStateChangedData]
     ) -> None:
         """Handle opening changes."""
         new_state = event.data.get("new_state")
-        _LOGGER.info("Opening changed: %s", new_state)
+        _LOGGER.debug("Opening changed: %s", new_state)
+        opening_entity = event.data.get("entity_id")
+        # timed openings are controlled by the opening manager timers
+        self.opening_manager.update(opening_entity, new_state)
         if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
             return
 
-        opening_entity = event.data.get("entity_id")
-        # get the opening timeout
-        opening_timeout = None
-        for opening in self.opening_manager.openings:
-            if opening_entity == opening[ATTR_ENTITY_ID]:
-                opening_timeout = opening[ATTR_TIMEOUT]
-                break
-
-        # schedule the closing of the opening
-        if opening_timeout is not None and (
-            new_state.state == STATE_OPEN or new_state.state == STATE_ON
-        ):
-            _LOGGER.debug(
-                "Scheduling state open of opening %s in %s",
-                opening_entity,
-                opening_timeout,
-            )
-            self.async_on_remove(
-                async_call_later(
-                    self.hass,
-                    opening_timeout,
-                    self._async_control_climate_forced,
-                )
-            )
+        if self.opening_manager.is_timer_running(opening_entity):
+            _LOGGER.debug("Waiting for the timeout of opening %s", opening_entity)
         else:
             await self._async_control_climate(force=True)
 
-        self.async_write_ha_state()
+        self._async_write_ha_state_if_changed()
 
     async def _async_control_climate(self, time=None, force=False) -> None:
         if self.cooler_entity_id is not None and self.hvac_mode == HVACMode.HEAT_COOL:
@@ -870,6 +1419,7 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         """Handle HVAC mode changes."""
         self._hvac_mode = hvac_mode
         # self._set_support_flags()
+        self._update_switching_thresholds()
         self.async_write_ha_state()
 
     @callback
@@ -877,274 +1427,328 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         """Handle heater switch state changes."""
         new_state = event.data.get("new_state")
         old_state = event.data.get("old_state")
+        self.actuators.update(self.heater_entity_id, new_state)
+        self._async_thermal_model_switch()
         if new_state is None:
             return
         if old_state is None:
-            self.hass.create_task(self._check_switch_initial_state())
-        self.async_write_ha_state()
+            self._async_check_switch_initial_state_once()
+        self._async_write_ha_state_if_changed()
 
     @callback
     def _async_cooler_changed(self, event: EventType[EventStateChangedData]) -> None:
         """Handle cooler switch state changes."""
         new_state = event.data.get("new_state")
+        self.actuators.update(self.cooler_entity_id, new_state)
+        self._async_thermal_model_switch()
         if new_state is None:
             return
-        self.async_write_ha_state()
+        self._async_write_ha_state_if_changed()
+
+    @callback
+    def _async_aux_heater_changed(
+        self, event: EventType[EventStateChangedData]
+    ) -> None:
+        """Handle aux heater switch state changes."""
+        new_state = event.data.get("new_state")
+        self.actuators.update(self.aux_heater_entity_id, new_state)
+        self._async_thermal_model_switch()
+        if new_state is None:
+            return
+        self._async_write_ha_state_if_changed()
 
     @callback
     def _async_update_temp(self, state: State) -> None:
         """Update thermostat with latest state from sensor."""
-        try:
-            cur_temp = float(state.state)
-            if not math.isfinite(cur_temp):
-                raise ValueError(f"Sensor has illegal state {state.state}")
-            self._cur_temp = cur_temp
-        except ValueError as ex:
-            _LOGGER.error("Unable to update from sensor: %s", ex)
+        cur_temp = self._sensor_parsers[state.entity_id].parse(state.state)
+        if cur_temp is None:
+            self._count_rejected_sample()
+            return
+        if sensor_filter := self._sensor_filters.get(state.entity_id):
+            cur_temp = sensor_filter.process(cur_temp, state.last_updated.timestamp())
+            if cur_temp is None:
+                _LOGGER.debug(
+                    "Reading %s of %s rejected by filter", state.state, state.entity_id
+                )
+                self._count_rejected_sample()
+                return
+        self._cur_temp = self.sensor_aggregator.update(state.entity_id, cur_temp)
 
     @callback
     def _async_update_floor_temp(self, state: State):
         """Update ermostat with latest floor temp state from floor temp sensor."""
-        try:
-            cur_floor_temp = float(state.state)
-            if not math.isfinite(cur_floor_temp):
-                raise ValueError(f"Sensor has illegal state {state.state}")
-            self._cur_floor_temp = float(state.state)
-        except ValueError as ex:
-            _LOGGER.error("Unable to update from floor temp sensor: %s", ex)
+        cur_floor_temp = self._floor_sensor_parser.parse(state.state)
+        if cur_floor_temp is None:
+            self._count_rejected_sample()
+            return
+        self._cur_floor_temp = cur_floor_temp
+
+    async def _async_outside_sensor_changed(
+        self, event: EventType[EventStateChangedData]
+    ) -> None:
+        """Handle outside temperature changes."""
+        new_state = event.data.get("new_state")
+        _LOGGER.debug("Outside sensor change: %s", new_state)
+        self._async_update_outside_temp(new_state)
+
+    @callback
+    def _async_update_outside_temp(self, state: State | None) -> None:
+        """Update the outside temperature the thermal model is fitted with."""
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            self._outside_temp = None
+        else:
+            self._outside_temp = self._outside_sensor_parser.parse(state.state)
+
+    @callback
+    def _async_update_thermal_model(self) -> None:
+        """Sample the temperatures into the thermal model."""
+        if self._thermal_model is not None:
+            self._thermal_model.observe(
+                dt_util.utcnow().timestamp(), self._cur_temp, self._outside_temp
+            )
+
+    @callback
+    def _async_thermal_model_switch(self) -> None:
+        """Tell the thermal model which switches run from now on."""
+        if self._thermal_model is not None:
+            self._thermal_model.switch(
+                dt_util.utcnow().timestamp(), *self._thermal_model_switches()
+            )
+
+    def _thermal_model_switches(self) -> tuple[bool, bool]:
+        """Return if the zone is heated and if it is cooled.
+
+        In ac mode the heater switch cools.
+        """
+        heater = self._is_heater_active
+        return (
+            (heater and not self.ac_mode) or self._is_aux_heat,
+            self._is_cooler_active or (heater and bool(self.ac_mode)),
+        )
+
+    @property
+    def _control_temp(self) -> float | None:
+        """The temperature hysteresis control switches on.
+
+        With a fitted thermal model it is the temperature predicted for the
+        horizon, moved by at most half of the tolerances so the switching
+        keeps a hysteresis.
+        """
+        model = self._thermal_model
+        if (
+            model is None
+            or self._pwm is not None
+            or not model.ready
+            or None in (self._cur_temp, self._outside_temp)
+        ):
+            return self._cur_temp
+        shift = (
+            model.predict(
+                self._cur_temp, self._outside_temp, *self._thermal_model_switches()
+            )
+            - self._cur_temp
+        )
+        return self._cur_temp + min(
+            max(shift, -self._cold_tolerance / 2), self._hot_tolerance / 2
+        )
 
     async def _async_control_heating_forced(self, time=None) -> None:
         """Call turn_on heater device."""
         _LOGGER.debug("_async_control_heating_forced")
         await self._async_control_heating(time, force=True)
 
+    async def _async_run_control(self, control, time=None, force=False) -> None:
+        """Run a control pass through the scheduler, timed with statistics."""
+        if self._stats is None:
+            await self._control_scheduler.async_run(control, time, force)
+            return
+
+        contended = self._control_scheduler.is_running
+        requested = perf_counter()
+        await self._control_scheduler.async_run(
+            partial(self._async_timed_control_pass, control), time, force
+        )
+        if contended:
+            self._stats.contended_requests += 1
+            self._stats.lock_wait.add(perf_counter() - requested)
+
+    async def _async_timed_control_pass(self, control, time=None, force=False) -> None:
+        started = perf_counter()
+        try:
+            await control(time, force)
+        finally:
+            self._stats.passes += 1
+            self._stats.pass_latency.add(perf_counter() - started)
+
     async def _async_control_heating(self, time=None, force=False) -> None:
         """Check if we need to turn heating on or off."""
-        async with self._temp_lock:
-            _LOGGER.debug("_async_control_heating")
-            self.set_self_active()
+        await self._async_run_control(self._async_control_heating_pass, time, force)
 
-            if not self._needs_control(time, force):
-                _LOGGER.debug("No need for control")
-                return
+    async def _async_control_heating_pass(self, time=None, force=False) -> None:
+        _LOGGER.debug("_async_control_heating")
+        self.set_self_active()
 
-            _LOGGER.debug("Needs control")
-            too_cold = self._is_too_cold()
-            too_hot = self._is_too_hot()
+        if not self._needs_control(time, force):
+            _LOGGER.debug("No need for control")
+            return
 
-            await self._async_cooler_turn_off()
+        _LOGGER.debug("Needs control")
+        await self._async_apply_plan(self._plan(plan_heating, time), time)
 
-            if self._is_heater_active or self._is_aux_heat:
-                await self._async_control_heater_when_on(too_hot, time)
-            else:
-                await self._async_control_heater_when_off(too_cold, time)
-
-    async def _async_control_heater_when_on(self, too_hot: bool, time=None) -> None:
-        """Check if we need to turn heating on or off when theheater is on."""
-        _LOGGER.debug(
-            "_async_control_heater_when_on, floor cold: %s", self._is_floor_cold
+    def _record_decision(
+        self, decision: str, entity_id: str | None, time=None, **fields
+    ) -> None:
+        """Record a control decision in the decision log."""
+        self._decision_log.record(
+            self.entity_id,
+            decision,
+            entity_id,
+            temp=self._cur_temp,
+            keep_alive=time is not None,
+            **fields,
         )
 
-        if (
-            (too_hot or self._is_floor_hot) or self.opening_manager.any_opening_open
-        ) and not self._is_floor_cold:
-            _LOGGER.info("Turning off heater %s", self.heater_entity_id)
-            await self._async_heater_turn_off()
-            await self._async_aux_heater_turn_off()
-
-        elif (
-            self._is_aux_heating_configured()
-            and self._first_stage_heating_timed_out
-            and not self._is_aux_heat
-        ):
-            _LOGGER.info("Turning on aux heater %s", self.aux_heater_entity_id)
-            if not self.aux_heater_dual_mode:
-                await self._async_heater_turn_off()
-            await self._async_aux_heater_turn_on()
-        elif (
-            time is not None
-            and not self.opening_manager.any_opening_open
-            and not self._is_floor_hot
-        ):
-            # The time argument is passed only in keep-alive case
-            _LOGGER.info(
-                "Keep-alive - Turning on heater (from active) %s",
-                self.heater_entity_id,
-            )
-            await self._async_heater_turn_on()
+    async def _async_control_cooling(self, time=None, force=False) -> None:
+        """Check if we need to turn heating on or off."""
+        await self._async_run_control(self._async_control_cooling_pass, time, force)
 
-    async def _async_control_heater_when_off(self, too_cold: bool, time=None) -> None:
-        """Check if we need to turn heating on or off when the heater is off."""
-        _LOGGER.debug("_async_control_heater_when_off")
-        if (
-            too_cold
-            and not self.opening_manager.any_opening_open
-            and not self._is_floor_hot
-        ) or self._is_floor_cold:
-            _LOGGER.info("Turning on heater (from inactive) %s", self.heater_entity_id)
-            # here is where we need to handle aux heating
-            # need to check if last time aux heater used was today
-            # if it was used today, turn on aux heating
-            # else turn on primary heating
-            # and start a timer that will potentially turn aux heating on
-            if self._is_aux_heating_configured() and self._has_aux_heating_ran_today():
-                if self.aux_heater_dual_mode:
-                    await self._async_heater_turn_on()
-                await self._async_aux_heater_turn_on()
-            else:
-                if self.aux_heater_dual_mode:
-                    await self._async_heater_turn_on()
-                await self._async_heater_turn_on()
-                if self._is_aux_heating_configured():
-                    self.async_on_remove(
-                        async_call_later(
-                            self.hass,
-                            self.aux_heater_timeout,
-                            self._async_control_heating_forced,
-                        )
-                    )
+    async def _async_control_cooling_pass(self, time=None, force=False) -> None:
+        _LOGGER.debug("_async_control_cooling time: %s. force: %s", time, force)
+        self.set_self_active()
 
-        elif (
-            time is not None
-            or self.opening_manager.any_opening_open
-            or self._is_floor_hot
-        ):
-            # The time argument is passed only in keep-alive case
-            _LOGGER.info("Keep-alive - Turning off heater %s", self.heater_entity_id)
-            await self._async_heater_turn_off()
+        if not self._needs_control(time, force, cool=True):
+            return
 
-    async def _async_control_cooling(self, time=None, force=False) -> None:
+        await self._async_apply_plan(self._plan(plan_cooling, time), time)
+
+    async def _async_control_heat_cool(self, time=None, force=False) -> None:
         """Check if we need to turn heating on or off."""
-        async with self._temp_lock:
-            _LOGGER.debug("_async_control_cooling time: %s. force: %s", time, force)
-            self.set_self_active()
+        await self._async_run_control(self._async_control_heat_cool_pass, time, force)
 
-            if not self._needs_control(time, force, cool=True):
-                return
+    async def _async_control_heat_cool_pass(self, time=None, force=False) -> None:
+        _LOGGER.debug("_async_control_heat_cool")
+        if (
+            not self._active
+            and self._is_configured_for_heat_cool()
+            and self._cur_temp is not None
+        ):
+            self._active = True
+        if not self._needs_control(time, force, dual=True):
+            return
 
-            too_cold = self._is_too_cold()
-            too_hot = self._is_too_hot()
+        await self._async_apply_plan(self._plan(plan_heat_cool, time), time)
 
-            cooler_set = self.cooler_entity_id is not None
-            control_entity = (
-                self.cooler_entity_id if cooler_set else self.heater_entity_id
-            )
-            is_device_active = (
-                self._is_cooler_active if cooler_set else self._is_heater_active
-            )
-            control_off = (
-                self._async_cooler_turn_off
-                if cooler_set
-                else self._async_heater_turn_off
-            )
-            control_on = (
-                self._async_cooler_turn_on if cooler_set else self._async_heater_turn_on
-            )
+    def _plan(self, plan, time=None) -> ControlPlan:
+        """Plan a control pass, by hysteresis or in the running PWM period."""
+        snapshot = self._control_snapshot(time)
+        if self._pwm is None:
+            return plan(snapshot)
+        if self._pwm.period_due:
+            self._pwm.start_period(snapshot)
+        return plan_pwm(snapshot, self._pwm.device, self._pwm.is_on)
 
-            _LOGGER.info(
-                "is device active: %s, is opening open: %s",
-                is_device_active,
-                self.opening_manager.any_opening_open,
-            )
+    def _restart_pwm_period(self) -> None:
+        """Start a new PWM period with the next pass, for a new target or mode.
 
-            any_opening_open = self.opening_manager.any_opening_open
-
-            if is_device_active:
-                if too_cold or any_opening_open:
-                    _LOGGER.info("Turning off cooler %s", control_entity)
-                    await control_off()
-                elif time is not None and not any_opening_open:
-                    # The time argument is passed only in keep-alive case
-                    _LOGGER.info(
-                        "Keep-alive - Turning on cooler (from active) %s",
-                        control_entity,
-                    )
-                    await control_on()
-            else:
-                if too_hot and not any_opening_open:
-                    _LOGGER.info("Turning on cooler (from inactive) %s", control_entity)
-                    await control_on()
-                elif time is not None or any_opening_open:
-                    # The time argument is passed only in keep-alive case
-                    _LOGGER.info("Keep-alive - Turning off cooler %s", control_entity)
-                    await control_off()
+        Other forced passes, like openings, override the phase of the running
+        period without restarting it.
+        """
+        if self._pwm is not None:
+            self._pwm.period_due = True
 
-    async def _async_control_heat_cool(self, time=None, force=False) -> None:
-        """Check if we need to turn heating on or off."""
-        async with self._temp_lock:
-            _LOGGER.debug("_async_control_heat_cool")
-            if (
-                not self._active
-                and self._is_configured_for_heat_cool()
-                and self._cur_temp is not None
-            ):
-                self._active = True
-            if not self._needs_control(time, force, dual=True):
-                return
+    async def _async_pwm_switch(self) -> None:
+        """Run the control pass of a PWM period starting or its on phase ending."""
+        await self._async_control_climate()
+        self._async_write_ha_state_if_changed()
 
-            too_cold, too_hot, tolerance_device = self._is_cold_or_hot()
+    def _control_snapshot(self, time=None) -> ControlSnapshot:
+        """Return the state the control engine decides on.
 
-            if self.opening_manager.any_opening_open:
-                await self._async_heater_turn_off()
-                await self._async_cooler_turn_off()
-            elif self._is_floor_hot:
-                await self._async_heater_turn_off()
-            elif self._is_floor_cold:
-                await self._async_heater_turn_on()
-            else:
-                await self.async_heater_cooler_toggle(
-                    tolerance_device, too_cold, too_hot
-                )
+        The time argument is passed only in keep-alive case.
+        """
+        return ControlSnapshot(
+            hvac_mode=self._hvac_mode,
+            now=dt_util.utcnow().timestamp(),
+            cur_temp=self._control_temp,
+            target_temp=self._target_temp,
+            target_temp_low=self._target_temp_low,
+            target_temp_high=self._target_temp_high,
+            cold_tolerance=self._cold_tolerance,
+            hot_tolerance=self._hot_tolerance,
+            heater=self.actuators.snapshot(self.heater_entity_id),
+            aux_heater=self.actuators.snapshot(self.aux_heater_entity_id),
+            cooler=self.actuators.snapshot(self.cooler_entity_id),
+            ac_mode=bool(self.ac_mode),
+            opening_open=self.opening_manager.any_opening_open,
+            floor_temp=(
+                self._cur_floor_temp
+                if self.sensor_floor_entity_id is not None
+                else None
+            ),
+            min_floor_temp=self._min_floor_temp,
+            max_floor_temp=self._max_floor_temp,
+            aux_heater_timeout=(
+                self.aux_heater_timeout.total_seconds()
+                if self.aux_heater_timeout is not None
+                else None
+            ),
+            aux_heater_dual_mode=self.aux_heater_dual_mode,
+            aux_heater_ran_today=self._has_aux_heating_ran_today(),
+            keep_alive=time is not None,
+            keep_alive_mode=self._keep_alive_mode,
+            keep_alive_staleness=(
+                self._keep_alive_staleness.total_seconds()
+                if self._keep_alive_staleness is not None
+                else None
+            ),
+        )
 
-            if time is not None:
-                # The time argument is passed only in keep-alive case
-                _LOGGER.info(
-                    "Keep-alive - Toggling on heater cooler %s, %s",
-                    self.heater_entity_id,
-                    self.cooler_entity_id,
-                )
-                await self.async_heater_cooler_toggle(
-                    tolerance_device, too_cold, too_hot
-                )
+    async def _async_apply_plan(self, plan: ControlPlan, time=None) -> None:
+        """Switch the devices as planned by the control engine."""
+        if plan.decision is not None:
+            self._record_decision(
+                plan.decision,
+                self._device_entity_ids.get(plan.device),
+                time,
+                **plan.details,
+            )
+        await self._async_dispatch(
+            [
+                (self._device_entity_ids[intent.device], self._async_apply(intent))
+                for intent in plan.intents
+            ]
+        )
+        if plan.aux_recheck:
+            self._cancel_aux_recheck()
+            self._aux_recheck_unsub = async_call_later(
+                self.hass, self.aux_heater_timeout, self._aux_recheck_job
+            )
 
-    async def async_heater_cooler_toggle(
-        self, tolerance_device, too_cold, too_hot
-    ) -> None:
-        """Toggle heater cooler based on temp and tolarance."""
-        match tolerance_device:
-            case ToleranceDevice.HEATER:
-                await self._async_heater_toggle(too_cold, too_hot)
-            case ToleranceDevice.COOLER:
-                await self._async_cooler_toggle(too_cold, too_hot)
-            case _:
-                await self._async_auto_toggle(too_cold, too_hot)
-
-    async def _async_heater_toggle(self, too_cold, too_hot) -> None:
-        """Toggle heater based on temp."""
-        if too_cold:
-            await self._async_heater_turn_on()
-        elif too_hot:
-            await self._async_heater_turn_off()
-
-    async def _async_cooler_toggle(self, too_cold, too_hot) -> None:
-        """Toggle cooler based on temp."""
-        if too_cold:
-            await self._async_cooler_turn_off()
-        elif too_hot:
-            await self._async_cooler_turn_on()
-
-    async def _async_auto_toggle(self, too_cold, too_hot) -> None:
-        if too_cold:
-            if not self.opening_manager.any_opening_open:
-                await self._async_heater_turn_on()
-            await self._async_cooler_turn_off()
-        elif too_hot:
-            if not self.opening_manager.any_opening_open:
-                await self._async_cooler_turn_on()
-            await self._async_heater_turn_off()
-        else:
-            await self._async_heater_turn_off()
-            await self._async_cooler_turn_off()
+    async def _async_aux_recheck(self, time=None) -> None:
+        """Check if the aux heater has to take over from the heater."""
+        self._aux_recheck_unsub = None
+        await self._async_control_heating_forced(time)
+
+    def _cancel_aux_recheck(self) -> None:
+        if self._aux_recheck_unsub is not None:
+            self._aux_recheck_unsub()
+            self._aux_recheck_unsub = None
+
+    async def _async_apply(self, intent: Intent) -> None:
+        """Switch a device as intended by the control engine."""
+        entity_id = self._device_entity_ids[intent.device]
+        if self.actuators.is_on(entity_id) == (intent.action == Action.TURN_ON):
+            # keep-alive resends the state the switch already reports
+            self.actuators.record_resend(entity_id)
+        if intent.action == Action.TURN_OFF:
+            if intent.device == Device.HEATER:
+                self._cancel_aux_recheck()
+            await self._async_switch_turn_off(entity_id)
+            return
+
+        await self._async_switch_turn_on(entity_id)
+        if intent.device == Device.AUX_HEATER:
+            self._aux_heater_last_run = datetime.datetime.now()
 
     @property
     def _is_floor_hot(self) -> bool:
@@ -1173,36 +1777,26 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
     @property
     def _is_heater_active(self) -> bool:
         """If the toggleable device is currently active."""
-        return self.hass.states.is_state(self.heater_entity_id, STATE_ON)
+        return self.actuators.is_on(self.heater_entity_id)
 
     @property
     def _is_aux_heat(self) -> bool:
         """If the toggleable device is currently active."""
-        return self.aux_heater_entity_id and self.hass.states.is_state(
-            self.aux_heater_entity_id, STATE_ON
-        )
+        return self.actuators.is_on(self.aux_heater_entity_id)
 
     @property
     def _is_cooler_active(self) -> bool:
         """If the toggleable cooler device is currently active."""
-        if self.cooler_entity_id is not None and self.hass.states.is_state(
-            self.cooler_entity_id, STATE_ON
-        ):
-            return True
-        return False
+        return self.actuators.is_on(self.cooler_entity_id)
 
     @property
     def _is_device_active(self) -> bool:
         """If the toggleable device is currently active."""
         return self._is_heater_active or self._is_aux_heat or self._is_cooler_active
 
-    async def _async_heater_turn_on(self) -> None:
-        """Turn heater toggleable device on."""
-        if self.heater_entity_id is not None and not self._is_heater_active:
-            await self._async_switch_turn_on(self.heater_entity_id)
-
     async def _async_heater_turn_off(self) -> None:
         """Turn heater toggleable device off."""
+        self._cancel_aux_recheck()
         if self.heater_entity_id is not None and self._is_heater_active:
             await self._async_switch_turn_off(self.heater_entity_id)
 
@@ -1225,29 +1819,51 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         if self.aux_heater_entity_id is not None and self._is_aux_heat:
             await self._async_switch_turn_off(self.aux_heater_entity_id)
 
-    async def _async_cooler_turn_on(self) -> None:
-        """Turn cooler toggleable device on."""
-        if self.cooler_entity_id is not None and not self._is_cooler_active:
-            await self._async_switch_turn_on(self.cooler_entity_id)
-
     async def _async_cooler_turn_off(self) -> None:
         """Turn cooler toggleable device off."""
         if self.cooler_entity_id is not None and self._is_cooler_active:
             await self._async_switch_turn_off(self.cooler_entity_id)
 
+    async def _async_turn_off_heater_and_cooler(self) -> None:
+        """Turn heater and cooler toggleable devices off."""
+        await self._async_dispatch(
+            [
+                (self.heater_entity_id, self._async_heater_turn_off()),
+                (self.cooler_entity_id, self._async_cooler_turn_off()),
+            ]
+        )
+
+    async def _async_dispatch(self, intents: list[tuple[str, Coroutine]]) -> None:
+        """Switch toggleable devices concurrently.
+
+        A device failing to switch does not keep the others from switching.
+        """
+        results = await asyncio.gather(
+            *(intent for _, intent in intents), return_exceptions=True
+        )
+        for (entity_id, _), result in zip(intents, results):
+            if isinstance(result, Exception):
+                _LOGGER.error("Unable to switch device %s: %s", entity_id, result)
+
     async def _async_switch_turn_off(self, entity_id) -> None:
         """Turn toggleable device off."""
         data = {ATTR_ENTITY_ID: entity_id}
+        started = perf_counter()
         await self.hass.services.async_call(
             HA_DOMAIN, SERVICE_TURN_OFF, data, context=self._context
         )
+        if self._stats is not None:
+            self._stats.add_actuation(entity_id, perf_counter() - started)
 
     async def _async_switch_turn_on(self, entity_id) -> None:
         """Turn toggleable device off."""
         data = {ATTR_ENTITY_ID: entity_id}
+        started = perf_counter()
         await self.hass.services.async_call(
             HA_DOMAIN, SERVICE_TURN_ON, data, context=self._context
         )
+        if self._stats is not None:
+            self._stats.add_actuation(entity_id, perf_counter() - started)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set new preset mode."""
@@ -1264,6 +1880,8 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         else:
             self._set_presets_when_have_preset_mode(preset_mode)
 
+        self._update_switching_thresholds()
+        self._restart_pwm_period()
         await self._async_control_climate(force=True)
         self.async_write_ha_state()
 
@@ -1311,6 +1929,7 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         """Checks if the controller needs to continue."""
         if not self._active or self._hvac_mode == HVACMode.OFF:
             _LOGGER.debug("Not active or hvac mode is off %s", self._hvac_mode)
+            self._count_skipped_pass()
             return False
 
         if not force and time is None:
@@ -1318,10 +1937,23 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
             # ignore `min_cycle_duration`.
             # If the `time` argument is not none, we were invoked for
             # keep-alive purposes, and `min_cycle_duration` is irrelevant.
-            if self.min_cycle_duration:
-                return self._needs_cycle(dual, cool)
+            # PWM keeps min_cycle_duration in its duty cycle instead
+            if self.min_cycle_duration and self._pwm is None:
+                if self._needs_cycle(dual, cool):
+                    return True
+                self._schedule_cycle_recheck(dual, cool)
+                self._count_skipped_pass()
+                return False
         return True
 
+    def _count_skipped_pass(self) -> None:
+        if self._stats is not None:
+            self._stats.skipped_passes += 1
+
+    def _count_rejected_sample(self) -> None:
+        if self._stats is not None:
+            self._stats.rejected_samples += 1
+
     def _needs_cycle(self, dual=False, cool=False) -> bool:
         long_enough = self._ran_long_enough(cool)
         if not dual or cool or self.cooler_entity_id is None:
@@ -1333,31 +1965,121 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         # not sure if this is correct, need to revisit later
         return long_enough or long_enough_cooler
 
-    def _is_too_cold(self, target_attr="_target_temp") -> bool:
-        """Checks if the current temperature is below target."""
-        target_temp = getattr(self, target_attr)
-        _LOGGER.debug("Target temp: %s, current temp: %s", target_temp, self._cur_temp)
-        return target_temp >= self._cur_temp + self._cold_tolerance
-
-    def _is_too_hot(self, target_attr="_target_temp") -> bool:
-        """Checks if the current temperature is above target."""
-        target_temp = getattr(self, target_attr)
-        return self._cur_temp >= target_temp + self._hot_tolerance
-
-    def _is_cold_or_hot(self) -> tuple[bool, bool, ToleranceDevice]:
-        if self._is_heater_active:
-            too_cold = self._is_too_cold("_target_temp_low")
-            too_hot = self._is_too_hot("_target_temp_low")
-            tolerance_device = ToleranceDevice.HEATER
-        elif self._is_cooler_active:
-            too_cold = self._is_too_cold("_target_temp_high")
-            too_hot = self._is_too_hot("_target_temp_high")
-            tolerance_device = ToleranceDevice.COOLER
+    def _schedule_cycle_recheck(self, dual=False, cool=False) -> None:
+        """Re-evaluate control once min_cycle_duration no longer blocks it."""
+        if not dual or cool or self.cooler_entity_id is None:
+            if cool and self.cooler_entity_id is not None:
+                switch_entity_ids = [self.cooler_entity_id]
+            else:
+                switch_entity_ids = [self.heater_entity_id]
+        else:
+            switch_entity_ids = [self.heater_entity_id, self.cooler_entity_id]
+
+        delays = [
+            delay
+            for switch_entity_id in switch_entity_ids
+            if (
+                delay := self.actuators.seconds_until(
+                    switch_entity_id, self.min_cycle_duration
+                )
+            )
+            is not None
+        ]
+        if not delays:
+            return
+
+        if self._cycle_recheck_unsub is not None:
+            self._cycle_recheck_unsub()
+        _LOGGER.debug("Re-evaluating control in %s seconds", min(delays))
+        self._cycle_recheck_unsub = async_call_later(
+            self.hass, min(delays), self._cycle_recheck_job
+        )
+
+    async def _async_cycle_recheck(self, time=None) -> None:
+        """Run the control pass that was blocked by min_cycle_duration."""
+        self._cycle_recheck_unsub = None
+        await self._async_control_climate()
+        self._async_write_ha_state_if_changed()
+
+    def _update_switching_thresholds(self) -> None:
+        """Precompute the temperatures at which the devices are switched.
+
+        Needs to be called whenever the target temperatures or the hvac mode
+        change.
+        """
+        self._switch_thresholds = {}
+        if self.cooler_entity_id is not None and self._hvac_mode == HVACMode.HEAT_COOL:
+            if None in (self._target_temp_low, self._target_temp_high):
+                return
+            low = self._target_temp_low
+            high = self._target_temp_high
+            self._switch_thresholds = {
+                ToleranceDevice.HEATER: (
+                    low - self._cold_tolerance,
+                    low + self._hot_tolerance,
+                ),
+                ToleranceDevice.COOLER: (
+                    high - self._cold_tolerance,
+                    high + self._hot_tolerance,
+                ),
+                ToleranceDevice.AUTO: (
+                    low - self._cold_tolerance,
+                    high + self._hot_tolerance,
+                ),
+            }
+        elif self._target_temp is not None:
+            self._switch_thresholds = {
+                ToleranceDevice.AUTO: (
+                    self._target_temp - self._cold_tolerance,
+                    self._target_temp + self._hot_tolerance,
+                )
+            }
+
+    def _temp_band_position(self) -> int:
+        """Return -1 if too cold, 1 if too hot and 0 inside the tolerance band.
+
+        Temperatures right at a threshold are reported outside of the band.
+        """
+        control_temp = self._control_temp
+        if control_temp is None or not self._switch_thresholds:
+            return 0
+
+        if ToleranceDevice.HEATER in self._switch_thresholds:
+            if self._is_heater_active:
+                tolerance_device = ToleranceDevice.HEATER
+            elif self._is_cooler_active:
+                tolerance_device = ToleranceDevice.COOLER
+            else:
+                tolerance_device = ToleranceDevice.AUTO
         else:
-            too_cold = self._is_too_cold("_target_temp_low")
-            too_hot = self._is_too_hot("_target_temp_high")
             tolerance_device = ToleranceDevice.AUTO
-        return too_cold, too_hot, tolerance_device
+
+        cold_threshold, hot_threshold = self._switch_thresholds[tolerance_device]
+        if control_temp <= cold_threshold + THRESHOLD_MARGIN:
+            return -1
+        if control_temp >= hot_threshold - THRESHOLD_MARGIN:
+            return 1
+        return 0
+
+    def _can_skip_control(self) -> bool:
+        """Check if a control pass would leave all devices as they are."""
+        if not self._active or self._temp_band_position() != 0:
+            return False
+
+        if self._is_floor_hot or self._is_floor_cold:
+            return False
+
+        if self._hvac_mode == HVACMode.HEAT and (
+            self._is_cooler_active
+            or (
+                self._is_aux_heating_configured()
+                and self._is_heater_active
+                and not self._is_aux_heat
+            )
+        ):
+            return False
+
+        return not self.opening_manager.any_opening_open
 
     def _is_configured_for_heat_cool(self) -> bool:
         """Checks if the configuration is complete for heat/cool mode."""
@@ -1483,38 +2205,10 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
         """Determines if a switch with the passed property name has run long enough."""
         if cooler_entity and self.cooler_entity_id is not None:
             switch_entity_id = self.cooler_entity_id
-            is_active = self._is_cooler_active
         else:
             switch_entity_id = self.heater_entity_id
-            is_active = self._is_heater_active
 
-        if is_active:
-            current_state = STATE_ON
-        else:
-            current_state = HVACMode.OFF
-
-        long_enough = condition.state(
-            self.hass,
-            switch_entity_id,
-            current_state,
-            self.min_cycle_duration,
-        )
-
-        return long_enough
-
-    def _first_stage_heating_timed_out(self, timeout=None) -> bool:
-        """Determines if the heater switch has been on for the timeout period."""
-        if timeout is None:
-            timeout = self.aux_heater_timeout
-
-        timed_out = condition.state(
-            self.hass,
-            self.heater_entity_id,
-            STATE_ON,
-            timeout,
-        )
-
-        return timed_out
+        return self.actuators.is_switched_for(switch_entity_id, self.min_cycle_duration)
 
     def _has_aux_heating_ran_today(self) -> bool:
         """Determines if the aux heater has been used today."""
@@ -1538,3 +2232,21 @@ class DualSmartThermostat(ClimateEntity, RestoreEntity):
             return False
 
         return True
+
+
+class UnrecordedDualSmartThermostat(DualSmartThermostat):
+    """Dual Smart Thermostat keeping its own attributes out of the recorder."""
+
+    _unrecorded_attributes = frozenset(
+        {
+            ATTR_PREV_TARGET,
+            ATTR_PREV_TARGET_LOW,
+            ATTR_PREV_TARGET_HIGH,
+            ATTR_PWM_DUTY_CYCLE,
+            ATTR_CONTROL_INTEGRAL,
+            ATTR_HEATING_RATE,
+            ATTR_COOLING_RATE,
+            ATTR_OUTDOOR_COUPLING,
+            ATTR_THERMAL_MODEL_SAMPLES,
+        }
+    )
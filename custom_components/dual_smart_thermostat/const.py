@@ -1,5 +1,7 @@
 """const."""
 
+from datetime import timedelta
+
 from homeassistant.backports.enum import StrEnum
 from homeassistant.const import ATTR_ENTITY_ID
 import homeassistant.helpers.config_validation as cv
@@ -8,6 +10,12 @@ import voluptuous as vol
 DEFAULT_TOLERANCE = 0.3
 DEFAULT_NAME = "Dual Smart Thermostat"
 DEFAULT_MAX_FLOOR_TEMP = 28.0
+DEFAULT_PWM_PERIOD = timedelta(minutes=15)
+DEFAULT_PWM_PROPORTIONAL_BAND = 1.0
+DEFAULT_PID_KP = 1.0
+DEFAULT_PID_KI = 0.5
+DEFAULT_PID_KD = 0.0
+DEFAULT_THERMAL_MODEL_HORIZON = timedelta(minutes=10)
 
 DOMAIN = "dual_smart_thermostat"
 
@@ -17,6 +25,11 @@ CONF_AUX_HEATING_TIMEOUT = "secondary_heater_timeout"
 CONF_AUX_HEATING_DUAL_MODE = "secondary_heater_dual_mode"
 CONF_COOLER = "cooler"
 CONF_SENSOR = "target_sensor"
+CONF_SENSOR_AGGREGATION = "target_sensor_aggregation"
+CONF_SENSOR_FILTER = "target_sensor_filter"
+CONF_FILTER_MEDIAN_WINDOW = "median_window"
+CONF_FILTER_EMA_ALPHA = "ema_alpha"
+CONF_FILTER_MAX_SLEW_RATE = "max_slew_rate"
 CONF_FLOOR_SENSOR = "floor_sensor"
 CONF_MIN_TEMP = "min_temp"
 CONF_MAX_TEMP = "max_temp"
@@ -29,14 +42,34 @@ CONF_AC_MODE = "ac_mode"
 CONF_MIN_DUR = "min_cycle_duration"
 CONF_COLD_TOLERANCE = "cold_tolerance"
 CONF_HOT_TOLERANCE = "hot_tolerance"
+CONF_CONTROL_MODE = "control_mode"
+CONF_PWM_PERIOD = "pwm_period"
+CONF_PWM_PROPORTIONAL_BAND = "pwm_proportional_band"
+CONF_PWM_INTEGRAL_TIME = "pwm_integral_time"
+CONF_PID_KP = "pid_kp"
+CONF_PID_KI = "pid_ki"
+CONF_PID_KD = "pid_kd"
+CONF_OUTSIDE_SENSOR = "outside_sensor"
+CONF_THERMAL_MODEL = "thermal_model"
+CONF_THERMAL_MODEL_HORIZON = "thermal_model_horizon"
 CONF_KEEP_ALIVE = "keep_alive"
+CONF_KEEP_ALIVE_MAX_RATE = "keep_alive_max_rate"
+CONF_KEEP_ALIVE_MODE = "keep_alive_mode"
+CONF_KEEP_ALIVE_STALENESS = "keep_alive_staleness"
+CONF_SENSOR_COALESCE = "sensor_coalesce"
+CONF_STARTUP_WINDOW = "startup_window"
+CONF_STATISTICS = "statistics"
 CONF_INITIAL_HVAC_MODE = "initial_hvac_mode"
 CONF_PRECISION = "precision"
 CONF_TEMP_STEP = "target_temp_step"
+CONF_UNRECORDED_ATTRIBUTES = "unrecorded_attributes"
 CONF_OPENINGS = "openings"
 CONF_HEAT_COOL_MODE = "heat_cool_mode"
+CONF_ZONES = "zones"
 ATTR_TIMEOUT = "timeout"
+ATTR_WEIGHT = "weight"
 PRESET_ANTI_FREEZE = "Anti Freeze"
+SERVICE_GET_STATISTICS = "get_statistics"
 
 TIMED_OPENING_SCHEMA = vol.Schema(
     {
@@ -45,6 +78,29 @@ TIMED_OPENING_SCHEMA = vol.Schema(
     }
 )
 
+WEIGHTED_SENSOR_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+        vol.Optional(ATTR_WEIGHT, default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+    }
+)
+
+SENSOR_FILTER_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_FILTER_MEDIAN_WINDOW): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=31)
+        ),
+        vol.Optional(CONF_FILTER_EMA_ALPHA): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1, min_included=False)
+        ),
+        vol.Optional(CONF_FILTER_MAX_SLEW_RATE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+    }
+)
+
 
 class ToleranceDevice(StrEnum):
     """Tolerance device for climate devices."""
@@ -52,3 +108,29 @@ class ToleranceDevice(StrEnum):
     HEATER = "heater"
     COOLER = "cooler"
     AUTO = "auto"
+
+
+class SensorAggregation(StrEnum):
+    """Aggregation of multiple target sensors."""
+
+    MEAN = "mean"
+    MEDIAN = "median"
+    MIN = "min"
+    MAX = "max"
+    WEIGHTED = "weighted"
+
+
+class KeepAliveMode(StrEnum):
+    """When keep-alive resends the state of a switch."""
+
+    ALWAYS = "always"
+    ON_DIVERGENCE = "on_divergence"
+    ON_STALENESS = "on_staleness"
+
+
+class ControlMode(StrEnum):
+    """How the thermostat switches its devices."""
+
+    HYSTERESIS = "hysteresis"
+    PWM = "pwm"
+    PID = "pid"
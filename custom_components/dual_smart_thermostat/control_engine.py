@@ -0,0 +1,457 @@
+"""Control Engine for Dual Smart Thermostat.
+
+The engine decides which switches a control pass turns on or off. It only
+reads an immutable snapshot of the thermostat and returns the intents, it
+does not look up states or call services, so it can be run and timed without
+Home Assistant. The thermostat builds the snapshots and carries out the
+intents.
+"""
+
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.const import STATE_ON
+
+from custom_components.dual_smart_thermostat.const import KeepAliveMode, ToleranceDevice
+
+
+class Device(StrEnum):
+    """Switch controlled by a thermostat."""
+
+    HEATER = "heater"
+    AUX_HEATER = "aux_heater"
+    COOLER = "cooler"
+
+
+class Action(StrEnum):
+    """Service call to a switch."""
+
+    TURN_ON = "turn_on"
+    TURN_OFF = "turn_off"
+
+
+@dataclass(frozen=True, slots=True)
+class ActuatorState:
+    """State of a switch, with utc timestamps of its last transition and report.
+
+    resent is the last time keep-alive resent the reported state, switches
+    do not report a state that did not change.
+    """
+
+    state: str | None
+    since: float = 0.0
+    reported: float | None = None
+    resent: float = 0.0
+
+    @property
+    def is_on(self) -> bool:
+        """If the switch is on."""
+        return self.state == STATE_ON
+
+
+@dataclass(frozen=True, slots=True)
+class Intent:
+    """Switch a device on or off."""
+
+    action: Action
+    device: Device
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ControlSnapshot:
+    """Everything a control pass decides on.
+
+    Durations are in seconds and times are utc timestamps. Devices that are
+    not configured have no actuator state, the floor temperature is None
+    without a floor sensor.
+    """
+
+    hvac_mode: HVACMode | None
+    now: float
+    cur_temp: float
+    target_temp: float | None = None
+    target_temp_low: float | None = None
+    target_temp_high: float | None = None
+    cold_tolerance: float
+    hot_tolerance: float
+    heater: ActuatorState | None
+    aux_heater: ActuatorState | None = None
+    cooler: ActuatorState | None = None
+    ac_mode: bool = False
+    opening_open: bool = False
+    floor_temp: float | None = None
+    min_floor_temp: float | None = None
+    max_floor_temp: float | None = None
+    aux_heater_timeout: float | None = None
+    aux_heater_dual_mode: bool = False
+    aux_heater_ran_today: bool = False
+    keep_alive: bool = False
+    keep_alive_mode: KeepAliveMode = KeepAliveMode.ON_DIVERGENCE
+    keep_alive_staleness: float | None = None
+
+    @property
+    def floor_hot(self) -> bool:
+        """If the floor temperature is at or above its limit."""
+        return (
+            self.floor_temp is not None
+            and self.max_floor_temp is not None
+            and self.floor_temp >= self.max_floor_temp
+        )
+
+    @property
+    def floor_cold(self) -> bool:
+        """If the floor temperature is at or below its limit."""
+        return (
+            self.floor_temp is not None
+            and self.min_floor_temp is not None
+            and self.floor_temp <= self.min_floor_temp
+        )
+
+    @property
+    def aux_heating_configured(self) -> bool:
+        """If the aux heater is configured with a timeout."""
+        return self.aux_heater is not None and self.aux_heater_timeout is not None
+
+    def actuator(self, device: Device) -> ActuatorState | None:
+        """The state of a device, None if it is not configured."""
+        match device:
+            case Device.HEATER:
+                return self.heater
+            case Device.AUX_HEATER:
+                return self.aux_heater
+        return self.cooler
+
+    def is_on(self, device: Device) -> bool:
+        """If a device is configured and on."""
+        return (actuator := self.actuator(device)) is not None and actuator.is_on
+
+    def too_cold(self, target: float) -> bool:
+        """If the temperature is below target by the cold tolerance."""
+        return target >= self.cur_temp + self.cold_tolerance
+
+    def too_hot(self, target: float) -> bool:
+        """If the temperature is above target by the hot tolerance."""
+        return self.cur_temp >= target + self.hot_tolerance
+
+
+@dataclass(frozen=True, slots=True)
+class ControlPlan:
+    """The intents of a control pass and the decision that led to them.
+
+    The decision names what the pass decided about the device, details are
+    extra fields for the decision log. With aux_recheck the heating has to be
+    controlled again once the aux heater timeout passed.
+    """
+
+    intents: tuple[Intent, ...] = ()
+    decision: str | None = None
+    device: Device | None = None
+    details: dict[str, Any] = field(default_factory=dict)
+    aux_recheck: bool = False
+
+
+class _Planner:
+    """Collects the intents of a control pass.
+
+    Devices are only switched if they are configured and not in the requested
+    state yet, or if keep-alive has to resend their state. An intent is added
+    once, all intents are decided on the same snapshot.
+    """
+
+    def __init__(self, snapshot: ControlSnapshot) -> None:
+        self.snapshot = snapshot
+        self.intents: list[Intent] = []
+        self.decision: str | None = None
+        self.device: Device | None = None
+        self.details: dict[str, Any] = {}
+        self.aux_recheck = False
+
+    def decide(self, decision: str, device: Device | None, /, **details: Any) -> None:
+        """Name the decision of the pass."""
+        self.decision = decision
+        self.device = device
+        self.details = details
+
+    def turn_on(self, device: Device, keep_alive: bool = False) -> None:
+        """Turn a device on."""
+        if (actuator := self.snapshot.actuator(device)) is None:
+            return
+        if not actuator.is_on or self._needs_keep_alive(actuator, keep_alive):
+            self._add(Intent(Action.TURN_ON, device))
+
+    def turn_off(self, device: Device, keep_alive: bool = False) -> None:
+        """Turn a device off."""
+        if (actuator := self.snapshot.actuator(device)) is None:
+            return
+        if actuator.is_on or self._needs_keep_alive(actuator, keep_alive):
+            self._add(Intent(Action.TURN_OFF, device))
+
+    def plan(self) -> ControlPlan:
+        """Return the collected plan."""
+        return ControlPlan(
+            tuple(self.intents),
+            self.decision,
+            self.device,
+            self.details,
+            self.aux_recheck,
+        )
+
+    def _add(self, intent: Intent) -> None:
+        if intent not in self.intents:
+            self.intents.append(intent)
+
+    def _needs_keep_alive(self, actuator: ActuatorState, keep_alive: bool) -> bool:
+        """If keep-alive has to resend the state a switch already reports."""
+        if not keep_alive:
+            return False
+        match self.snapshot.keep_alive_mode:
+            case KeepAliveMode.ALWAYS:
+                return True
+            case KeepAliveMode.ON_STALENESS:
+                return (
+                    actuator.reported is None
+                    or self.snapshot.keep_alive_staleness is None
+                    or self.snapshot.now - max(actuator.reported, actuator.resent)
+                    > self.snapshot.keep_alive_staleness
+                )
+        return False
+
+
+def plan_control(snapshot: ControlSnapshot) -> ControlPlan:
+    """Plan a control pass in the hvac mode of the snapshot."""
+    if snapshot.cooler is not None and snapshot.hvac_mode == HVACMode.HEAT_COOL:
+        return plan_heat_cool(snapshot)
+    if snapshot.ac_mode or (
+        snapshot.cooler is not None and snapshot.hvac_mode == HVACMode.COOL
+    ):
+        return plan_cooling(snapshot)
+    return plan_heating(snapshot)
+
+
+def plan_heating(snapshot: ControlSnapshot) -> ControlPlan:
+    """Plan a control pass of the heater."""
+    planner = _Planner(snapshot)
+    planner.turn_off(Device.COOLER)
+
+    if snapshot.is_on(Device.HEATER) or snapshot.is_on(Device.AUX_HEATER):
+        _plan_heater_when_on(planner)
+    else:
+        _plan_heater_when_off(planner)
+    return planner.plan()
+
+
+def _plan_heater_when_on(planner: _Planner) -> None:
+    snapshot = planner.snapshot
+    too_hot = snapshot.too_hot(snapshot.target_temp)
+
+    if (
+        too_hot or snapshot.floor_hot or snapshot.opening_open
+    ) and not snapshot.floor_cold:
+        planner.decide("heater_off", Device.HEATER)
+        planner.turn_off(Device.HEATER)
+        planner.turn_off(Device.AUX_HEATER)
+    elif (
+        snapshot.aux_heating_configured
+        and _first_stage_heating_timed_out(snapshot)
+        and not snapshot.is_on(Device.AUX_HEATER)
+    ):
+        planner.decide("aux_heater_on", Device.AUX_HEATER)
+        if not snapshot.aux_heater_dual_mode:
+            planner.turn_off(Device.HEATER)
+        planner.turn_on(Device.AUX_HEATER)
+    elif snapshot.keep_alive and not snapshot.opening_open and not snapshot.floor_hot:
+        planner.decide("heater_on", Device.HEATER)
+        planner.turn_on(Device.HEATER, keep_alive=True)
+
+
+def _plan_heater_when_off(planner: _Planner) -> None:
+    snapshot = planner.snapshot
+    too_cold = snapshot.too_cold(snapshot.target_temp)
+
+    if (
+        too_cold and not snapshot.opening_open and not snapshot.floor_hot
+    ) or snapshot.floor_cold:
+        planner.decide("heater_on", Device.HEATER)
+        # the aux heater takes over right away if it was needed today already,
+        # else the heating is checked again once the aux heater timeout passed
+        if snapshot.aux_heating_configured and snapshot.aux_heater_ran_today:
+            if snapshot.aux_heater_dual_mode:
+                planner.turn_on(Device.HEATER)
+            planner.turn_on(Device.AUX_HEATER)
+        else:
+            planner.turn_on(Device.HEATER)
+            planner.aux_recheck = snapshot.aux_heating_configured
+    elif snapshot.keep_alive or snapshot.opening_open or snapshot.floor_hot:
+        planner.decide("heater_off", Device.HEATER)
+        planner.turn_off(Device.HEATER, keep_alive=snapshot.keep_alive)
+
+
+def _first_stage_heating_timed_out(snapshot: ControlSnapshot) -> bool:
+    """If the heater has been on for the aux heater timeout."""
+    heater = snapshot.heater
+    return (
+        heater is not None
+        and heater.is_on
+        and snapshot.now - heater.since > snapshot.aux_heater_timeout
+    )
+
+
+def plan_cooling(snapshot: ControlSnapshot) -> ControlPlan:
+    """Plan a control pass of the cooler, or of the heater in ac mode."""
+    planner = _Planner(snapshot)
+    too_cold = snapshot.too_cold(snapshot.target_temp)
+    too_hot = snapshot.too_hot(snapshot.target_temp)
+    device = Device.COOLER if snapshot.cooler is not None else Device.HEATER
+    opening_open = snapshot.opening_open
+
+    if snapshot.is_on(device):
+        if too_cold or opening_open:
+            planner.decide("cooler_off", device, opening=opening_open)
+            planner.turn_off(device)
+        elif snapshot.keep_alive:
+            planner.decide("cooler_on", device)
+            planner.turn_on(device, keep_alive=True)
+    elif too_hot and not opening_open:
+        planner.decide("cooler_on", device)
+        planner.turn_on(device)
+    elif snapshot.keep_alive or opening_open:
+        planner.decide("cooler_off", device, opening=opening_open)
+        planner.turn_off(device, keep_alive=snapshot.keep_alive)
+    return planner.plan()
+
+
+def plan_heat_cool(snapshot: ControlSnapshot) -> ControlPlan:
+    """Plan a control pass of the heater and cooler in heat_cool mode."""
+    planner = _Planner(snapshot)
+    too_cold, too_hot, tolerance_device = _cold_or_hot(snapshot)
+
+    if snapshot.opening_open:
+        planner.turn_off(Device.HEATER)
+        planner.turn_off(Device.COOLER)
+    elif snapshot.floor_hot:
+        planner.turn_off(Device.HEATER)
+    elif snapshot.floor_cold:
+        planner.turn_on(Device.HEATER)
+    else:
+        _plan_toggle(planner, tolerance_device, too_cold, too_hot)
+
+    if snapshot.keep_alive:
+        _plan_toggle(planner, tolerance_device, too_cold, too_hot, keep_alive=True)
+    _decide_heat_cool(planner, tolerance_device)
+    return planner.plan()
+
+
+def _decide_heat_cool(planner: _Planner, tolerance_device: ToleranceDevice) -> None:
+    """Name the decision of a heat_cool pass after the devices it leaves on.
+
+    Without a running device the decision is about the device that was
+    switched off, else the device whose end of the range was compared.
+    """
+    snapshot = planner.snapshot
+    actions = {intent.device: intent.action for intent in planner.intents}
+
+    def left_on(device: Device) -> bool:
+        if device in actions:
+            return actions[device] == Action.TURN_ON
+        return snapshot.is_on(device)
+
+    if left_on(Device.COOLER):
+        decision, device = "cooler_on", Device.COOLER
+    elif left_on(Device.HEATER):
+        decision, device = "heater_on", Device.HEATER
+    elif Device.COOLER in actions or (
+        Device.HEATER not in actions and tolerance_device == ToleranceDevice.COOLER
+    ):
+        decision, device = "cooler_off", Device.COOLER
+    else:
+        decision, device = "heater_off", Device.HEATER
+    planner.decide(
+        decision, device, device=tolerance_device, opening=snapshot.opening_open
+    )
+
+
+def _cold_or_hot(snapshot: ControlSnapshot) -> tuple[bool, bool, ToleranceDevice]:
+    """Compare the temperature to the target range.
+
+    A running heater or cooler is compared to its own end of the range, else
+    the temperature has to leave the range to switch a device.
+    """
+    low = snapshot.target_temp_low
+    high = snapshot.target_temp_high
+    if snapshot.is_on(Device.HEATER):
+        return snapshot.too_cold(low), snapshot.too_hot(low), ToleranceDevice.HEATER
+    if snapshot.is_on(Device.COOLER):
+        return snapshot.too_cold(high), snapshot.too_hot(high), ToleranceDevice.COOLER
+    return snapshot.too_cold(low), snapshot.too_hot(high), ToleranceDevice.AUTO
+
+
+def _plan_toggle(
+    planner: _Planner,
+    tolerance_device: ToleranceDevice,
+    too_cold: bool,
+    too_hot: bool,
+    keep_alive: bool = False,
+) -> None:
+    """Toggle the heater and cooler based on the temperature."""
+    match tolerance_device:
+        case ToleranceDevice.HEATER:
+            if too_cold:
+                planner.turn_on(Device.HEATER, keep_alive)
+            elif too_hot:
+                planner.turn_off(Device.HEATER, keep_alive)
+        case ToleranceDevice.COOLER:
+            if too_cold:
+                planner.turn_off(Device.COOLER, keep_alive)
+            elif too_hot:
+                planner.turn_on(Device.COOLER, keep_alive)
+        case _:
+            if too_cold:
+                planner.turn_off(Device.COOLER, keep_alive)
+                if not planner.snapshot.opening_open:
+                    planner.turn_on(Device.HEATER, keep_alive)
+            elif too_hot:
+                planner.turn_off(Device.HEATER, keep_alive)
+                if not planner.snapshot.opening_open:
+                    planner.turn_on(Device.COOLER, keep_alive)
+            else:
+                planner.turn_off(Device.HEATER, keep_alive)
+                planner.turn_off(Device.COOLER, keep_alive)
+
+
+def plan_pwm(snapshot: ControlSnapshot, device: Device, on: bool) -> ControlPlan:
+    """Plan a pass of time-proportional control in the on or off phase.
+
+    The other devices are kept off, the heater runs with the aux heater in
+    dual mode. Openings keep the devices off, the floor limits override the
+    phase of heating.
+    """
+    planner = _Planner(snapshot)
+    heating = device != Device.COOLER and snapshot.hvac_mode != HVACMode.COOL
+    if heating and snapshot.floor_cold:
+        on = True
+    elif snapshot.opening_open or (heating and snapshot.floor_hot):
+        on = False
+
+    devices = [device]
+    if device == Device.AUX_HEATER and snapshot.aux_heater_dual_mode:
+        devices.append(Device.HEATER)
+    for other in Device:
+        if other not in devices:
+            planner.turn_off(other)
+    if on != snapshot.is_on(device) or snapshot.keep_alive:
+        if heating:
+            planner.decide(f"{device}_on" if on else "heater_off", device)
+        else:
+            planner.decide(
+                "cooler_on" if on else "cooler_off",
+                device,
+                opening=snapshot.opening_open,
+            )
+    for switched in devices:
+        if on:
+            planner.turn_on(switched, snapshot.keep_alive)
+        else:
+            planner.turn_off(switched, snapshot.keep_alive)
+    return planner.plan()
@@ -0,0 +1,76 @@
+"""Control Scheduler for Dual Smart Thermostat."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+ControlPass = Callable[[datetime | None, bool], Awaitable[None]]
+
+
+class ControlScheduler:
+    """Runs the control passes of a thermostat one at a time.
+
+    Requests arriving while a pass is running do not queue a pass each, they
+    are merged into a single rerun that starts when the running pass ends.
+    The rerun uses the latest requested pass, is forced if any merged request
+    was forced and gets the latest keep-alive time of the merged requests.
+    Callers wait until the pass covering their request has finished, and
+    fail with it if it raised.
+    """
+
+    def __init__(self) -> None:
+        self._control: ControlPass | None = None
+        self._time: datetime | None = None
+        self._force = False
+        self._rerun = False
+        self._done: asyncio.Future | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """If a control pass is running."""
+        return self._done is not None
+
+    async def async_run(
+        self, control: ControlPass, time: datetime | None = None, force: bool = False
+    ) -> None:
+        """Request a control pass and wait for it to finish."""
+        self._control = control
+        self._force = self._force or force
+        if time is not None:
+            self._time = time
+
+        if self._done is not None:
+            _LOGGER.debug("Control pass running, merging request")
+            self._rerun = True
+            await asyncio.shield(self._done)
+            return
+
+        done = self._done = asyncio.get_running_loop().create_future()
+        try:
+            self._rerun = True
+            while self._rerun:
+                control, time, force = self._control, self._time, self._force
+                self._rerun = False
+                self._time = None
+                self._force = False
+                await control(time, force)
+        except asyncio.CancelledError:
+            done.cancel()
+            raise
+        except Exception as err:
+            # merged requests fail with the pass, their rerun never ran
+            done.set_exception(err)
+            # retrieved here, so it is not logged if no request was merged
+            done.exception()
+            raise
+        else:
+            done.set_result(None)
+        finally:
+            # a failed pass drops the merged requests with their force and time
+            self._done = None
+            self._rerun = False
+            self._time = None
+            self._force = False
@@ -0,0 +1,76 @@
+"""Control Statistics for Dual Smart Thermostat."""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+DATA_STATISTICS = "statistics"
+DATA_STATISTICS_SENSORS = "statistics_sensors"
+
+# upper bounds of the latency buckets in seconds, the last bucket is unbounded
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class LatencyHistogram:
+    """Counts latencies in fixed buckets."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self) -> float | None:
+        """The mean latency in seconds."""
+        return self.total / self.count if self.count else None
+
+    def add(self, seconds: float) -> None:
+        """Count a latency."""
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> dict:
+        """Return the histogram as a dict."""
+        bounds = [f"le_{bound}" for bound in LATENCY_BUCKETS] + ["inf"]
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.max,
+            "buckets": dict(zip(bounds, self.buckets)),
+        }
+
+
+@dataclass
+class ControlStats:
+    """Counters and latencies of the control passes of a thermostat."""
+
+    passes: int = 0
+    skipped_passes: int = 0
+    contended_requests: int = 0
+    rejected_samples: int = 0
+    pass_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    lock_wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+    service_call_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    actuations: dict[str, int] = field(default_factory=dict)
+
+    def add_actuation(self, entity_id: str, seconds: float) -> None:
+        """Count a service call switching entity_id."""
+        self.actuations[entity_id] = self.actuations.get(entity_id, 0) + 1
+        self.service_call_latency.add(seconds)
+
+    def as_dict(self) -> dict:
+        """Return the statistics as a dict."""
+        return {
+            "passes": self.passes,
+            "skipped_passes": self.skipped_passes,
+            "contended_requests": self.contended_requests,
+            "rejected_samples": self.rejected_samples,
+            "pass_latency": self.pass_latency.as_dict(),
+            "lock_wait": self.lock_wait.as_dict(),
+            "service_call_latency": self.service_call_latency.as_dict(),
+            "actuations": dict(self.actuations),
+        }
@@ -0,0 +1,50 @@
+"""Decision Log for Dual Smart Thermostat."""
+
+import logging
+import time
+from typing import Any
+
+# unchanged decisions are logged again at most once per this many seconds
+SAMPLE_INTERVAL = 600.0
+
+
+class DecisionLog:
+    """Logs one compact record per control decision of a thermostat.
+
+    A decision that equals the previous one, the same action on the same
+    device, is suppressed and only counted, it is logged again at most once
+    per SAMPLE_INTERVAL. The number of suppressed records is reported with
+    the next logged record. The fields describe the decision, they are not
+    compared and only formatted when the record is logged.
+    """
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self._logger = logger
+        self._last: tuple[str, str | None] | None = None
+        self._last_logged = 0.0
+        self._suppressed = 0
+
+    def record(
+        self, name: str, decision: str, entity_id: str | None, **fields: Any
+    ) -> None:
+        """Record a decision of thermostat name about device entity_id."""
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
+
+        key = (decision, entity_id)
+        now = time.monotonic()
+        if key == self._last and now - self._last_logged < SAMPLE_INTERVAL:
+            self._suppressed += 1
+            return
+
+        self._logger.info(
+            "%s: %s %s %s (%s suppressed)",
+            name,
+            decision,
+            entity_id,
+            " ".join(f"{field}={value}" for field, value in fields.items()),
+            self._suppressed,
+        )
+        self._last = key
+        self._last_logged = now
+        self._suppressed = 0
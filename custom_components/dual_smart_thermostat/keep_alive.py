@@ -0,0 +1,155 @@
+"""Keep Alive Scheduler for Dual Smart Thermostat."""
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+import math
+import zlib
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+import homeassistant.util.dt as dt_util
+
+from custom_components.dual_smart_thermostat.const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_KEEP_ALIVE = "keep_alive_scheduler"
+
+# delay before dispatching keep-alives held back by the rate cap
+RATE_PERIOD = 1.0
+
+
+@dataclass
+class KeepAliveEntry:
+    """A thermostat registered with the keep-alive scheduler."""
+
+    key: str
+    interval: float
+    job: HassJob
+    max_rate: int | None
+    next_due: float = 0.0
+    queued: bool = False
+
+
+class KeepAliveScheduler:
+    """Drives the keep-alive of all thermostats of the platform from one timer.
+
+    Each thermostat gets a fixed phase within its interval, derived from its
+    entity id, so thermostats sharing an interval are spread across it
+    instead of firing together. Keep-alives that are due at the same time are
+    dispatched at most max_rate per second, the lowest max_rate of the
+    registered thermostats applies.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._entries: dict[str, KeepAliveEntry] = {}
+        self._backlog: deque[KeepAliveEntry] = deque()
+        self._max_rate: int | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._timer_due = 0.0
+        self._tick_job = HassJob(
+            self._async_tick,
+            "dual smart thermostat keep-alive",
+            cancel_on_shutdown=True,
+        )
+
+    @classmethod
+    def async_get(cls, hass: HomeAssistant) -> "KeepAliveScheduler":
+        """Return the keep-alive scheduler of the platform."""
+        data = hass.data.setdefault(DOMAIN, {})
+        if (scheduler := data.get(DATA_KEEP_ALIVE)) is None:
+            scheduler = data[DATA_KEEP_ALIVE] = cls(hass)
+        return scheduler
+
+    @staticmethod
+    def phase(key: str, interval: float) -> float:
+        """Return the deterministic phase of a thermostat within interval."""
+        return zlib.crc32(key.encode()) / 2**32 * interval
+
+    @callback
+    def async_register(
+        self, key: str, interval: timedelta, action, max_rate: int | None = None
+    ) -> CALLBACK_TYPE:
+        """Run action every interval, returns a callback to unregister."""
+        seconds = interval.total_seconds()
+        entry = KeepAliveEntry(
+            key, seconds, HassJob(action, cancel_on_shutdown=True), max_rate
+        )
+        now = self.hass.loop.time()
+        phase = self.phase(key, seconds)
+        entry.next_due = phase + math.ceil((now - phase) / seconds) * seconds
+        if entry.next_due <= now:
+            entry.next_due += seconds
+
+        self._entries[key] = entry
+        self._update_max_rate()
+        self._async_schedule()
+
+        @callback
+        def _async_unregister() -> None:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            if entry.queued:
+                self._backlog.remove(entry)
+                entry.queued = False
+            self._update_max_rate()
+            self._async_schedule()
+
+        return _async_unregister
+
+    def _update_max_rate(self) -> None:
+        rates = [entry.max_rate for entry in self._entries.values() if entry.max_rate]
+        self._max_rate = min(rates) if rates else None
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Arm the timer for the next due keep-alive."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+        now = self.hass.loop.time()
+        if self._backlog:
+            self._timer_due = now + RATE_PERIOD
+        elif self._entries:
+            self._timer_due = min(entry.next_due for entry in self._entries.values())
+        else:
+            return
+
+        delay = max(self._timer_due - now, 0)
+        self._unsub_timer = async_call_later(self.hass, delay, self._tick_job)
+
+    @callback
+    def _async_tick(self, _now=None) -> None:
+        """Dispatch the keep-alives that are due."""
+        self._unsub_timer = None
+        # the timer fired for the time it was armed for
+        now = max(self.hass.loop.time(), self._timer_due)
+
+        for entry in self._entries.values():
+            if entry.next_due > now:
+                continue
+            missed = math.floor((now - entry.next_due) / entry.interval) + 1
+            entry.next_due += missed * entry.interval
+            if not entry.queued:
+                entry.queued = True
+                self._backlog.append(entry)
+
+        budget = self._max_rate or len(self._backlog)
+        time = dt_util.utcnow()
+        while self._backlog and budget > 0:
+            entry = self._backlog.popleft()
+            entry.queued = False
+            budget -= 1
+            _LOGGER.debug("Keep-alive for %s", entry.key)
+            self.hass.async_run_hass_job(entry.job, time)
+
+        if self._backlog:
+            _LOGGER.debug(
+                "Keep-alive rate cap reached, %s thermostats deferred",
+                len(self._backlog),
+            )
+        self._async_schedule()
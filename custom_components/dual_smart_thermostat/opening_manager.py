@@ -1,16 +1,13 @@
 """Opening Manager for Dual Smart Thermostat."""
 
+from datetime import datetime, timedelta
+from functools import partial
 import logging
 
-from homeassistant.const import (
-    ATTR_ENTITY_ID,
-    STATE_ON,
-    STATE_OPEN,
-    STATE_UNAVAILABLE,
-    STATE_UNKNOWN,
-)
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import condition
+from homeassistant.const import ATTR_ENTITY_ID, STATE_ON, STATE_OPEN
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_call_later
+import homeassistant.util.dt as dt_util
 
 from custom_components.dual_smart_thermostat.const import (
     ATTR_TIMEOUT,
@@ -29,6 +26,16 @@ class OpeningManager:
         self.opening_entities = (
             self.conform_opnening_entities(self.openings) if openings else []
         )
+        self._timeouts: dict[str, timedelta | None] = {
+            opening[ATTR_ENTITY_ID]: opening[ATTR_TIMEOUT] for opening in self.openings
+        }
+        # openings that are open, timed ones once their timeout passed
+        self._open: set[str] = set()
+        # timed openings that are open, with the time their timeout passes
+        self._pending: dict[str, datetime] = {}
+        # one timer per pending timed opening, firing when its timeout passes
+        self._timers: dict[str, CALLBACK_TYPE] = {}
+        self._timeout_job: HassJob | None = None
 
     @staticmethod
     def conform_openings_list(openings: list) -> list:
@@ -50,59 +57,87 @@ class OpeningManager:
     @property
     def any_opening_open(self) -> bool:
         """If any opening is currently open."""
-        _LOGGER.debug("_any_opening_open")
-        if not self.opening_entities:
+        if self._open:
+            return True
+        if not self._pending:
             return False
 
-        _is_open = False
-        for opening in self.openings:
-            if self._is_opening_open(opening):
-                _is_open = True
-                break
-
-        return _is_open
-
-    def _is_opening_open(self, opening: TIMED_OPENING_SCHEMA) -> None:  # type: ignore
-        """If the opening is currently open."""
-        opening_entity = opening[ATTR_ENTITY_ID]
-        opening_entity_state = self.hass.states.get(opening_entity)
-        _is_open = False
-        if (
-            opening_entity_state not in (STATE_UNAVAILABLE, STATE_UNKNOWN)
-            and opening[ATTR_TIMEOUT] is not None
-            and self._is_opening_timed_out(opening)
-        ):
-            _is_open = True
-            _LOGGER.debug(
-                "Have timeout mode for opening %s, is open: %s",
-                opening,
-                _is_open,
-            )
-        else:
-            if self.hass.states.is_state(
-                opening_entity, STATE_OPEN
-            ) or self.hass.states.is_state(opening_entity, STATE_ON):
-                _is_open = True
-            _LOGGER.debug(
-                "No timeout mode for opening %s, is open: %s.",
-                opening_entity,
-                _is_open,
-            )
-        return _is_open
+        # promote timed openings that have been open for their timeout
+        now = dt_util.utcnow()
+        for opening_entity, deadline in list(self._pending.items()):
+            if now > deadline:
+                _LOGGER.debug("Opening %s timed out, is open", opening_entity)
+                del self._pending[opening_entity]
+                self._open.add(opening_entity)
 
-    def _is_opening_timed_out(self, opening: TIMED_OPENING_SCHEMA) -> bool:  # type: ignore
-        opening_entity = opening[ATTR_ENTITY_ID]
-        _is_open = False
-        if condition.state(
-            self.hass,
-            opening_entity,
-            STATE_OPEN,
-            opening[ATTR_TIMEOUT],
-        ) or condition.state(
-            self.hass,
+        return bool(self._open)
+
+    @callback
+    def async_listen_timeouts(self, action) -> CALLBACK_TYPE:
+        """Run action when a timed opening has been open for its timeout.
+
+        Returns a callback that cancels all running timers.
+        """
+        self._timeout_job = HassJob(action)
+
+        @callback
+        def _async_cancel_timers() -> None:
+            self._timeout_job = None
+            for cancel in self._timers.values():
+                cancel()
+            self._timers.clear()
+
+        return _async_cancel_timers
+
+    def is_timer_running(self, opening_entity: str) -> bool:
+        """If a timed opening is open and waiting for its timeout."""
+        return opening_entity in self._timers
+
+    @callback
+    def _async_opening_timed_out(self, opening_entity: str, time: datetime) -> None:
+        """Mark a timed opening as open and run the timeout action."""
+        self._timers.pop(opening_entity, None)
+        if self._pending.pop(opening_entity, None) is not None:
+            _LOGGER.debug("Opening %s timed out, is open", opening_entity)
+            self._open.add(opening_entity)
+        if self._timeout_job is not None:
+            self.hass.async_run_hass_job(self._timeout_job, time)
+
+    def seed(self) -> None:
+        """Read the current state of all openings from the state machine."""
+        for opening_entity in self.opening_entities:
+            self.update(opening_entity, self.hass.states.get(opening_entity))
+
+    def update(self, opening_entity: str, state: State | None) -> None:
+        """Track the new state of an opening."""
+        self._open.discard(opening_entity)
+        self._pending.pop(opening_entity, None)
+        if (cancel := self._timers.pop(opening_entity, None)) is not None:
+            cancel()
+        if state is None or state.state not in (STATE_OPEN, STATE_ON):
+            return
+
+        timeout = self._timeouts.get(opening_entity)
+        if timeout is None:
+            self._open.add(opening_entity)
+        else:
+            deadline = state.last_changed + timeout
+            self._pending[opening_entity] = deadline
+            if self._timeout_job is not None:
+                delay = max((deadline - dt_util.utcnow()).total_seconds(), 0)
+                self._timers[opening_entity] = async_call_later(
+                    self.hass,
+                    delay,
+                    HassJob(
+                        partial(self._async_opening_timed_out, opening_entity),
+                        "dual smart thermostat opening timeout",
+                        cancel_on_shutdown=True,
+                    ),
+                )
+        _LOGGER.debug(
+            "Opening %s changed to %s, open: %s, timed: %s",
             opening_entity,
-            STATE_ON,
-            opening[ATTR_TIMEOUT],
-        ):
-            _is_open = True
-        return _is_open
+            state.state,
+            opening_entity in self._open,
+            opening_entity in self._pending,
+        )
@@ -0,0 +1,64 @@
+"""PID Controller for Dual Smart Thermostat.
+
+The output of the controller is the share of a period a device runs, between
+0 and 1. It only depends on its gains and state, so a fleet of thermostats
+keeps a few floats per zone.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class PidGains:
+    """Gains of a PID controller.
+
+    kp is per degree, ki per degree and second and kd per degree per second.
+    """
+
+    kp: float
+    ki: float = 0.0
+    kd: float = 0.0
+
+
+@dataclass(slots=True)
+class PidState:
+    """State of a PID controller between updates, times are utc timestamps."""
+
+    integral: float = 0.0
+    measurement: float | None = None
+    time: float | None = None
+
+
+def pid_update(
+    gains: PidGains,
+    state: PidState,
+    error: float,
+    measurement: float,
+    now: float,
+    max_interval: float,
+) -> float:
+    """Update the state and return the output, between 0 and 1.
+
+    The error is positive if the device has to work, the measurement grows
+    with the error. The integral covers the time since the last update, at
+    most max_interval, and stops growing while the output is saturated. The
+    derivative is taken of the measurement, so a new target does not kick
+    the output.
+    """
+    proportional = gains.kp * error
+    derivative = 0.0
+    if state.time is not None and now > state.time:
+        derivative = gains.kd * (measurement - state.measurement) / (now - state.time)
+
+    if gains.ki:
+        elapsed = max_interval if state.time is None else now - state.time
+        integral = state.integral + gains.ki * error * min(elapsed, max_interval)
+        output = proportional + integral + derivative
+        if not (output > 1 and integral > state.integral) and not (
+            output < 0 and integral < state.integral
+        ):
+            state.integral = min(max(integral, 0.0), 1.0)
+
+    state.measurement = measurement
+    state.time = now
+    return min(max(proportional + state.integral + derivative, 0.0), 1.0)
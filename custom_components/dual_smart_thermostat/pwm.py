@@ -0,0 +1,188 @@
+"""PWM Controller for Dual Smart Thermostat."""
+
+from datetime import timedelta
+import logging
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from custom_components.dual_smart_thermostat.control_engine import (
+    ControlSnapshot,
+    Device,
+)
+from custom_components.dual_smart_thermostat.pid import PidGains, PidState, pid_update
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PwmController:
+    """Time-proportional control of a thermostat.
+
+    At the start of every period the duty cycle is computed by a PID
+    controller from how far the temperature is from the target. The device
+    is turned on at the start of the period and off once the duty cycle of
+    the period passed, so it is switched once on and once off per period,
+    however noisy the sensor is. A configured aux heater takes over the
+    periods once the heater ran the whole time for the aux heater timeout.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        period: timedelta,
+        gains: PidGains,
+        min_cycle_duration: timedelta | None = None,
+    ) -> None:
+        self.hass = hass
+        self.period = period
+        self.gains = gains
+        self.min_cycle_duration = min_cycle_duration
+        self.state = PidState()
+        # the device of the running period and if it is in its on phase
+        self.device: Device | None = None
+        self.duty_cycle = 0.0
+        self.is_on = False
+        # a new period starts with the next control pass
+        self.period_due = True
+        self._job: HassJob | None = None
+        self._period_timer: CALLBACK_TYPE | None = None
+        self._off_timer: CALLBACK_TYPE | None = None
+        self._period_job = HassJob(
+            self._async_period_ended,
+            "dual smart thermostat pwm period",
+            cancel_on_shutdown=True,
+        )
+        self._off_job = HassJob(
+            self._async_duty_ended,
+            "dual smart thermostat pwm off",
+            cancel_on_shutdown=True,
+        )
+
+    @callback
+    def async_listen(self, action) -> CALLBACK_TYPE:
+        """Run action when a period starts or its on phase ends.
+
+        Returns a callback that cancels the running timers.
+        """
+        self._job = HassJob(action)
+
+        @callback
+        def _async_cancel_timers() -> None:
+            self._job = None
+            self._cancel_timers()
+
+        return _async_cancel_timers
+
+    def start_period(self, snapshot: ControlSnapshot) -> None:
+        """Compute the duty cycle of a new period and schedule its timers."""
+        device, error = self.demand(snapshot)
+        heating = device == Device.HEATER and snapshot.hvac_mode != HVACMode.COOL
+        if self.device is not None and device != self._demand_device(self.device):
+            self.state = PidState()
+        duty_cycle = pid_update(
+            self.gains,
+            self.state,
+            error,
+            -snapshot.cur_temp if heating else snapshot.cur_temp,
+            snapshot.now,
+            self.period.total_seconds(),
+        )
+        if heating and self._aux_heater_runs(snapshot, duty_cycle):
+            device = Device.AUX_HEATER
+        self.device = device
+        self.duty_cycle = self._min_cycle(duty_cycle)
+        self.is_on = self.duty_cycle > 0
+        self.period_due = False
+        _LOGGER.debug(
+            "PWM period of %s, error %s, duty cycle %s",
+            device,
+            error,
+            self.duty_cycle,
+        )
+
+        self._cancel_timers()
+        if self._job is None:
+            return
+        self._period_timer = async_call_later(self.hass, self.period, self._period_job)
+        if 0 < self.duty_cycle < 1:
+            self._off_timer = async_call_later(
+                self.hass,
+                self.duty_cycle * self.period.total_seconds(),
+                self._off_job,
+            )
+
+    @staticmethod
+    def demand(snapshot: ControlSnapshot) -> tuple[Device, float]:
+        """Return the device to run and how far the temperature is from target.
+
+        The error is positive if the device has to work. In heat_cool mode the
+        heater runs below the middle of the target range, the cooler above.
+        """
+        if snapshot.cooler is not None and snapshot.hvac_mode == HVACMode.HEAT_COOL:
+            low = snapshot.target_temp_low
+            high = snapshot.target_temp_high
+            if snapshot.cur_temp < (low + high) / 2:
+                return Device.HEATER, low - snapshot.cur_temp
+            return Device.COOLER, snapshot.cur_temp - high
+        if snapshot.ac_mode or (
+            snapshot.cooler is not None and snapshot.hvac_mode == HVACMode.COOL
+        ):
+            device = Device.COOLER if snapshot.cooler is not None else Device.HEATER
+            return device, snapshot.cur_temp - snapshot.target_temp
+        return Device.HEATER, snapshot.target_temp - snapshot.cur_temp
+
+    def _aux_heater_runs(self, snapshot: ControlSnapshot, duty_cycle: float) -> bool:
+        """If the aux heater runs the period instead of the heater.
+
+        It takes over once the heater ran the whole time for the aux heater
+        timeout, and keeps the periods until there is no demand left.
+        """
+        if not snapshot.aux_heating_configured:
+            return False
+        if self.device == Device.AUX_HEATER:
+            return duty_cycle > 0
+        heater = snapshot.heater
+        return (
+            duty_cycle == 1
+            and heater.is_on
+            and snapshot.now - heater.since > snapshot.aux_heater_timeout
+        )
+
+    @staticmethod
+    def _demand_device(device: Device) -> Device:
+        return Device.HEATER if device == Device.AUX_HEATER else device
+
+    def _min_cycle(self, duty_cycle: float) -> float:
+        """Round on and off phases shorter than min_cycle_duration away."""
+        if not self.min_cycle_duration:
+            return duty_cycle
+        shortest = self.min_cycle_duration / self.period
+        if duty_cycle < shortest:
+            return 0.0
+        if duty_cycle > 1 - shortest:
+            return 1.0
+        return duty_cycle
+
+    def _cancel_timers(self) -> None:
+        for timer in (self._period_timer, self._off_timer):
+            if timer is not None:
+                timer()
+        self._period_timer = None
+        self._off_timer = None
+
+    @callback
+    def _async_period_ended(self, _time) -> None:
+        self._period_timer = None
+        self.period_due = True
+        self._async_run()
+
+    @callback
+    def _async_duty_ended(self, _time) -> None:
+        self._off_timer = None
+        self.is_on = False
+        self._async_run()
+
+    def _async_run(self) -> None:
+        if self._job is not None:
+            self.hass.async_run_hass_job(self._job)
@@ -0,0 +1,159 @@
+"""Diagnostic sensors for the Dual Smart Thermostat statistics."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    CONF_NAME,
+    CONF_UNIQUE_ID,
+    EntityCategory,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType, StateType
+
+from custom_components.dual_smart_thermostat.control_stats import (
+    DATA_STATISTICS,
+    ControlStats,
+    LatencyHistogram,
+)
+
+from . import DOMAIN
+
+SCAN_INTERVAL = timedelta(minutes=1)
+
+
+def _mean_ms(histogram: LatencyHistogram) -> float | None:
+    if (mean := histogram.mean) is None:
+        return None
+    return round(mean * 1000, 3)
+
+
+@dataclass(frozen=True, kw_only=True)
+class StatisticsSensorEntityDescription(SensorEntityDescription):
+    """Describes a statistics sensor of a thermostat."""
+
+    value_fn: Callable[[ControlStats], StateType]
+
+
+SENSOR_TYPES: tuple[StatisticsSensorEntityDescription, ...] = (
+    StatisticsSensorEntityDescription(
+        key="control_passes",
+        name="control passes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.passes,
+    ),
+    StatisticsSensorEntityDescription(
+        key="skipped_control_passes",
+        name="skipped control passes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.skipped_passes,
+    ),
+    StatisticsSensorEntityDescription(
+        key="contended_control_requests",
+        name="contended control requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.contended_requests,
+    ),
+    StatisticsSensorEntityDescription(
+        key="rejected_sensor_samples",
+        name="rejected sensor samples",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.rejected_samples,
+    ),
+    StatisticsSensorEntityDescription(
+        key="control_pass_latency",
+        name="control pass latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: _mean_ms(stats.pass_latency),
+    ),
+    StatisticsSensorEntityDescription(
+        key="service_calls",
+        name="service calls",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.service_call_latency.count,
+    ),
+    StatisticsSensorEntityDescription(
+        key="service_call_latency",
+        name="service call latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: _mean_ms(stats.service_call_latency),
+    ),
+)
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up the statistics sensors of a thermostat."""
+    if discovery_info is None:
+        return
+
+    async_add_entities(
+        [
+            StatisticsSensor(
+                discovery_info[ATTR_ENTITY_ID],
+                discovery_info[CONF_NAME],
+                discovery_info[CONF_UNIQUE_ID],
+                description,
+            )
+            for description in SENSOR_TYPES
+        ]
+    )
+
+
+class StatisticsSensor(SensorEntity):
+    """Representation of a statistic of a Dual Smart Thermostat."""
+
+    entity_description: StatisticsSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        thermostat_entity_id: str,
+        thermostat_name: str,
+        thermostat_unique_id: str | None,
+        description: StatisticsSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._thermostat_entity_id = thermostat_entity_id
+        self._attr_name = f"{thermostat_name} {description.name}"
+        if thermostat_unique_id is not None:
+            self._attr_unique_id = f"{thermostat_unique_id}_{description.key}"
+
+    @property
+    def available(self) -> bool:
+        """Return if the thermostat publishes statistics."""
+        return self._stats is not None
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value of the statistic."""
+        if (stats := self._stats) is None:
+            return None
+        return self.entity_description.value_fn(stats)
+
+    @property
+    def _stats(self) -> ControlStats | None:
+        return (
+            self.hass.data.get(DOMAIN, {})
+            .get(DATA_STATISTICS, {})
+            .get(self._thermostat_entity_id)
+        )
@@ -0,0 +1,173 @@
+"""Sensor Aggregator for Dual Smart Thermostat."""
+
+from bisect import bisect_left, insort
+import logging
+
+from homeassistant.const import ATTR_ENTITY_ID
+
+from custom_components.dual_smart_thermostat.const import (
+    ATTR_WEIGHT,
+    WEIGHTED_SENSOR_SCHEMA,
+    SensorAggregation,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# number of updates after which the running sums are recomputed from the
+# value table to keep the float error from accumulating
+RESYNC_INTERVAL = 1000
+
+
+class SensorAggregator:
+    """Aggregates the readings of one or more target sensors.
+
+    The latest reading of every member is kept in a value table and the
+    aggregate is updated incrementally from it, so a member update never
+    has to look at the state of the other members.
+    """
+
+    def __init__(self, sensors, aggregation: SensorAggregation | None = None) -> None:
+        self.sensors = self.conform_sensors_list(sensors)
+        self.sensor_entities = self.conform_sensor_entities(self.sensors)
+        self.aggregation = aggregation or SensorAggregation.MEAN
+        self._single = len(self.sensors) == 1
+        self._weights = {
+            entry[ATTR_ENTITY_ID]: (
+                entry[ATTR_WEIGHT]
+                if self.aggregation == SensorAggregation.WEIGHTED
+                else 1.0
+            )
+            for entry in self.sensors
+        }
+        self._values: dict[str, float] = {}
+        self._weighted_sum = 0.0
+        self._weight_total = 0.0
+        self._updates = 0
+        self._sorted_values: list[float] = []
+        self._extreme_entity: str | None = None
+        self.value: float | None = None
+
+    @staticmethod
+    def conform_sensors_list(sensors) -> list:
+        """Return a list of weighted sensors from a list of entities."""
+        if isinstance(sensors, str):
+            sensors = [sensors]
+        return [
+            (
+                entry
+                if isinstance(entry, dict)
+                else {ATTR_ENTITY_ID: entry, ATTR_WEIGHT: 1.0}
+            )
+            for entry in sensors
+        ]
+
+    @staticmethod
+    def conform_sensor_entities(sensors: [WEIGHTED_SENSOR_SCHEMA]) -> list:  # type: ignore
+        """Return a list of entities from a list of weighted sensors."""
+        return [entry[ATTR_ENTITY_ID] for entry in sensors]
+
+    def update(self, entity_id: str, value: float) -> float | None:
+        """Update the reading of a member and return the new aggregate."""
+        if self._single:
+            self.value = value
+            return value
+        self._update_member(entity_id, value)
+        return self.value
+
+    def remove(self, entity_id: str) -> float | None:
+        """Remove the reading of a member and return the new aggregate."""
+        if self._single:
+            return None
+        if entity_id not in self._values:
+            return self.value
+        self._update_member(entity_id, None)
+        return self.value
+
+    def _update_member(self, entity_id: str, value: float | None) -> None:
+        old_value = self._values.get(entity_id)
+
+        match self.aggregation:
+            case SensorAggregation.MEDIAN:
+                if old_value is not None:
+                    del self._sorted_values[bisect_left(self._sorted_values, old_value)]
+                if value is not None:
+                    insort(self._sorted_values, value)
+                self._set_value(entity_id, value)
+                self.value = self._median()
+
+            case SensorAggregation.MIN | SensorAggregation.MAX:
+                extreme = self._extreme_entity
+                rescan = False
+                if value is not None and (
+                    extreme is None or self._is_extreme(value, self._values[extreme])
+                ):
+                    self._extreme_entity = entity_id
+                elif entity_id == extreme:
+                    # the extreme member got worse or left, look it up again
+                    rescan = True
+                self._set_value(entity_id, value)
+                if rescan:
+                    self._extreme_entity = self._scan_extreme()
+                self.value = (
+                    self._values[self._extreme_entity]
+                    if self._extreme_entity is not None
+                    else None
+                )
+
+            case _:
+                weight = self._weights[entity_id]
+                if old_value is not None:
+                    self._weighted_sum -= weight * old_value
+                    self._weight_total -= weight
+                if value is not None:
+                    self._weighted_sum += weight * value
+                    self._weight_total += weight
+                self._set_value(entity_id, value)
+                self._updates += 1
+                if self._updates >= RESYNC_INTERVAL:
+                    self._resync_sums()
+                self.value = (
+                    self._weighted_sum / self._weight_total if self._values else None
+                )
+
+        _LOGGER.debug(
+            "Aggregated %s of %s sensors: %s",
+            self.aggregation,
+            len(self._values),
+            self.value,
+        )
+
+    def _set_value(self, entity_id: str, value: float | None) -> None:
+        if value is None:
+            self._values.pop(entity_id, None)
+        else:
+            self._values[entity_id] = value
+
+    def _median(self) -> float | None:
+        count = len(self._sorted_values)
+        if not count:
+            return None
+        middle = count // 2
+        if count % 2:
+            return self._sorted_values[middle]
+        return (self._sorted_values[middle - 1] + self._sorted_values[middle]) / 2
+
+    def _is_extreme(self, value: float, current: float) -> bool:
+        if self.aggregation == SensorAggregation.MIN:
+            return value <= current
+        return value >= current
+
+    def _scan_extreme(self) -> str | None:
+        if not self._values:
+            return None
+        if self.aggregation == SensorAggregation.MIN:
+            return min(self._values, key=self._values.__getitem__)
+        return max(self._values, key=self._values.__getitem__)
+
+    def _resync_sums(self) -> None:
+        self._updates = 0
+        self._weighted_sum = sum(
+            self._weights[entity_id] * value
+            for entity_id, value in self._values.items()
+        )
+        self._weight_total = sum(self._weights[entity_id] for entity_id in self._values)
@@ -0,0 +1,115 @@
+"""Sensor Filter for Dual Smart Thermostat."""
+
+from array import array
+from bisect import bisect_left, bisect_right
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SensorFilter:
+    """Outlier rejection and smoothing for the readings of one sensor.
+
+    The stages run in order: a maximum slew rate rejects spikes, a
+    median-of-N suppresses jitter and an exponential moving average smooths
+    the result. Every stage is optional. The median window uses ring buffers
+    that are allocated once, so processing a reading does not allocate.
+    """
+
+    def __init__(
+        self,
+        median_window: int | None = None,
+        ema_alpha: float | None = None,
+        max_slew_rate: float | None = None,
+    ) -> None:
+        self._median_window = median_window or 0
+        self._ring = array("d", [0.0]) * self._median_window
+        self._sorted = array("d", [0.0]) * self._median_window
+        self._count = 0
+        self._index = 0
+        self._ema_alpha = ema_alpha
+        self._ema: float | None = None
+        # max_slew_rate is configured per minute
+        self._max_slew = max_slew_rate / 60 if max_slew_rate else None
+        self._last_value: float | None = None
+        self._last_timestamp = 0.0
+        self._candidate: float | None = None
+        self._candidate_timestamp = 0.0
+        self.value: float | None = None
+
+    def process(self, value: float, timestamp: float) -> float | None:
+        """Filter a reading taken at timestamp (seconds).
+
+        Returns the filtered value or None if the reading was rejected.
+        """
+        if self._max_slew is not None and not self._within_slew_rate(value, timestamp):
+            return None
+
+        if self._median_window:
+            value = self._median(value)
+
+        if self._ema_alpha:
+            if self._ema is None:
+                self._ema = value
+            else:
+                self._ema += self._ema_alpha * (value - self._ema)
+            value = self._ema
+
+        self.value = value
+        return value
+
+    def _within_slew_rate(self, value: float, timestamp: float) -> bool:
+        """Check if the reading is reachable from the last accepted one.
+
+        A rejected reading is kept as candidate, if the next reading confirms
+        it the jump is considered real and the reading accepted.
+        """
+        if self._last_value is not None and not self._is_reachable(
+            value, timestamp, self._last_value, self._last_timestamp
+        ):
+            if self._candidate is None or not self._is_reachable(
+                value, timestamp, self._candidate, self._candidate_timestamp
+            ):
+                _LOGGER.debug("Rejecting reading %s, slew rate exceeded", value)
+                self._candidate = value
+                self._candidate_timestamp = timestamp
+                return False
+
+        self._candidate = None
+        self._last_value = value
+        self._last_timestamp = timestamp
+        return True
+
+    def _is_reachable(
+        self, value: float, timestamp: float, from_value: float, from_timestamp: float
+    ) -> bool:
+        elapsed = max(timestamp - from_timestamp, 0.0)
+        return abs(value - from_value) <= self._max_slew * elapsed
+
+    def _median(self, value: float) -> float:
+        """Push the reading into the window and return the window median."""
+        window = self._median_window
+        ordered = self._sorted
+        count = self._count
+
+        if count == window:
+            # drop the oldest reading from the ordered buffer
+            position = bisect_left(ordered, self._ring[self._index], 0, count)
+            for i in range(position, count - 1):
+                ordered[i] = ordered[i + 1]
+            count -= 1
+
+        position = bisect_right(ordered, value, 0, count)
+        for i in range(count, position, -1):
+            ordered[i] = ordered[i - 1]
+        ordered[position] = value
+        count += 1
+
+        self._ring[self._index] = value
+        self._index = (self._index + 1) % window
+        self._count = count
+
+        middle = count // 2
+        if count % 2:
+            return ordered[middle]
+        return (ordered[middle - 1] + ordered[middle]) / 2
@@ -0,0 +1,90 @@
+"""Sensor State Parser for Dual Smart Thermostat."""
+
+import logging
+import math
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# states that can never be a temperature, rejected without parsing
+BAD_STATES = frozenset(
+    (
+        "",
+        "nan",
+        "-nan",
+        "inf",
+        "+inf",
+        "-inf",
+        "infinity",
+        "+infinity",
+        "-infinity",
+        "none",
+        "null",
+        "unknown",
+        "unavailable",
+    )
+)
+
+# minimum number of seconds between two errors logged for the same sensor
+ERROR_LOG_INTERVAL = 3600
+
+
+class SensorStateParser:
+    """Parses the states of one sensor into temperatures.
+
+    The last state and its value are cached, so repeated states are not
+    parsed again, and known bad states are rejected without raising. Errors
+    about bad states are logged at most once per ERROR_LOG_INTERVAL.
+    """
+
+    def __init__(self, entity_id: str) -> None:
+        self.entity_id = entity_id
+        self._last_state: str | None = None
+        self._last_value: float | None = None
+        self._last_error_log: float | None = None
+        self._suppressed_errors = 0
+
+    def parse(self, state: str) -> float | None:
+        """Return the temperature of a state or None if it is not valid."""
+        if state == self._last_state:
+            if self._last_value is None:
+                self._log_rejected(state)
+            return self._last_value
+
+        self._last_state = state
+        self._last_value = None
+        if state is None or state.lower() in BAD_STATES:
+            self._log_rejected(state)
+            return None
+
+        try:
+            value = float(state)
+        except ValueError:
+            self._log_rejected(state)
+            return None
+
+        if not math.isfinite(value):
+            self._log_rejected(state)
+            return None
+
+        self._last_value = value
+        return value
+
+    def _log_rejected(self, state: str | None) -> None:
+        now = time.monotonic()
+        if (
+            self._last_error_log is not None
+            and now - self._last_error_log < ERROR_LOG_INTERVAL
+        ):
+            self._suppressed_errors += 1
+            return
+
+        _LOGGER.error(
+            "Unable to update from sensor %s, illegal state %s "
+            "(%s similar errors suppressed)",
+            self.entity_id,
+            state,
+            self._suppressed_errors,
+        )
+        self._last_error_log = now
+        self._suppressed_errors = 0
@@ -0,0 +1,134 @@
+"""Startup Coordinator for Dual Smart Thermostat."""
+
+from collections.abc import Callable
+from datetime import timedelta
+from functools import partial
+import logging
+
+from homeassistant.const import EVENT_HOMEASSISTANT_START
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    CoreState,
+    Event,
+    HassJob,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.event import async_call_later
+
+from custom_components.dual_smart_thermostat.const import DOMAIN
+from custom_components.dual_smart_thermostat.keep_alive import KeepAliveScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_STARTUP = "startup_coordinator"
+
+
+class StartupCoordinator:
+    """Runs the startup of the thermostats of the platform.
+
+    Thermostats registered before Home Assistant started are started once it
+    has. A thermostat with a startup window starts at a fixed phase within
+    it, derived from its entity id, so the first control passes of many
+    thermostats are spread across the window instead of running together.
+    The time from the start of a batch until all its thermostats are
+    started is logged and kept as time_to_ready.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._actions: dict[str, tuple[HassJob, float]] = {}
+        self._pending: set[str] = set()
+        self._timers: dict[str, CALLBACK_TYPE] = {}
+        self._unsub_start: CALLBACK_TYPE | None = None
+        self._batch_start: float | None = None
+        self._batch_started = 0
+        self.time_to_ready: float | None = None
+
+    @classmethod
+    def async_get(cls, hass: HomeAssistant) -> "StartupCoordinator":
+        """Return the startup coordinator of the platform."""
+        data = hass.data.setdefault(DOMAIN, {})
+        if (coordinator := data.get(DATA_STARTUP)) is None:
+            coordinator = data[DATA_STARTUP] = cls(hass)
+        return coordinator
+
+    @property
+    def pending(self) -> int:
+        """The number of thermostats not started yet."""
+        return len(self._pending)
+
+    @callback
+    def async_register(
+        self, key: str, action: Callable[[], None], window: timedelta | None = None
+    ) -> CALLBACK_TYPE:
+        """Run action once to start a thermostat, returns a callback to cancel."""
+        seconds = window.total_seconds() if window else 0.0
+        self._actions[key] = (HassJob(action, cancel_on_shutdown=True), seconds)
+        if not self._pending:
+            self._batch_start = self.hass.loop.time()
+            self._batch_started = 0
+        self._pending.add(key)
+
+        if self.hass.state == CoreState.running:
+            self._async_schedule(key)
+        elif self._unsub_start is None:
+            self._unsub_start = self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_START, self._async_hass_started
+            )
+
+        @callback
+        def _async_unregister() -> None:
+            self._actions.pop(key, None)
+            if (unsub := self._timers.pop(key, None)) is not None:
+                unsub()
+            if key in self._pending:
+                self._pending.discard(key)
+                self._async_check_ready()
+
+        return _async_unregister
+
+    @callback
+    def _async_hass_started(self, _event: Event) -> None:
+        self._unsub_start = None
+        self._batch_start = self.hass.loop.time()
+        for key in list(self._pending):
+            self._async_schedule(key)
+
+    @callback
+    def _async_schedule(self, key: str) -> None:
+        """Start the thermostat now or at its phase in the startup window."""
+        _, window = self._actions[key]
+        if not window:
+            self._async_start(key)
+            return
+        delay = KeepAliveScheduler.phase(key, window)
+        _LOGGER.debug("Starting %s in %.1f seconds", key, delay)
+        self._timers[key] = async_call_later(
+            self.hass,
+            delay,
+            HassJob(partial(self._async_start, key), cancel_on_shutdown=True),
+        )
+
+    @callback
+    def _async_start(self, key: str, _now=None) -> None:
+        self._timers.pop(key, None)
+        if key not in self._pending:
+            return
+        self._pending.discard(key)
+        job, _ = self._actions.pop(key)
+        self._batch_started += 1
+        self.hass.async_run_hass_job(job)
+        self._async_check_ready()
+
+    @callback
+    def _async_check_ready(self) -> None:
+        if self._pending or self._batch_start is None:
+            return
+        self.time_to_ready = self.hass.loop.time() - self._batch_start
+        self._batch_start = None
+        _LOGGER.info(
+            "%s thermostats ready in %.2f seconds",
+            self._batch_started,
+            self.time_to_ready,
+        )
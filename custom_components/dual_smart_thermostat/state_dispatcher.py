@@ -0,0 +1,93 @@
+"""State Change Dispatcher for Dual Smart Thermostat."""
+
+from collections.abc import Callable, Iterable
+import logging
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import EventStateChangedData
+from homeassistant.helpers.typing import EventType
+
+from custom_components.dual_smart_thermostat.const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_STATE_DISPATCHER = "state_dispatcher"
+
+
+class StateDispatcher:
+    """Routes the state changes the thermostats of the platform listen to.
+
+    All thermostats share one state changed listener, events are routed by
+    entity id to the thermostats tracking that entity, so an entity shared by
+    several zones is dispatched from a single lookup.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._jobs: dict[str, list[HassJob]] = {}
+        self._unsub_listener: CALLBACK_TYPE | None = None
+
+    @classmethod
+    def async_get(cls, hass: HomeAssistant) -> "StateDispatcher":
+        """Return the state dispatcher of the platform."""
+        data = hass.data.setdefault(DOMAIN, {})
+        if (dispatcher := data.get(DATA_STATE_DISPATCHER)) is None:
+            dispatcher = data[DATA_STATE_DISPATCHER] = cls(hass)
+        return dispatcher
+
+    @property
+    def tracked_entities(self) -> list[str]:
+        """The entities with at least one listener."""
+        return list(self._jobs)
+
+    @callback
+    def async_track(
+        self,
+        entity_ids: Iterable[str],
+        action: Callable[[EventType[EventStateChangedData]], Any],
+    ) -> CALLBACK_TYPE:
+        """Run action on state changes of entity_ids, returns a callback to stop."""
+        entity_ids = [entity_id.lower() for entity_id in entity_ids]
+        job = HassJob(action, f"dual smart thermostat state change {entity_ids}")
+        for entity_id in entity_ids:
+            self._jobs.setdefault(entity_id, []).append(job)
+
+        if entity_ids and self._unsub_listener is None:
+            self._unsub_listener = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_dispatch,
+                event_filter=self._async_filter,
+            )
+
+        @callback
+        def _async_untrack() -> None:
+            for entity_id in entity_ids:
+                jobs = self._jobs.get(entity_id)
+                if jobs and job in jobs:
+                    jobs.remove(job)
+                    if not jobs:
+                        del self._jobs[entity_id]
+            if not self._jobs and self._unsub_listener is not None:
+                self._unsub_listener()
+                self._unsub_listener = None
+
+        return _async_untrack
+
+    @callback
+    def _async_filter(self, event: EventType[EventStateChangedData]) -> bool:
+        return event.data["entity_id"] in self._jobs
+
+    @callback
+    def _async_dispatch(self, event: EventType[EventStateChangedData]) -> None:
+        entity_id = event.data["entity_id"]
+        for job in self._jobs.get(entity_id, [])[:]:
+            try:
+                self.hass.async_run_hass_job(job, event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error while dispatching state change of %s to %s",
+                    entity_id,
+                    job,
+                )
@@ -0,0 +1,172 @@
+"""Thermal Model for Dual Smart Thermostat."""
+
+from array import array
+from datetime import timedelta
+import logging
+import math
+
+_LOGGER = logging.getLogger(__name__)
+
+# samples over shorter intervals are dominated by the sensor resolution,
+# longer gaps are not linear anymore
+MIN_SAMPLE_INTERVAL = 600
+MAX_SAMPLE_INTERVAL = 7200
+# the fit forgets with a time constant of 200 samples
+FORGETTING_FACTOR = 0.995
+INITIAL_COVARIANCE = 100.0
+RESTORED_COVARIANCE = 1.0
+MIN_SAMPLES = 12
+
+
+class ThermalModel:
+    """First-order RC model of a zone, fitted online by recursive least squares.
+
+    The temperature changes by
+
+        dT/dt = heating_rate * h - cooling_rate * c + outdoor_coupling * (To - T)
+
+    in degrees per hour, with h and c the share of the time the heating and
+    cooling run and To the outdoor temperature. Every sample updates the fit
+    in constant time, the state is the three parameters and their covariance.
+    Predictions look horizon ahead.
+    """
+
+    def __init__(self, horizon: timedelta) -> None:
+        self.horizon = horizon
+        self._theta = array("d", [0.0, 0.0, 0.0])
+        self._covariance = array("d", [0.0]) * 9
+        self._reset_covariance(INITIAL_COVARIANCE)
+        self.samples = 0
+        # the start of the running sample and the switch times during it
+        self._time: float | None = None
+        self._temp = 0.0
+        self._outdoor = 0.0
+        self._accounted = 0.0
+        self._heating_time = 0.0
+        self._cooling_time = 0.0
+        self._heating = False
+        self._cooling = False
+
+    @property
+    def heating_rate(self) -> float:
+        """Degrees per hour the heating adds."""
+        return self._theta[0]
+
+    @property
+    def cooling_rate(self) -> float:
+        """Degrees per hour the cooling takes."""
+        return self._theta[1]
+
+    @property
+    def outdoor_coupling(self) -> float:
+        """Share of the distance to the outdoor temperature closed per hour."""
+        return self._theta[2]
+
+    @property
+    def ready(self) -> bool:
+        """If the fit saw enough samples to predict."""
+        return self.samples >= MIN_SAMPLES and self.outdoor_coupling >= 0
+
+    def restore(
+        self,
+        heating_rate: float,
+        cooling_rate: float,
+        outdoor_coupling: float,
+        samples: int,
+    ) -> None:
+        """Continue the fit from restored parameters."""
+        self._theta[:] = array("d", [heating_rate, cooling_rate, outdoor_coupling])
+        self._reset_covariance(RESTORED_COVARIANCE)
+        self.samples = samples
+
+    def switch(self, now: float, heating: bool, cooling: bool) -> None:
+        """Record the switches running from now on."""
+        self._account(now)
+        self._heating = heating
+        self._cooling = cooling
+
+    def observe(self, now: float, temp: float | None, outdoor: float | None) -> None:
+        """Update the fit with the temperatures at now.
+
+        A sample covers the time since the previous one, readings within the
+        minimum sample interval are skipped.
+        """
+        if temp is None or outdoor is None:
+            self._time = None
+            return
+        if self._time is not None:
+            elapsed = now - self._time
+            if elapsed < MIN_SAMPLE_INTERVAL:
+                return
+            if elapsed <= MAX_SAMPLE_INTERVAL:
+                self._account(now)
+                self._update(
+                    (
+                        self._heating_time / elapsed,
+                        -self._cooling_time / elapsed,
+                        (self._outdoor + outdoor - self._temp - temp) / 2,
+                    ),
+                    (temp - self._temp) / elapsed * 3600,
+                )
+        self._time = now
+        self._temp = temp
+        self._outdoor = outdoor
+        self._accounted = now
+        self._heating_time = 0.0
+        self._cooling_time = 0.0
+
+    def predict(
+        self,
+        temp: float,
+        outdoor: float,
+        heating: bool,
+        cooling: bool,
+    ) -> float:
+        """Return the temperature after the horizon with the switches kept."""
+        drive = self.heating_rate * heating - self.cooling_rate * cooling
+        hours = self.horizon / timedelta(hours=1)
+        coupling = self.outdoor_coupling
+        if coupling * hours < 1e-6:
+            return temp + (drive + coupling * (outdoor - temp)) * hours
+        equilibrium = outdoor + drive / coupling
+        return equilibrium + (temp - equilibrium) * math.exp(-coupling * hours)
+
+    def _account(self, now: float) -> None:
+        if self._time is None:
+            return
+        elapsed = now - self._accounted
+        if self._heating:
+            self._heating_time += elapsed
+        if self._cooling:
+            self._cooling_time += elapsed
+        self._accounted = now
+
+    def _update(self, regressors: tuple[float, float, float], rate: float) -> None:
+        """Recursive least squares step with exponential forgetting.
+
+        The covariance is not inflated beyond its initial trace, so periods
+        without heating or cooling do not wind it up.
+        """
+        p = self._covariance
+        p_phi = [sum(p[3 * i + j] * regressors[j] for j in range(3)) for i in range(3)]
+        denominator = FORGETTING_FACTOR + sum(
+            regressors[i] * p_phi[i] for i in range(3)
+        )
+        error = rate - sum(self._theta[i] * regressors[i] for i in range(3))
+        gain = [value / denominator for value in p_phi]
+        for i in range(3):
+            self._theta[i] += gain[i] * error
+        forget = (
+            FORGETTING_FACTOR if p[0] + p[4] + p[8] < 3 * INITIAL_COVARIANCE else 1.0
+        )
+        for i in range(3):
+            for j in range(3):
+                p[3 * i + j] = (p[3 * i + j] - gain[i] * p_phi[j]) / forget
+        self.samples += 1
+        _LOGGER.debug(
+            "Thermal model rates %s after %s samples", list(self._theta), self.samples
+        )
+
+    def _reset_covariance(self, variance: float) -> None:
+        for i in range(9):
+            self._covariance[i] = variance if i % 4 == 0 else 0.0
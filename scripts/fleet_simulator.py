@@ -0,0 +1,452 @@
+"""Fleet Simulator for Dual Smart Thermostat.
+
+Replays recorded temperatures of many zones through the switching of the
+thermostat, to choose tolerances, minimum cycle durations and keep-alive
+intervals from historical data. It needs NumPy, which is not a requirement
+of the integration, so it lives with the development scripts and not in the
+integration package.
+
+The switching follows the control engine: the heat, cool and heat_cool
+passes with openings and floor limits, the minimum cycle duration blocking
+the passes triggered by the sensor, and keep-alive passes that are not
+blocked. The sensor is read once per step. Keep-alive runs in the always
+mode and first fires one interval after the first step, aux heaters are not
+simulated. The replay is open loop, the recorded temperatures do not react
+to the simulated switches.
+
+The thermostat is a state machine over the heater and cooler states, a pass
+only depends on the state and a few conditions of the step. The conditions
+are computed for all zones and steps at once and the passes are looked up
+in a table of all states and conditions, the replay then only loops over
+the switches.
+"""
+
+from dataclasses import dataclass
+
+from homeassistant.components.climate import HVACMode
+import numpy as np
+
+# bits of the state of a zone that are set while the device is on
+HEATER = 1
+COOLER = 2
+
+# shifts of the devices switched and turned on in a pass, in its transition
+SWITCHED = 2
+TURNED_ON = 4
+
+# bits of the conditions of a step
+TOO_COLD_LOW = 1
+TOO_COLD_HIGH = 2
+TOO_HOT_LOW = 4
+TOO_HOT_HIGH = 8
+OPENING = 16
+FLOOR_HOT = 32
+FLOOR_COLD = 64
+
+# number of temperatures of the traces that are evaluated at once
+CHUNK_SIZE = 1 << 22
+
+_Runs = tuple[np.ndarray, np.ndarray]
+
+
+@dataclass(frozen=True, slots=True)
+class FleetResult:
+    """Per zone totals of a replay, times in seconds.
+
+    Cycles count how often a device was turned on. In cool mode the cooling
+    device is reported as cooler, also in ac mode.
+    """
+
+    heater_cycles: np.ndarray
+    cooler_cycles: np.ndarray
+    heater_on_time: np.ndarray
+    cooler_on_time: np.ndarray
+    time_outside_band: np.ndarray
+
+
+def simulate(
+    temperature: np.ndarray,
+    *,
+    hvac_mode: HVACMode = HVACMode.HEAT,
+    step: float = 60.0,
+    target_temp: np.ndarray | float | None = None,
+    target_temp_low: np.ndarray | float | None = None,
+    target_temp_high: np.ndarray | float | None = None,
+    cold_tolerance: np.ndarray | float = 0.3,
+    hot_tolerance: np.ndarray | float = 0.3,
+    min_cycle_duration: np.ndarray | float = 0.0,
+    keep_alive: np.ndarray | float = 0.0,
+    openings: np.ndarray | None = None,
+    floor_temperature: np.ndarray | None = None,
+    min_floor_temp: np.ndarray | float | None = None,
+    max_floor_temp: np.ndarray | float | None = None,
+) -> FleetResult:
+    """Replay the temperatures, one row per zone of one sample per step.
+
+    Settings are given per zone or as one value for all zones, openings and
+    floor temperatures per zone and step or as one trace for all zones.
+    Durations are in seconds, a keep_alive of 0 disables keep-alive. The
+    traces must not have gaps, fill them before the replay.
+    """
+    temperature = np.atleast_2d(np.asarray(temperature, dtype=float))
+    zones, steps = temperature.shape
+
+    def per_zone(value) -> np.ndarray:
+        return np.broadcast_to(np.asarray(value, dtype=float), (zones,))
+
+    if hvac_mode == HVACMode.HEAT_COOL:
+        low, high = per_zone(target_temp_low), per_zone(target_temp_high)
+    else:
+        low = high = per_zone(target_temp)
+    cold_tolerance = per_zone(cold_tolerance)
+    hot_tolerance = per_zone(hot_tolerance)
+    if openings is not None:
+        openings = np.broadcast_to(np.asarray(openings, dtype=bool), (zones, steps))
+    if floor_temperature is not None:
+        floor_temperature = np.broadcast_to(
+            np.asarray(floor_temperature, dtype=float), (zones, steps)
+        )
+    max_floor = per_zone(np.nan if max_floor_temp is None else max_floor_temp)
+    min_floor = per_zone(np.nan if min_floor_temp is None else min_floor_temp)
+
+    conditions = np.empty((zones, steps), dtype=np.uint8)
+    outside = np.empty(zones, dtype=np.int64)
+    chunk_zones = max(1, CHUNK_SIZE // steps)
+    for first in range(0, zones, chunk_zones):
+        rows = slice(first, first + chunk_zones)
+        temp = temperature[rows]
+        settings = (
+            low[rows, None],
+            high[rows, None],
+            cold_tolerance[rows, None],
+            hot_tolerance[rows, None],
+        )
+        chunk_low, chunk_high, chunk_cold, chunk_hot = settings
+        # compared as by the control engine, to switch at the same steps
+        chunk = (chunk_low >= temp + chunk_cold) * np.uint8(TOO_COLD_LOW)
+        chunk |= (chunk_high >= temp + chunk_cold) * np.uint8(TOO_COLD_HIGH)
+        chunk |= (temp >= chunk_low + chunk_hot) * np.uint8(TOO_HOT_LOW)
+        chunk |= (temp >= chunk_high + chunk_hot) * np.uint8(TOO_HOT_HIGH)
+        if openings is not None:
+            chunk |= openings[rows] * np.uint8(OPENING)
+        if floor_temperature is not None:
+            floor = floor_temperature[rows]
+            chunk |= (floor >= max_floor[rows, None]) * np.uint8(FLOOR_HOT)
+            chunk |= (floor <= min_floor[rows, None]) * np.uint8(FLOOR_COLD)
+        conditions[rows] = chunk
+        outside[rows] = np.count_nonzero(
+            (temp < chunk_low - chunk_cold) | (temp > chunk_high + chunk_hot),
+            axis=1,
+        )
+
+    match hvac_mode:
+        case HVACMode.HEAT_COOL:
+            states = (0, HEATER, COOLER, HEATER | COOLER)
+        case HVACMode.COOL:
+            states = (0, COOLER)
+        case _:
+            states = (0, HEATER)
+    transitions = _transitions(hvac_mode, False)
+    keep_alive_transitions = _transitions(hvac_mode, True)
+    leave = _leave_runs(conditions, transitions, states)
+    # keep-alive passes mostly switch like the others, only heat_cool differs
+    if np.array_equal(transitions[list(states)], keep_alive_transitions[list(states)]):
+        leave_keep_alive = leave
+    else:
+        leave_keep_alive = _leave_runs(conditions, keep_alive_transitions, states)
+
+    cycles, on_steps = _replay(
+        conditions,
+        hvac_mode,
+        (transitions, keep_alive_transitions),
+        (leave, leave_keep_alive),
+        per_zone(min_cycle_duration) / step,
+        per_zone(keep_alive) / step,
+    )
+    return FleetResult(
+        heater_cycles=cycles[0],
+        cooler_cycles=cycles[1],
+        heater_on_time=on_steps[0] * step,
+        cooler_on_time=on_steps[1] * step,
+        time_outside_band=outside * step,
+    )
+
+
+def _transitions(hvac_mode: HVACMode, keep_alive: bool) -> np.ndarray:
+    """Return the transitions of a pass, indexed by state and conditions.
+
+    A transition holds the state after the pass and the devices it switched
+    and turned on, a keep-alive pass can turn a device off and on again.
+    """
+    before = np.broadcast_to(np.arange(4, dtype=np.uint8)[:, None], (4, 128))
+    transition = np.zeros((4, 128), dtype=np.uint8)
+    for after in _pass(hvac_mode, before, np.arange(128, dtype=np.uint8), keep_alive):
+        transition |= ((after ^ before) << SWITCHED) | ((after & ~before) << TURNED_ON)
+        before = after
+    return transition | before
+
+
+def _pass(
+    hvac_mode: HVACMode, state: np.ndarray, conditions: np.ndarray, keep_alive: bool
+) -> tuple[np.ndarray, ...]:
+    """Return the states a control pass switches the devices through."""
+    heater = (state & HEATER) != 0
+    cooler = (state & COOLER) != 0
+    opening = (conditions & OPENING) != 0
+    floor_hot = (conditions & FLOOR_HOT) != 0
+    floor_cold = (conditions & FLOOR_COLD) != 0
+
+    if hvac_mode == HVACMode.HEAT_COOL:
+        # a running heater or cooler is compared to its own end of the range
+        cooling = cooler & ~heater
+        too_cold = (conditions & np.where(cooling, TOO_COLD_HIGH, TOO_COLD_LOW)) != 0
+        too_hot = (conditions & np.where(heater, TOO_HOT_LOW, TOO_HOT_HIGH)) != 0
+        toggled_heater, toggled_cooler = _toggle(
+            heater, cooler, heater, cooling, too_cold, too_hot, opening
+        )
+        new_heater = np.select(
+            [opening, floor_hot, floor_cold], [False, False, True], toggled_heater
+        )
+        new_cooler = np.where(
+            opening, False, np.where(floor_hot | floor_cold, cooler, toggled_cooler)
+        )
+        states = (new_heater * np.uint8(HEATER) | new_cooler * np.uint8(COOLER),)
+        if keep_alive:
+            # keep-alive toggles the devices once more after the pass
+            new_heater, new_cooler = _toggle(
+                new_heater, new_cooler, heater, cooling, too_cold, too_hot, opening
+            )
+            states += (new_heater * np.uint8(HEATER) | new_cooler * np.uint8(COOLER),)
+        return states
+
+    too_cold = (conditions & TOO_COLD_LOW) != 0
+    too_hot = (conditions & TOO_HOT_HIGH) != 0
+    if hvac_mode == HVACMode.COOL:
+        new_cooler = np.where(cooler, ~(too_cold | opening), too_hot & ~opening)
+        return (new_cooler * np.uint8(COOLER),)
+
+    new_heater = np.where(
+        heater,
+        ~((too_hot | floor_hot | opening) & ~floor_cold),
+        (too_cold & ~opening & ~floor_hot) | floor_cold,
+    )
+    return (new_heater * np.uint8(HEATER),)
+
+
+def _toggle(
+    heater: np.ndarray,
+    cooler: np.ndarray,
+    heating: np.ndarray,
+    cooling: np.ndarray,
+    too_cold: np.ndarray,
+    too_hot: np.ndarray,
+    opening: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Toggle the heater and cooler as decided on the states before the pass."""
+    auto = ~heating & ~cooling
+    new_heater = np.select(
+        [heating & too_cold, heating & too_hot, auto & too_cold, auto],
+        [True, False, heater | ~opening, False],
+        heater,
+    )
+    new_cooler = np.select(
+        [cooling & too_cold, cooling & too_hot, auto & too_cold, auto & too_hot, auto],
+        [False, True, False, cooler | ~opening, False],
+        cooler,
+    )
+    return new_heater, new_cooler
+
+
+def _leave_runs(
+    conditions: np.ndarray, transitions: np.ndarray, states: tuple[int, ...]
+) -> dict[int, _Runs]:
+    """Return the runs of steps at which a pass switches from each state.
+
+    The runs are given by their first and one past their last step, as
+    positions zone * steps + step in the flattened traces, in order.
+    """
+    zones, steps = conditions.shape
+    chunk_zones = max(1, CHUNK_SIZE // steps)
+    parts: dict[int, list[np.ndarray]] = {state: [] for state in states}
+    for first in range(0, zones, chunk_zones):
+        chunk = conditions[first : first + chunk_zones]
+        padded = np.zeros((chunk.shape[0], steps + 2), dtype=np.int8)
+        for state in states:
+            switches = transitions[state] != state
+            padded[:, 1:-1] = switches[chunk]
+            edges = np.diff(padded, axis=1).ravel()
+            for edge in (1, -1):
+                # the rows of the edges are one step longer than the traces
+                index = np.flatnonzero(edges == edge)
+                parts[state].append(
+                    (index // (steps + 1) + first) * steps + index % (steps + 1)
+                )
+    return {
+        state: (np.concatenate(runs[::2]), np.concatenate(runs[1::2]))
+        for state, runs in parts.items()
+    }
+
+
+def _first_in_runs(
+    runs: _Runs, zone: np.ndarray, start: np.ndarray, steps: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the first step from start in a run and the end of that run.
+
+    Zones without such a run get steps for both.
+    """
+    starts, ends = runs
+    if not len(ends):
+        return np.full(len(zone), steps), np.full(len(zone), steps)
+    position = zone * steps + start
+    index = np.minimum(np.searchsorted(ends, position, side="right"), len(ends) - 1)
+    first = np.maximum(starts[index], position) - zone * steps
+    found = (ends[index] > position) & (first < steps)
+    return (
+        np.where(found, first, steps),
+        np.where(found, ends[index] - zone * steps, steps),
+    )
+
+
+def _first_tick_in_runs(
+    runs: _Runs,
+    zone: np.ndarray,
+    start: np.ndarray,
+    stop: np.ndarray,
+    keep_alive: np.ndarray,
+    steps: int,
+) -> np.ndarray:
+    """Return the first keep-alive step from start before stop in a run.
+
+    Zones without such a step get steps.
+    """
+    result = np.full(len(zone), steps)
+    stop = np.minimum(stop, steps)
+    pending = np.flatnonzero((keep_alive > 0) & (start < stop))
+    start = start[pending]
+    while len(pending):
+        first, end = _first_in_runs(runs, zone[pending], start, steps)
+        tick = _first_tick(first, keep_alive[pending])
+        found = (tick < end) & (tick < stop[pending])
+        result[pending[found]] = tick[found]
+        # look in the next run if keep-alive fires after this one
+        searching = ~found & (end < stop[pending])
+        pending = pending[searching]
+        start = end[searching]
+    return result
+
+
+def _first_tick(start: np.ndarray, keep_alive: np.ndarray) -> np.ndarray:
+    """Return the first step from start at which keep-alive fires.
+
+    Keep-alive fires at multiples of its interval, in the step in which they
+    fall, after the pass of the sensor.
+    """
+    return np.floor(_next_multiple(start, keep_alive) * keep_alive).astype(np.int64)
+
+
+def _is_tick(step: np.ndarray, keep_alive: np.ndarray) -> np.ndarray:
+    """If keep-alive fires at step."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (keep_alive > 0) & (
+            _next_multiple(step, keep_alive) * keep_alive < step + 1
+        )
+
+
+def _next_multiple(step: np.ndarray, keep_alive: np.ndarray) -> np.ndarray:
+    """Return the first multiple of the interval from step, after the start."""
+    return np.maximum(np.ceil(step / keep_alive), 1)
+
+
+def _replay(
+    conditions: np.ndarray,
+    hvac_mode: HVACMode,
+    transitions: tuple[np.ndarray, np.ndarray],
+    leave: tuple[dict[int, _Runs], dict[int, _Runs]],
+    min_cycle: np.ndarray,
+    keep_alive: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Replay the switches of all zones.
+
+    Returns the number of times the heater and cooler were turned on and the
+    number of steps they were on. Each round moves every zone to its next
+    switch: the first step at which the pass triggered by the sensor switches
+    a device once the minimum cycle duration passed, or at which keep-alive
+    switches one.
+    """
+    zones, steps = conditions.shape
+    sensor_transitions, keep_alive_transitions = transitions
+    sensor_leave, keep_alive_leave = leave
+    state = np.zeros(zones, dtype=np.uint8)
+    # steps of the last switch of the heater and cooler
+    since = np.full((2, zones), -np.inf)
+    cycles = np.zeros((2, zones), dtype=np.int64)
+    on_steps = np.zeros((2, zones), dtype=np.int64)
+    last_switch = np.zeros(zones, dtype=np.int64)
+    start = np.zeros(zones, dtype=np.int64)
+    zone = np.arange(zones)
+    bits = np.array([[HEATER], [COOLER]], dtype=np.uint8)
+    blocking = min_cycle > 0
+
+    while len(zone):
+        current = state[zone]
+        match hvac_mode:
+            case HVACMode.HEAT_COOL:
+                switched = since[:, zone].min(axis=0)
+            case HVACMode.COOL:
+                switched = since[1, zone]
+            case _:
+                switched = since[0, zone]
+        # sensor passes are blocked until the minimum cycle duration passed,
+        # inclusive as in ActuatorMirror.is_state_for
+        allowed = start[zone]
+        blocked = np.flatnonzero(blocking[zone] & (switched > -np.inf))
+        allowed[blocked] = np.maximum(
+            allowed[blocked],
+            np.ceil(switched[blocked] + min_cycle[zone[blocked]]),
+        )
+        # keep-alive passes that switch like the sensor passes only matter
+        # while those are blocked
+        tick_stop = (
+            allowed if keep_alive_leave is sensor_leave else np.full(len(zone), steps)
+        )
+
+        switch_step = np.full(len(zone), steps)
+        for leaving_state, runs in sensor_leave.items():
+            selected = np.flatnonzero(current == leaving_state)
+            if not len(selected):
+                continue
+            switch_step[selected] = np.minimum(
+                _first_in_runs(runs, zone[selected], allowed[selected], steps)[0],
+                _first_tick_in_runs(
+                    keep_alive_leave[leaving_state],
+                    zone[selected],
+                    start[zone[selected]],
+                    tick_stop[selected],
+                    keep_alive[zone[selected]],
+                    steps,
+                ),
+            )
+
+        on_steps[:, zone] += (switch_step - last_switch[zone]) * ((current & bits) != 0)
+        switching = switch_step < steps
+        zone = zone[switching]
+        switch_step = switch_step[switching]
+        current = current[switching]
+        step_conditions = conditions[zone, switch_step]
+
+        after = current
+        for table, running in (
+            (sensor_transitions, switch_step >= allowed[switching]),
+            (keep_alive_transitions, _is_tick(switch_step, keep_alive[zone])),
+        ):
+            transition = np.where(running, table[after, step_conditions], after)
+            cycles[:, zone] += ((transition >> TURNED_ON) & bits) != 0
+            changed = ((transition >> SWITCHED) & bits) != 0
+            since[:, zone] = np.where(changed, switch_step, since[:, zone])
+            after = transition & (HEATER | COOLER)
+
+        state[zone] = after
+        last_switch[zone] = switch_step
+        start[zone] = switch_step + 1
+
+    return cycles, on_steps
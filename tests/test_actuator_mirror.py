@@ -0,0 +1,93 @@
+"""The tests for the dual_smart_thermostat actuator mirror."""
+
+import datetime
+from unittest.mock import patch
+
+from homeassistant.const import STATE_OFF, STATE_ON, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant, State
+import homeassistant.util.dt as dt_util
+
+from custom_components.dual_smart_thermostat.actuator_mirror import ActuatorMirror
+
+
+async def test_seed(hass: HomeAssistant) -> None:
+    """Test the mirror copies the states from the state machine."""
+    hass.states.async_set("switch.heater", STATE_ON)
+    hass.states.async_set("switch.cooler", STATE_OFF)
+    mirror = ActuatorMirror(["switch.heater", None, "switch.cooler"])
+
+    mirror.seed(hass)
+
+    assert mirror.entity_ids == ["switch.heater", "switch.cooler"]
+    assert mirror.is_on("switch.heater")
+    assert not mirror.is_on("switch.cooler")
+    assert not mirror.is_on(None)
+
+
+def test_update() -> None:
+    """Test state updates are mirrored."""
+    mirror = ActuatorMirror(["switch.heater"])
+
+    assert not mirror.is_on("switch.heater")
+
+    mirror.update("switch.heater", State("switch.heater", STATE_ON))
+    assert mirror.is_on("switch.heater")
+
+    mirror.update("switch.heater", None)
+    assert not mirror.is_on("switch.heater")
+
+
+def test_is_state_for() -> None:
+    """Test the duration a switch has been in a state."""
+    mirror = ActuatorMirror(["switch.heater"])
+    duration = datetime.timedelta(minutes=10)
+
+    assert not mirror.is_state_for("switch.heater", STATE_ON, duration)
+
+    state = State("switch.heater", STATE_ON)
+    mirror.update("switch.heater", state)
+    now = dt_util.utcnow()
+
+    assert mirror.is_state_for("switch.heater", STATE_ON, None)
+    assert not mirror.is_state_for("switch.heater", STATE_OFF, None)
+
+    # the duration is inclusive, a recheck at the boundary is not blocked
+    with patch(
+        "homeassistant.util.dt.utcnow",
+        return_value=state.last_changed + duration,
+    ):
+        assert mirror.is_state_for("switch.heater", STATE_ON, duration)
+        assert mirror.seconds_until("switch.heater", duration) is None
+
+    with patch(
+        "homeassistant.util.dt.utcnow",
+        return_value=now + datetime.timedelta(minutes=5),
+    ):
+        assert not mirror.is_state_for("switch.heater", STATE_ON, duration)
+
+    with patch(
+        "homeassistant.util.dt.utcnow",
+        return_value=now + datetime.timedelta(minutes=11),
+    ):
+        assert mirror.is_state_for("switch.heater", STATE_ON, duration)
+
+
+def test_is_switched_for() -> None:
+    """Test the duration a switch has been on or off."""
+    mirror = ActuatorMirror(["switch.heater"])
+    duration = datetime.timedelta(minutes=10)
+
+    mirror.update("switch.heater", State("switch.heater", STATE_OFF))
+    later = dt_util.utcnow() + datetime.timedelta(minutes=11)
+
+    with patch("homeassistant.util.dt.utcnow", return_value=later):
+        assert mirror.is_switched_for("switch.heater", duration)
+        assert mirror.seconds_until("switch.heater", duration) is None
+
+    assert not mirror.is_switched_for("switch.heater", duration)
+    assert 0 < mirror.seconds_until("switch.heater", duration) <= 600
+
+    # a switch that is neither on nor off never ran long enough
+    mirror.update("switch.heater", State("switch.heater", STATE_UNAVAILABLE))
+    with patch("homeassistant.util.dt.utcnow", return_value=later):
+        assert not mirror.is_switched_for("switch.heater", duration)
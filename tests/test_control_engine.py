@@ -0,0 +1,244 @@
+"""The tests for the dual_smart_thermostat control engine."""
+
+import dataclasses
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.const import STATE_OFF, STATE_ON
+
+from custom_components.dual_smart_thermostat.const import KeepAliveMode, ToleranceDevice
+from custom_components.dual_smart_thermostat.control_engine import (
+    Action,
+    ActuatorState,
+    ControlSnapshot,
+    Device,
+    Intent,
+    plan_control,
+    plan_cooling,
+    plan_heat_cool,
+    plan_heating,
+    plan_pwm,
+)
+
+NOW = 1_000_000.0
+ON = ActuatorState(STATE_ON, NOW - 60, NOW - 60)
+OFF = ActuatorState(STATE_OFF, NOW - 60, NOW - 60)
+
+
+def snapshot(**changes) -> ControlSnapshot:
+    """Return a heating snapshot at the target temperature."""
+    return dataclasses.replace(
+        ControlSnapshot(
+            hvac_mode=HVACMode.HEAT,
+            now=NOW,
+            cur_temp=20,
+            target_temp=20,
+            target_temp_low=18,
+            target_temp_high=24,
+            cold_tolerance=0.3,
+            hot_tolerance=0.3,
+            heater=OFF,
+        ),
+        **changes,
+    )
+
+
+def test_heating() -> None:
+    """Test the heater follows the temperature."""
+    assert plan_heating(snapshot()).intents == ()
+
+    plan = plan_heating(snapshot(cur_temp=18))
+    assert plan.intents == (Intent(Action.TURN_ON, Device.HEATER),)
+    assert plan.decision == "heater_on"
+    assert plan.device == Device.HEATER
+
+    plan = plan_heating(snapshot(cur_temp=22, heater=ON))
+    assert plan.intents == (Intent(Action.TURN_OFF, Device.HEATER),)
+    assert plan.decision == "heater_off"
+
+
+def test_heating_turns_cooler_off() -> None:
+    """Test a heating pass turns a running cooler off."""
+    plan = plan_heating(snapshot(cur_temp=18, cooler=ON))
+
+    assert plan.intents == (
+        Intent(Action.TURN_OFF, Device.COOLER),
+        Intent(Action.TURN_ON, Device.HEATER),
+    )
+
+
+def test_heating_opening_and_floor() -> None:
+    """Test openings and a hot floor keep the heater off."""
+    assert plan_heating(snapshot(cur_temp=18, opening_open=True)).intents == ()
+    assert (
+        plan_heating(snapshot(cur_temp=18, floor_temp=30, max_floor_temp=28)).intents
+        == ()
+    )
+
+    plan = plan_heating(snapshot(cur_temp=22, floor_temp=4, min_floor_temp=5))
+    assert plan.intents == (Intent(Action.TURN_ON, Device.HEATER),)
+
+    plan = plan_heating(snapshot(heater=ON, opening_open=True))
+    assert plan.intents == (Intent(Action.TURN_OFF, Device.HEATER),)
+
+
+def test_heating_aux_heater() -> None:
+    """Test the aux heater takes over once the heater timed out."""
+    aux = snapshot(aux_heater=OFF, aux_heater_timeout=300)
+
+    plan = plan_heating(dataclasses.replace(aux, cur_temp=18))
+    assert plan.intents == (Intent(Action.TURN_ON, Device.HEATER),)
+    assert plan.aux_recheck
+
+    assert plan_heating(dataclasses.replace(aux, heater=ON)).intents == ()
+
+    timed_out = ActuatorState(STATE_ON, NOW - 301, NOW - 301)
+    plan = plan_heating(dataclasses.replace(aux, heater=timed_out))
+    assert plan.intents == (
+        Intent(Action.TURN_OFF, Device.HEATER),
+        Intent(Action.TURN_ON, Device.AUX_HEATER),
+    )
+    assert plan.decision == "aux_heater_on"
+
+    plan = plan_heating(
+        dataclasses.replace(aux, cur_temp=18, aux_heater_ran_today=True)
+    )
+    assert plan.intents == (Intent(Action.TURN_ON, Device.AUX_HEATER),)
+    assert not plan.aux_recheck
+
+
+def test_keep_alive() -> None:
+    """Test keep-alive resends the state of the switches."""
+    always = {"keep_alive": True, "keep_alive_mode": KeepAliveMode.ALWAYS}
+    plan = plan_heating(snapshot(heater=ON, **always))
+    assert plan.intents == (Intent(Action.TURN_ON, Device.HEATER),)
+
+    plan = plan_heating(snapshot(**always))
+    assert plan.intents == (Intent(Action.TURN_OFF, Device.HEATER),)
+
+    on_staleness = snapshot(keep_alive=True, keep_alive_mode=KeepAliveMode.ON_STALENESS)
+    plan = plan_heating(dataclasses.replace(on_staleness, keep_alive_staleness=120))
+    assert plan.intents == ()
+    plan = plan_heating(dataclasses.replace(on_staleness, keep_alive_staleness=30))
+    assert plan.intents == (Intent(Action.TURN_OFF, Device.HEATER),)
+    # a resend counts as a report, as the switch does not confirm it
+    resent = dataclasses.replace(OFF, resent=NOW - 10)
+    plan = plan_heating(
+        dataclasses.replace(on_staleness, keep_alive_staleness=30, heater=resent)
+    )
+    assert plan.intents == ()
+
+    on_divergence = snapshot(
+        keep_alive=True, keep_alive_mode=KeepAliveMode.ON_DIVERGENCE
+    )
+    assert plan_heating(on_divergence).intents == ()
+
+
+def test_cooling() -> None:
+    """Test the cooler, or the heater in ac mode, follows the temperature."""
+    cooling = snapshot(hvac_mode=HVACMode.COOL, cooler=OFF)
+
+    plan = plan_cooling(dataclasses.replace(cooling, cur_temp=22))
+    assert plan.intents == (Intent(Action.TURN_ON, Device.COOLER),)
+    assert plan.decision == "cooler_on"
+
+    plan = plan_cooling(dataclasses.replace(cooling, cooler=ON, opening_open=True))
+    assert plan.intents == (Intent(Action.TURN_OFF, Device.COOLER),)
+    assert plan.details == {"opening": True}
+
+    plan = plan_control(snapshot(hvac_mode=HVACMode.COOL, ac_mode=True, cur_temp=22))
+    assert plan.intents == (Intent(Action.TURN_ON, Device.HEATER),)
+
+
+def test_heat_cool() -> None:
+    """Test the heater and cooler follow the target range."""
+    heat_cool = snapshot(hvac_mode=HVACMode.HEAT_COOL, cooler=OFF)
+
+    plan = plan_control(heat_cool)
+    assert plan.intents == ()
+    assert plan.decision == "heater_off"
+    assert plan.details == {"device": ToleranceDevice.AUTO, "opening": False}
+
+    plan = plan_control(dataclasses.replace(heat_cool, cur_temp=17))
+    assert plan.intents == (Intent(Action.TURN_ON, Device.HEATER),)
+    assert (plan.decision, plan.device) == ("heater_on", Device.HEATER)
+
+    plan = plan_control(dataclasses.replace(heat_cool, cur_temp=25, heater=ON))
+    assert plan.intents == (Intent(Action.TURN_OFF, Device.HEATER),)
+    assert plan.decision == "heater_off"
+    assert plan.details["device"] == ToleranceDevice.HEATER
+
+    plan = plan_heat_cool(dataclasses.replace(heat_cool, cur_temp=25))
+    assert plan.intents == (Intent(Action.TURN_ON, Device.COOLER),)
+    assert (plan.decision, plan.device) == ("cooler_on", Device.COOLER)
+
+    plan = plan_heat_cool(
+        dataclasses.replace(heat_cool, cur_temp=25, cooler=ON, opening_open=True)
+    )
+    assert plan.intents == (Intent(Action.TURN_OFF, Device.COOLER),)
+    assert plan.decision == "cooler_off"
+    assert plan.details == {"device": ToleranceDevice.COOLER, "opening": True}
+
+    # the floor limits override the range
+    plan = plan_heat_cool(
+        dataclasses.replace(heat_cool, cur_temp=17, floor_temp=30, max_floor_temp=28)
+    )
+    assert plan.intents == ()
+    assert plan.decision == "heater_off"
+    plan = plan_heat_cool(
+        dataclasses.replace(heat_cool, cur_temp=22, floor_temp=4, min_floor_temp=5)
+    )
+    assert plan.intents == (Intent(Action.TURN_ON, Device.HEATER),)
+    assert plan.decision == "heater_on"
+
+
+def test_heat_cool_keep_alive() -> None:
+    """Test keep-alive toggles the devices once more."""
+    plan = plan_heat_cool(
+        snapshot(
+            hvac_mode=HVACMode.HEAT_COOL,
+            cooler=ON,
+            cur_temp=25,
+            keep_alive=True,
+            keep_alive_mode=KeepAliveMode.ALWAYS,
+        )
+    )
+
+    assert plan.intents == (Intent(Action.TURN_ON, Device.COOLER),)
+    assert plan.decision == "cooler_on"
+    assert plan.details == {"device": ToleranceDevice.COOLER, "opening": False}
+
+
+def test_pwm() -> None:
+    """Test time-proportional control switches the device of the phase."""
+    plan = plan_pwm(snapshot(cooler=ON), Device.HEATER, True)
+    assert plan.intents == (
+        Intent(Action.TURN_OFF, Device.COOLER),
+        Intent(Action.TURN_ON, Device.HEATER),
+    )
+    assert plan.decision == "heater_on"
+
+    assert plan_pwm(snapshot(heater=ON), Device.HEATER, True).intents == ()
+    plan = plan_pwm(snapshot(heater=ON), Device.HEATER, False)
+    assert plan.intents == (Intent(Action.TURN_OFF, Device.HEATER),)
+
+    # openings and the floor limits override the phase
+    plan = plan_pwm(snapshot(heater=ON, opening_open=True), Device.HEATER, True)
+    assert plan.intents == (Intent(Action.TURN_OFF, Device.HEATER),)
+    plan = plan_pwm(snapshot(floor_temp=4, min_floor_temp=5), Device.HEATER, False)
+    assert plan.intents == (Intent(Action.TURN_ON, Device.HEATER),)
+
+    cooling = snapshot(hvac_mode=HVACMode.COOL, cooler=OFF)
+    plan = plan_pwm(cooling, Device.COOLER, True)
+    assert plan.intents == (Intent(Action.TURN_ON, Device.COOLER),)
+    assert plan.decision == "cooler_on"
+
+    # the aux heater takes the heater along in dual mode
+    aux = {"heater": ON, "aux_heater": OFF, "aux_heater_timeout": 600}
+    plan = plan_pwm(snapshot(**aux), Device.AUX_HEATER, True)
+    assert plan.intents == (
+        Intent(Action.TURN_OFF, Device.HEATER),
+        Intent(Action.TURN_ON, Device.AUX_HEATER),
+    )
+    assert plan.decision == "aux_heater_on"
+    plan = plan_pwm(snapshot(aux_heater_dual_mode=True, **aux), Device.AUX_HEATER, True)
+    assert plan.intents == (Intent(Action.TURN_ON, Device.AUX_HEATER),)
@@ -0,0 +1,83 @@
+"""The tests for the dual_smart_thermostat control scheduler."""
+
+import asyncio
+
+import pytest
+
+from custom_components.dual_smart_thermostat.control_scheduler import ControlScheduler
+
+
+async def test_requests_merged_while_running() -> None:
+    """Test requests during a pass are merged into a single rerun."""
+    scheduler = ControlScheduler()
+    runs = []
+
+    async def heating(time, force) -> None:
+        runs.append(("heating", time, force))
+        await asyncio.sleep(0.01)
+
+    async def cooling(time, force) -> None:
+        runs.append(("cooling", time, force))
+        await asyncio.sleep(0.01)
+
+    first = asyncio.create_task(scheduler.async_run(heating))
+    await asyncio.sleep(0)
+    assert scheduler.is_running
+
+    requests = [
+        asyncio.create_task(scheduler.async_run(heating, force=(i == 3)))
+        for i in range(10)
+    ]
+    requests.append(asyncio.create_task(scheduler.async_run(cooling, time="now")))
+    await asyncio.gather(first, *requests)
+
+    # the latest pass wins and carries the force flag of the merged requests
+    assert runs == [("heating", None, False), ("cooling", "now", True)]
+    assert not scheduler.is_running
+
+
+async def test_failed_pass_releases_scheduler() -> None:
+    """Test a failing pass does not block later passes."""
+    scheduler = ControlScheduler()
+    runs = []
+
+    async def failing(time, force) -> None:
+        raise ValueError
+
+    async def heating(time, force) -> None:
+        runs.append(force)
+
+    with pytest.raises(ValueError):
+        await scheduler.async_run(failing, force=True)
+
+    await scheduler.async_run(heating)
+
+    assert runs == [False]
+
+
+async def test_failed_pass_fails_merged_requests() -> None:
+    """Test requests merged into a failing pass fail and leave nothing behind."""
+    scheduler = ControlScheduler()
+    runs = []
+
+    async def failing(time, force) -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError
+
+    async def heating(time, force) -> None:
+        runs.append((time, force))
+
+    first = asyncio.create_task(scheduler.async_run(failing))
+    await asyncio.sleep(0)
+    merged = asyncio.create_task(scheduler.async_run(heating, "now", force=True))
+
+    with pytest.raises(ValueError):
+        await first
+    with pytest.raises(ValueError):
+        await merged
+    assert runs == []
+    assert not scheduler.is_running
+
+    # the next pass runs once, without the time and force of the merged request
+    await scheduler.async_run(heating)
+    assert runs == [(None, False)]
@@ -0,0 +1,36 @@
+"""The tests for the dual_smart_thermostat control statistics."""
+
+from custom_components.dual_smart_thermostat.control_stats import (
+    ControlStats,
+    LatencyHistogram,
+)
+
+
+def test_latency_histogram() -> None:
+    """Test latencies are counted in fixed buckets."""
+    histogram = LatencyHistogram()
+    assert histogram.mean is None
+
+    for seconds in (0.0005, 0.001, 0.02, 10):
+        histogram.add(seconds)
+
+    data = histogram.as_dict()
+    assert data["count"] == 4
+    assert data["max"] == 10
+    assert data["buckets"]["le_0.001"] == 2
+    assert data["buckets"]["le_0.05"] == 1
+    assert data["buckets"]["inf"] == 1
+    assert sum(data["buckets"].values()) == 4
+
+
+def test_actuations_per_device() -> None:
+    """Test service calls are counted per device."""
+    stats = ControlStats()
+
+    stats.add_actuation("switch.heater", 0.01)
+    stats.add_actuation("switch.heater", 0.02)
+    stats.add_actuation("switch.cooler", 0.01)
+
+    data = stats.as_dict()
+    assert data["actuations"] == {"switch.heater": 2, "switch.cooler": 1}
+    assert data["service_call_latency"]["count"] == 3
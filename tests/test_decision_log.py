@@ -0,0 +1,48 @@
+"""The tests for the dual_smart_thermostat decision log."""
+
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.dual_smart_thermostat.decision_log import (
+    SAMPLE_INTERVAL,
+    DecisionLog,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+def test_unchanged_decisions_suppressed(caplog: pytest.LogCaptureFixture) -> None:
+    """Test repeated decisions are suppressed and sampled."""
+    decision_log = DecisionLog(LOGGER)
+    caplog.set_level(logging.INFO, logger=__name__)
+
+    with patch("time.monotonic", return_value=1000.0):
+        for temp in (18, 18.5, 19):
+            decision_log.record("climate.test", "heater_on", "switch.test", temp=temp)
+    assert [record.getMessage() for record in caplog.records] == [
+        "climate.test: heater_on switch.test temp=18 (0 suppressed)"
+    ]
+
+    caplog.clear()
+    with patch("time.monotonic", return_value=1000.0 + SAMPLE_INTERVAL):
+        decision_log.record("climate.test", "heater_on", "switch.test", temp=19.5)
+        decision_log.record("climate.test", "heater_off", "switch.test", temp=22)
+    assert [record.getMessage() for record in caplog.records] == [
+        "climate.test: heater_on switch.test temp=19.5 (2 suppressed)",
+        "climate.test: heater_off switch.test temp=22 (0 suppressed)",
+    ]
+
+
+def test_disabled_logger_skips_records(caplog: pytest.LogCaptureFixture) -> None:
+    """Test nothing is formatted or counted without INFO logging."""
+    decision_log = DecisionLog(LOGGER)
+    caplog.set_level(logging.WARNING, logger=__name__)
+
+    decision_log.record("climate.test", "heater_on", "switch.test", temp=18)
+
+    assert not caplog.records
+    caplog.set_level(logging.INFO, logger=__name__)
+    decision_log.record("climate.test", "heater_on", "switch.test", temp=18)
+    assert len(caplog.records) == 1
@@ -18,7 +18,7 @@ from homeassistant.components.climate import (
 from homeassistant.components.climate.const import DOMAIN as CLIMATE
 from homeassistant.const import ENTITY_MATCH_ALL, STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ServiceValidationError
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import entity_registry as er
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt
@@ -451,6 +451,56 @@ async def test_hvac_mode_mode_heat_cool(
     assert hass.states.get(heater_switch).state == STATE_OFF
 
 
+async def test_hvac_mode_heat_cool_decision_log(
+    hass: HomeAssistant, setup_comp_1, caplog: pytest.LogCaptureFixture  # noqa: F811
+):
+    """Test the control decisions in heat/cool mode are logged."""
+    heater_switch = "input_boolean.heater"
+    cooler_switch = "input_boolean.cooler"
+    assert await async_setup_component(
+        hass,
+        input_boolean.DOMAIN,
+        {"input_boolean": {"heater": None, "cooler": None}},
+    )
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "cooler": cooler_switch,
+                "heater": heater_switch,
+                "heat_cool_mode": True,
+                "target_sensor": common.ENT_SENSOR,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    await common.async_set_hvac_mode(hass, HVACMode.HEAT_COOL)
+    await common.async_set_temperature(hass, 18, ENTITY_MATCH_ALL, 25, 22)
+    await hass.async_block_till_done()
+
+    caplog.set_level(
+        logging.INFO, logger="custom_components.dual_smart_thermostat.climate"
+    )
+    for temp in (26, 24, 18):
+        setup_sensor(hass, temp)
+        await hass.async_block_till_done()
+
+    decisions = [
+        record.getMessage().split()
+        for record in caplog.records
+        if record.getMessage().startswith(f"{common.ENTITY}: ")
+    ]
+    assert [(fields[1], fields[2]) for fields in decisions] == [
+        ("cooler_on", cooler_switch),
+        ("cooler_off", cooler_switch),
+        ("heater_on", heater_switch),
+    ]
+    assert ["device=auto" in fields for fields in decisions] == [True, False, True]
+
+
 async def test_hvac_mode_heat_cool_floor_temp(
     hass: HomeAssistant, setup_comp_1  # noqa: F811
 ):
@@ -608,6 +658,50 @@ async def test_hvac_mode_cool(hass: HomeAssistant, setup_comp_1):  # noqa: F811
     assert hass.states.get(cooler_switch).state == STATE_OFF
 
 
+async def test_hvac_mode_off_isolates_device_errors(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+):
+    """Test a device failing to switch off does not keep the others on."""
+    heater_switch = "input_boolean.heater"
+    cooler_switch = "input_boolean.cooler"
+    assert await async_setup_component(
+        hass,
+        input_boolean.DOMAIN,
+        {"input_boolean": {"heater": None, "cooler": None}},
+    )
+
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": heater_switch,
+                "cooler": cooler_switch,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    setup_sensor(hass, 18)
+    await common.async_set_temperature(hass, 23)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+    with patch(
+        "custom_components.dual_smart_thermostat.climate.DualSmartThermostat._async_cooler_turn_off",
+        side_effect=HomeAssistantError("bridge offline"),
+    ):
+        await common.async_set_hvac_mode(hass, HVACMode.OFF)
+        await hass.async_block_till_done()
+
+    assert hass.states.get(heater_switch).state == STATE_OFF
+    assert hass.states.get(common.ENTITY).state == HVACMode.OFF
+
+
 @pytest.mark.parametrize(
     ["duration", "result_state"],
     [
@@ -0,0 +1,198 @@
+"""The tests for the dual_smart_thermostat fleet simulator."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import State
+import homeassistant.util.dt as dt_util
+import pytest
+
+from custom_components.dual_smart_thermostat.actuator_mirror import ActuatorMirror
+from custom_components.dual_smart_thermostat.const import KeepAliveMode
+from custom_components.dual_smart_thermostat.control_engine import (
+    Action,
+    ControlSnapshot,
+    Device,
+    plan_control,
+)
+
+np = pytest.importorskip("numpy")
+fleet_simulator = pytest.importorskip("scripts.fleet_simulator")
+
+STEP = 60
+STEPS = 1500
+ZONES = 6
+
+
+def replay(temperature, *, hvac_mode, min_cycle_duration, keep_alive, **traces):
+    """Replay one zone step by step through the control engine.
+
+    The switches are mirrored as by the thermostat, which also decides if the
+    minimum cycle duration blocks a pass.
+    """
+    entity_ids = {Device.HEATER: "switch.heater"}
+    if hvac_mode != HVACMode.HEAT:
+        entity_ids[Device.COOLER] = "switch.cooler"
+    mirror = ActuatorMirror(list(entity_ids.values()))
+    start = dt_util.utcnow()
+    for entity_id in entity_ids.values():
+        # switched long enough ago not to block the first pass
+        mirror.update(
+            entity_id,
+            State(entity_id, STATE_OFF, last_changed=start - timedelta(days=1)),
+        )
+    cycles = {device: 0 for device in entity_ids}
+    on_steps = {device: 0 for device in entity_ids}
+    gated = {
+        HVACMode.HEAT: [Device.HEATER],
+        HVACMode.COOL: [Device.COOLER],
+        HVACMode.HEAT_COOL: [Device.HEATER, Device.COOLER],
+    }[hvac_mode]
+    duration = timedelta(seconds=min_cycle_duration) if min_cycle_duration else None
+    clock = start
+
+    with patch("homeassistant.util.dt.utcnow", side_effect=lambda: clock):
+        for index, temp in enumerate(temperature):
+            now = index * STEP
+            clock = start + timedelta(seconds=now)
+            # keep-alive fires in the step in which its interval elapses
+            tick = (
+                keep_alive and max(-(-now // keep_alive), 1) * keep_alive < now + STEP
+            )
+            allowed = duration is None or any(
+                mirror.is_switched_for(entity_ids[device], duration) for device in gated
+            )
+            for keep_alive_pass in (False, True):
+                if not (tick if keep_alive_pass else allowed):
+                    continue
+                snapshot = ControlSnapshot(
+                    hvac_mode=hvac_mode,
+                    now=clock.timestamp(),
+                    cur_temp=temp,
+                    target_temp=traces.get("target_temp"),
+                    target_temp_low=traces.get("target_temp_low"),
+                    target_temp_high=traces.get("target_temp_high"),
+                    cold_tolerance=traces["cold_tolerance"],
+                    hot_tolerance=traces["hot_tolerance"],
+                    heater=mirror.snapshot(entity_ids[Device.HEATER]),
+                    cooler=mirror.snapshot(entity_ids.get(Device.COOLER)),
+                    opening_open=bool(traces["openings"][index]),
+                    floor_temp=traces["floor_temperature"][index],
+                    min_floor_temp=traces["min_floor_temp"],
+                    max_floor_temp=traces["max_floor_temp"],
+                    keep_alive=keep_alive_pass,
+                    # the simulator replays keep-alive in the always mode
+                    keep_alive_mode=KeepAliveMode.ALWAYS,
+                )
+                for intent in plan_control(snapshot).intents:
+                    entity_id = entity_ids[intent.device]
+                    turn_on = intent.action == Action.TURN_ON
+                    if mirror.is_on(entity_id) != turn_on:
+                        mirror.update(
+                            entity_id,
+                            State(
+                                entity_id,
+                                STATE_ON if turn_on else STATE_OFF,
+                                last_changed=clock,
+                            ),
+                        )
+                        cycles[intent.device] += turn_on
+            for device, entity_id in entity_ids.items():
+                on_steps[device] += mirror.is_on(entity_id)
+
+    return cycles, on_steps
+
+
+@pytest.mark.parametrize(
+    ("hvac_mode", "targets"),
+    [
+        (HVACMode.HEAT, {"target_temp": 21}),
+        (HVACMode.COOL, {"target_temp": 21}),
+        (HVACMode.HEAT_COOL, {"target_temp_low": 20.5, "target_temp_high": 21.5}),
+    ],
+)
+@pytest.mark.parametrize(
+    ("min_cycle_duration", "keep_alive"),
+    [(0, 0), (300, 0), (300, 180), (0, 120), (600, 90), (150, 0), (120, 60)],
+)
+def test_matches_control_engine(
+    hvac_mode, targets, min_cycle_duration, keep_alive
+) -> None:
+    """Test the replay switches as the control engine on random traces."""
+    rng = np.random.default_rng(7)
+    temperature = 21 + np.cumsum(rng.normal(0, 0.08, (ZONES, STEPS)), axis=1)
+    temperature = 21 + (temperature - 21) % 3 - 1.5
+    openings = np.repeat(rng.random((ZONES, STEPS // 50)) < 0.1, 50, axis=1)
+    floor_temperature = 24 + np.cumsum(rng.normal(0, 0.1, (ZONES, STEPS)), axis=1)
+    cold_tolerance = rng.choice([0.0, 0.2, 0.5], ZONES)
+    hot_tolerance = rng.choice([0.0, 0.3], ZONES)
+
+    result = fleet_simulator.simulate(
+        temperature,
+        hvac_mode=hvac_mode,
+        step=STEP,
+        cold_tolerance=cold_tolerance,
+        hot_tolerance=hot_tolerance,
+        min_cycle_duration=min_cycle_duration,
+        keep_alive=keep_alive,
+        openings=openings,
+        floor_temperature=floor_temperature,
+        min_floor_temp=22,
+        max_floor_temp=26,
+        **targets,
+    )
+
+    for zone in range(ZONES):
+        cycles, on_steps = replay(
+            temperature[zone],
+            hvac_mode=hvac_mode,
+            min_cycle_duration=min_cycle_duration,
+            keep_alive=keep_alive,
+            cold_tolerance=cold_tolerance[zone],
+            hot_tolerance=hot_tolerance[zone],
+            openings=openings[zone],
+            floor_temperature=floor_temperature[zone],
+            min_floor_temp=22,
+            max_floor_temp=26,
+            **targets,
+        )
+        assert result.heater_cycles[zone] == cycles[Device.HEATER]
+        assert result.heater_on_time[zone] == on_steps[Device.HEATER] * STEP
+        if Device.COOLER in cycles:
+            assert result.cooler_cycles[zone] == cycles[Device.COOLER]
+            assert result.cooler_on_time[zone] == on_steps[Device.COOLER] * STEP
+
+
+@pytest.mark.parametrize(
+    ("min_cycle_duration", "on_time"), [(120, 2 * 60), (150, 3 * 60)]
+)
+def test_min_cycle_duration_boundary(min_cycle_duration, on_time) -> None:
+    """Test a duration that is a multiple of the step unblocks at that step."""
+    temperature = np.array([[19.0, 22.0, 22.0, 22.0, 22.0]])
+
+    result = fleet_simulator.simulate(
+        temperature,
+        target_temp=20,
+        min_cycle_duration=min_cycle_duration,
+    )
+
+    assert list(result.heater_cycles) == [1]
+    assert list(result.heater_on_time) == [on_time]
+
+
+def test_time_outside_band() -> None:
+    """Test the time outside of the tolerance band is counted per zone."""
+    temperature = np.array([[19.0, 20.0, 21.0, 22.0], [20.0, 20.0, 20.0, 20.0]])
+
+    result = fleet_simulator.simulate(
+        temperature,
+        target_temp=20,
+        cold_tolerance=0.5,
+        hot_tolerance=[0.5, 1.5],
+    )
+
+    assert list(result.time_outside_band) == [3 * 60, 0]
+    assert list(result.heater_cycles) == [1, 0]
+    assert list(result.heater_on_time) == [2 * 60, 0]
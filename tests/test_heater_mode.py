@@ -40,6 +40,7 @@ from homeassistant.util.unit_system import METRIC_SYSTEM, US_CUSTOMARY_SYSTEM
 import pytest
 import voluptuous as vol
 
+from custom_components.dual_smart_thermostat import climate
 from custom_components.dual_smart_thermostat.const import DOMAIN, PRESET_ANTI_FREEZE
 
 from . import (  # noqa: F401
@@ -105,6 +106,117 @@ async def test_unique_id(
     assert entry.unique_id == unique_id
 
 
+@pytest.mark.parametrize("unrecorded", [False, True])
+async def test_unrecorded_attributes(
+    hass: HomeAssistant, unrecorded, setup_comp_1  # noqa: F811
+) -> None:
+    """Test the thermostat attributes can be kept out of the recorder."""
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_SWITCH,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "unrecorded_attributes": unrecorded,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    thermostat = hass.data[CLIMATE].get_entity(common.ENTITY)
+    assert ("prev_target_temp" in thermostat._unrecorded_attributes) is unrecorded
+
+    # attributes are only rebuilt when the targets change
+    attributes = thermostat.extra_state_attributes
+    assert thermostat.extra_state_attributes is attributes
+
+    await common.async_set_temperature(hass, 23)
+    await hass.async_block_till_done()
+    assert thermostat.extra_state_attributes is not attributes
+    assert hass.states.get(common.ENTITY).attributes["prev_target_temp"] == 23
+
+
+async def test_zones(hass: HomeAssistant, setup_comp_1) -> None:  # noqa: F811
+    """Test zones share the platform settings and route their own events."""
+    calls = setup_switch(hass, False)
+    hass.states.async_set("switch.heater_1", STATE_OFF)
+    hass.states.async_set("switch.heater_2", STATE_OFF)
+
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "cold_tolerance": 0.5,
+                "hot_tolerance": 0.5,
+                "target_temp": 21,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "away": {"temperature": 16},
+                "zones": [
+                    {
+                        "name": "zone_1",
+                        "heater": "switch.heater_1",
+                        "target_sensor": "sensor.zone_1",
+                    },
+                    {
+                        "name": "zone_2",
+                        "heater": "switch.heater_2",
+                        "target_sensor": "sensor.zone_2",
+                        "cold_tolerance": 2,
+                    },
+                ],
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    for entity_id in ("climate.zone_1", "climate.zone_2"):
+        state = hass.states.get(entity_id)
+        assert state.state == HVACMode.HEAT
+        assert state.attributes.get("temperature") == 21
+        assert PRESET_AWAY in state.attributes.get("preset_modes")
+
+    hass.states.async_set("sensor.zone_1", 20)
+    hass.states.async_set("sensor.zone_2", 20)
+    await hass.async_block_till_done()
+
+    # zone_2 overrides the shared cold_tolerance and stays within it
+    assert len(calls) == 1
+    assert calls[0].service == SERVICE_TURN_ON
+    assert calls[0].data["entity_id"] == "switch.heater_1"
+
+
+async def test_zones_require_name(hass: HomeAssistant) -> None:
+    """Test zones need their own name and entities."""
+    with pytest.raises(vol.Invalid):
+        climate.PLATFORM_SCHEMA(
+            {
+                "platform": DOMAIN,
+                "zones": [{"heater": common.ENT_SWITCH, "target_sensor": "sensor.a"}],
+            }
+        )
+
+    with pytest.raises(vol.Invalid):
+        climate.PLATFORM_SCHEMA(
+            {
+                "platform": DOMAIN,
+                "heater": common.ENT_SWITCH,
+                "zones": [
+                    {
+                        "name": "zone_1",
+                        "heater": "switch.heater_1",
+                        "target_sensor": "sensor.zone_1",
+                    }
+                ],
+            }
+        )
+
+
 async def test_setup_defaults_to_unknown(hass: HomeAssistant) -> None:  # noqa: F811
     """Test the setting of defaults to unknown."""
     heater_switch = "input_boolean.test"
@@ -323,6 +435,8 @@ async def test_sensor_bad_value(
     await hass.async_block_till_done()
     state = hass.states.get(common.ENTITY)
     assert state.attributes.get("current_temperature") == temp
+    # rejected readings are counted by the statistics only, not written
+    assert "rejected_sensor_samples" not in state.attributes
 
 
 async def test_sensor_unknown(hass: HomeAssistant) -> None:  # noqa: F811
@@ -691,6 +805,84 @@ async def test_temp_change_heater_off_outside_tolerance(
     assert call.data["entity_id"] == common.ENT_SWITCH
 
 
+async def test_temp_change_inside_band_skips_control(
+    hass: HomeAssistant, setup_comp_heat  # noqa: F811
+) -> None:
+    """Test if temperature change inside the tolerance band skips control."""
+    calls = setup_switch(hass, False)
+    setup_sensor(hass, 25)
+    await hass.async_block_till_done()
+    await common.async_set_temperature(hass, 25)
+
+    with patch(
+        "custom_components.dual_smart_thermostat.climate.DualSmartThermostat._async_control_climate"
+    ) as control_climate:
+        setup_sensor(hass, 26)
+        await hass.async_block_till_done()
+        control_climate.assert_not_called()
+
+    assert hass.states.get(common.ENTITY).attributes["current_temperature"] == 26
+    assert len(calls) == 0
+
+
+async def test_switch_echo_without_change_skips_write(
+    hass: HomeAssistant, setup_comp_heat  # noqa: F811
+) -> None:
+    """Test switch updates not changing the thermostat do not write its state."""
+    setup_switch(hass, False)
+    setup_sensor(hass, 25)
+    await hass.async_block_till_done()
+
+    with patch(
+        "custom_components.dual_smart_thermostat.climate.DualSmartThermostat.async_write_ha_state"
+    ) as write_ha_state:
+        hass.states.async_set(common.ENT_SWITCH, STATE_OFF, {"echo": 1})
+        await hass.async_block_till_done()
+        write_ha_state.assert_not_called()
+
+        # bursts are coalesced into a single write
+        hass.states.async_set(common.ENT_SWITCH, STATE_ON)
+        hass.states.async_set(common.ENT_SWITCH, STATE_ON, {"echo": 2})
+        await hass.async_block_till_done()
+        assert write_ha_state.call_count == 1
+
+
+async def test_sensor_update_without_change_skips_write(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test sensor updates not changing the thermostat do not write its state."""
+    calls = setup_switch(hass, False)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_SWITCH,
+                "target_sensor": common.ENT_SENSOR,
+                "floor_sensor": common.ENT_FLOOR_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "target_temp": 23,
+            }
+        },
+    )
+    setup_sensor(hass, 18)
+    setup_floor_sensor(hass, 20)
+    await hass.async_block_till_done()
+
+    with patch(
+        "custom_components.dual_smart_thermostat.climate.DualSmartThermostat.async_write_ha_state"
+    ) as write_ha_state:
+        # control passes run, but the switch does not report on
+        hass.states.async_set(common.ENT_SENSOR, 18, {"echo": 1})
+        await hass.async_block_till_done()
+        setup_floor_sensor(hass, 21)
+        await hass.async_block_till_done()
+        write_ha_state.assert_not_called()
+    assert len(calls) >= 2
+
+
 async def test_running_when_hvac_mode_is_off(
     hass: HomeAssistant, setup_comp_heat  # noqa: F811
 ) -> None:
@@ -1219,6 +1411,43 @@ async def test_heater_mode_aux_heater_keep_primary_heater_on(
     assert hass.states.get(secondary_heater_switch).state == STATE_ON
 
 
+async def test_heater_mode_aux_heater_single_recheck(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test repeated heater on passes keep a single secondary heater recheck."""
+    calls = setup_switch(hass, False)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_SWITCH,
+                "secondary_heater": "switch.secondary_heater",
+                "secondary_heater_timeout": {"minutes": 10},
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    await common.async_set_temperature(hass, 23)
+    # the switch does not report on, so every pass turns the heater on again
+    for temp in (18, 17, 16):
+        setup_sensor(hass, temp)
+        await hass.async_block_till_done()
+    assert len(calls) == 3
+
+    with patch(
+        "custom_components.dual_smart_thermostat.climate.DualSmartThermostat._async_control_heating"
+    ) as control_heating:
+        common.async_fire_time_changed(hass, dt.utcnow() + timedelta(minutes=11))
+        await hass.async_block_till_done()
+        control_heating.assert_called_once()
+
+
 async def test_heater_mode_tolerance(
     hass: HomeAssistant, setup_comp_1  # noqa: F811
 ) -> None:
@@ -1435,30 +1664,104 @@ async def test_heater_mode_cycle(
     assert hass.states.get(heater_switch).state == result_state
 
 
-async def test_heater_mode_opening(
-    hass: HomeAssistant, setup_comp_1  # noqa: F811
+@pytest.mark.parametrize(
+    ["keep_alive_mode", "elapsed", "expected_calls"],
+    [
+        ("always", timedelta(minutes=10), 1),
+        ("on_divergence", timedelta(minutes=10), 0),
+        ("on_staleness", timedelta(minutes=10), 0),
+        ("on_staleness", timedelta(minutes=20), 1),
+    ],
+)
+async def test_heater_mode_keep_alive_mode(
+    hass: HomeAssistant,
+    keep_alive_mode,
+    elapsed,
+    expected_calls,
+    setup_comp_1,  # noqa: F811
 ) -> None:
-    """Test thermostat cooler switch in cooling mode."""
-    heater_switch = "input_boolean.test"
-    opening_1 = "input_boolean.opening_1"
-    opening_2 = "input_boolean.opening_2"
-
+    """Test keep-alive resends the switch state as keep_alive_mode requires."""
     assert await async_setup_component(
         hass,
-        input_boolean.DOMAIN,
-        {"input_boolean": {"test": None, "opening_1": None, "opening_2": None}},
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_SWITCH,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "keep_alive": timedelta(minutes=10),
+                "keep_alive_mode": keep_alive_mode,
+                "keep_alive_staleness": timedelta(minutes=15),
+            }
+        },
     )
+    await hass.async_block_till_done()
+
+    calls = setup_switch(hass, True)
+    setup_sensor(hass, 18)
+    await common.async_set_temperature(hass, 23)
+    await hass.async_block_till_done()
+    assert len(calls) == 0
+
+    now = dt.utcnow()
+    with patch(
+        "homeassistant.helpers.condition.dt_util.utcnow", return_value=now + elapsed
+    ):
+        common.async_fire_time_changed(hass, now + elapsed)
+        await hass.async_block_till_done()
+
+    assert len(calls) == expected_calls
+    if expected_calls:
+        assert calls[0].service == SERVICE_TURN_ON
+        assert calls[0].data["entity_id"] == common.ENT_SWITCH
 
+
+async def test_heater_mode_keep_alive_staleness_resends_once(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test on_staleness resends a steady switch once per staleness window."""
     assert await async_setup_component(
         hass,
-        input_number.DOMAIN,
+        CLIMATE,
         {
-            "input_number": {
-                "temp": {"name": "test", "initial": 10, "min": 0, "max": 40, "step": 1}
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_SWITCH,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "keep_alive": timedelta(minutes=10),
+                "keep_alive_mode": "on_staleness",
+                "keep_alive_staleness": timedelta(minutes=15),
             }
         },
     )
+    await hass.async_block_till_done()
+
+    calls = setup_switch(hass, True)
+    setup_sensor(hass, 18)
+    await common.async_set_temperature(hass, 23)
+    await hass.async_block_till_done()
+
+    # the switch does not report the resent state it already has
+    now = dt.utcnow()
+    for minutes, expected_calls in ((20, 1), (30, 1), (40, 2)):
+        later = now + timedelta(minutes=minutes)
+        with patch(
+            "homeassistant.helpers.condition.dt_util.utcnow", return_value=later
+        ):
+            common.async_fire_time_changed(hass, later)
+            await hass.async_block_till_done()
+        assert len(calls) == expected_calls
 
+
+async def test_heater_mode_statistics(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test control statistics are collected and exposed."""
+    calls = setup_switch(hass, False)
     assert await async_setup_component(
         hass,
         CLIMATE,
@@ -1466,53 +1769,636 @@ async def test_heater_mode_opening(
             "climate": {
                 "platform": DOMAIN,
                 "name": "test",
-                "heater": heater_switch,
+                "heater": common.ENT_SWITCH,
                 "target_sensor": common.ENT_SENSOR,
                 "initial_hvac_mode": HVACMode.HEAT,
-                "openings": [
-                    opening_1,
-                    {"entity_id": opening_2, "timeout": {"seconds": 10}},
-                ],
+                "unique_id": "test",
+                "statistics": True,
             }
         },
     )
     await hass.async_block_till_done()
 
-    assert hass.states.get(heater_switch).state == STATE_OFF
-
-    setup_sensor(hass, 18)
+    setup_sensor(hass, "nan")
     await hass.async_block_till_done()
-
+    setup_sensor(hass, 18)
     await common.async_set_temperature(hass, 23)
     await hass.async_block_till_done()
-    assert hass.states.get(heater_switch).state == STATE_ON
+    assert len(calls) == 1
 
-    setup_boolean(hass, opening_1, "open")
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_statistics",
+        {"entity_id": common.ENTITY},
+        blocking=True,
+        return_response=True,
+    )
+    statistics = response[common.ENTITY]
+    assert statistics["passes"] >= 1
+    assert statistics["pass_latency"]["count"] == statistics["passes"]
+    assert statistics["actuations"] == {common.ENT_SWITCH: 1}
+    assert statistics["rejected_samples"] == 1
+
+    common.async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=1))
     await hass.async_block_till_done()
+    assert hass.states.get("sensor.test_service_calls").state == "1"
+    assert hass.states.get("sensor.test_rejected_sensor_samples").state == "1"
+    assert float(hass.states.get("sensor.test_control_passes").state) >= 1
 
-    assert hass.states.get(heater_switch).state == STATE_OFF
 
-    setup_boolean(hass, opening_1, "closed")
-    await hass.async_block_till_done()
+async def test_heater_mode_statistics_disabled(
+    hass: HomeAssistant, setup_comp_heat  # noqa: F811
+) -> None:
+    """Test statistics are not collected unless enabled."""
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            "get_statistics",
+            {"entity_id": common.ENTITY},
+            blocking=True,
+            return_response=True,
+        )
+    assert hass.states.get("sensor.test_service_calls") is None
 
-    assert hass.states.get(heater_switch).state == STATE_ON
 
-    setup_boolean(hass, opening_2, "open")
+async def test_heater_mode_startup_window(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test the first control pass waits for the slot in the startup window."""
+    calls = setup_switch(hass, False)
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_SWITCH,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "target_temp": 23,
+                "startup_window": timedelta(minutes=1),
+            }
+        },
+    )
     await hass.async_block_till_done()
 
-    assert hass.states.get(heater_switch).state == STATE_ON
+    setup_sensor(hass, 18)
+    await hass.async_block_till_done()
+    assert len(calls) == 0
+    assert hass.states.get(common.ENTITY).attributes["current_temperature"] == 18
 
-    # wait 10 seconds, actually 133 due to the other tests run time seems to affect this
-    # needs to separate the tests
-    await asyncio.sleep(13)
+    common.async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=1))
     await hass.async_block_till_done()
 
-    assert hass.states.get(heater_switch).state == STATE_OFF
+    assert len(calls) == 1
+    assert calls[0].service == SERVICE_TURN_ON
+    assert calls[0].data["entity_id"] == common.ENT_SWITCH
 
-    setup_boolean(hass, opening_2, "closed")
-    await hass.async_block_till_done()
 
-    assert hass.states.get(heater_switch).state == STATE_ON
+async def test_heater_mode_cycle_recheck(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test control blocked by min_cycle_duration is re-evaluated on expiry."""
+    heater_switch = "input_boolean.test"
+    assert await async_setup_component(
+        hass, input_boolean.DOMAIN, {"input_boolean": {"test": None}}
+    )
+
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": heater_switch,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "min_cycle_duration": timedelta(seconds=15),
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    setup_sensor(hass, 18)
+    await hass.async_block_till_done()
+
+    now = dt.utcnow()
+    with patch(
+        "homeassistant.helpers.condition.dt_util.utcnow",
+        return_value=now - timedelta(seconds=10),
+    ):
+        await common.async_set_temperature(hass, 23)
+        await hass.async_block_till_done()
+        assert hass.states.get(heater_switch).state == STATE_ON
+
+    # blocked by min_cycle_duration
+    setup_sensor(hass, 24)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+    # no sensor update needed once min_cycle_duration has passed
+    with patch(
+        "homeassistant.helpers.condition.dt_util.utcnow",
+        return_value=now + timedelta(seconds=6),
+    ):
+        common.async_fire_time_changed(hass, now + timedelta(seconds=6))
+        await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+
+async def test_heater_mode_cycle_recheck_at_boundary(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test a recheck firing exactly at min_cycle_duration switches the heater."""
+    heater_switch = "input_boolean.test"
+    assert await async_setup_component(
+        hass, input_boolean.DOMAIN, {"input_boolean": {"test": None}}
+    )
+
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": heater_switch,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "min_cycle_duration": timedelta(seconds=15),
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    setup_sensor(hass, 18)
+    await hass.async_block_till_done()
+
+    with patch(
+        "homeassistant.helpers.condition.dt_util.utcnow",
+        return_value=dt.utcnow() - timedelta(seconds=10),
+    ):
+        await common.async_set_temperature(hass, 23)
+        await hass.async_block_till_done()
+        assert hass.states.get(heater_switch).state == STATE_ON
+
+    # blocked by min_cycle_duration
+    setup_sensor(hass, 24)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+    boundary = hass.states.get(heater_switch).last_changed + timedelta(seconds=15)
+    with patch("homeassistant.helpers.condition.dt_util.utcnow", return_value=boundary):
+        common.async_fire_time_changed(hass, boundary)
+        await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+
+async def test_heater_mode_opening(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test thermostat cooler switch in cooling mode."""
+    heater_switch = "input_boolean.test"
+    opening_1 = "input_boolean.opening_1"
+    opening_2 = "input_boolean.opening_2"
+
+    assert await async_setup_component(
+        hass,
+        input_boolean.DOMAIN,
+        {"input_boolean": {"test": None, "opening_1": None, "opening_2": None}},
+    )
+
+    assert await async_setup_component(
+        hass,
+        input_number.DOMAIN,
+        {
+            "input_number": {
+                "temp": {"name": "test", "initial": 10, "min": 0, "max": 40, "step": 1}
+            }
+        },
+    )
+
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": heater_switch,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "openings": [
+                    opening_1,
+                    {"entity_id": opening_2, "timeout": {"seconds": 10}},
+                ],
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+    setup_sensor(hass, 18)
+    await hass.async_block_till_done()
+
+    await common.async_set_temperature(hass, 23)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+    setup_boolean(hass, opening_1, "open")
+    await hass.async_block_till_done()
+
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+    setup_boolean(hass, opening_1, "closed")
+    await hass.async_block_till_done()
+
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+    setup_boolean(hass, opening_2, "open")
+    await hass.async_block_till_done()
+
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+    # wait 10 seconds, actually 133 due to the other tests run time seems to affect this
+    # needs to separate the tests
+    await asyncio.sleep(13)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+    setup_boolean(hass, opening_2, "closed")
+    await hass.async_block_till_done()
+
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+
+async def test_heater_mode_sensor_coalesce(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test thermostat collapses sensor bursts inside the coalescing window."""
+    heater_switch = "input_boolean.test"
+    assert await async_setup_component(
+        hass, input_boolean.DOMAIN, {"input_boolean": {"test": None}}
+    )
+
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": heater_switch,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "cold_tolerance": COLD_TOLERANCE,
+                "hot_tolerance": HOT_TOLERANCE,
+                "sensor_coalesce": {"seconds": 5},
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    await common.async_set_temperature(hass, 20)
+    await hass.async_block_till_done()
+
+    # first update opens the window and is handled right away
+    setup_sensor(hass, 20)
+    await hass.async_block_till_done()
+    assert hass.states.get(common.ENTITY).attributes["current_temperature"] == 20
+
+    # updates inside the band are deferred
+    setup_sensor(hass, 19.8)
+    await hass.async_block_till_done()
+    setup_sensor(hass, 20.1)
+    await hass.async_block_till_done()
+    assert hass.states.get(common.ENTITY).attributes["current_temperature"] == 20
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+    # crossing the cold threshold bypasses the window
+    setup_sensor(hass, 19)
+    await hass.async_block_till_done()
+    assert hass.states.get(common.ENTITY).attributes["current_temperature"] == 19
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+    setup_sensor(hass, 19.2)
+    await hass.async_block_till_done()
+    assert hass.states.get(common.ENTITY).attributes["current_temperature"] == 19
+
+    # the end of the window runs one pass with the latest value
+    common.async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert hass.states.get(common.ENTITY).attributes["current_temperature"] == 19.2
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+
+async def test_heater_mode_multiple_target_sensors(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test thermostat heater switch with aggregated target sensors."""
+    heater_switch = "input_boolean.test"
+    sensor_2 = "sensor.test_2"
+    assert await async_setup_component(
+        hass, input_boolean.DOMAIN, {"input_boolean": {"test": None}}
+    )
+
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": heater_switch,
+                "target_sensor": [common.ENT_SENSOR, sensor_2],
+                "target_sensor_aggregation": "mean",
+                "initial_hvac_mode": HVACMode.HEAT,
+                "cold_tolerance": COLD_TOLERANCE,
+                "hot_tolerance": HOT_TOLERANCE,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    setup_sensor(hass, 20)
+    hass.states.async_set(sensor_2, 20)
+    await hass.async_block_till_done()
+
+    await common.async_set_temperature(hass, 20)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+    hass.states.async_set(sensor_2, 18)
+    await hass.async_block_till_done()
+    assert hass.states.get(common.ENTITY).attributes["current_temperature"] == 19
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+    # an unavailable sensor is left out of the aggregate
+    hass.states.async_set(sensor_2, STATE_UNAVAILABLE)
+    await hass.async_block_till_done()
+    assert hass.states.get(common.ENTITY).attributes["current_temperature"] == 20
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+    setup_sensor(hass, 21)
+    await hass.async_block_till_done()
+    assert hass.states.get(common.ENTITY).attributes["current_temperature"] == 21
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+
+async def test_heater_mode_pwm(hass: HomeAssistant, setup_comp_1) -> None:  # noqa: F811
+    """Test the heater is switched once on and once off per PWM period."""
+    heater_switch = "input_boolean.test"
+    assert await async_setup_component(
+        hass, input_boolean.DOMAIN, {"input_boolean": {"test": None}}
+    )
+
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": heater_switch,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "control_mode": "pwm",
+                "pwm_period": timedelta(minutes=10),
+                "pwm_proportional_band": 2,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    setup_sensor(hass, 19.5)
+    await common.async_set_temperature(hass, 20)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_ON
+    assert hass.states.get(common.ENTITY).attributes["pwm_duty_cycle"] == 0.25
+
+    # the sensor does not switch the heater within the period
+    setup_sensor(hass, 20.5)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+    now = dt_util.utcnow()
+    common.async_fire_time_changed(hass, now + timedelta(minutes=3))
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+    setup_sensor(hass, 19)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+    common.async_fire_time_changed(hass, now + timedelta(minutes=11))
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_ON
+    assert hass.states.get(common.ENTITY).attributes["pwm_duty_cycle"] == 0.5
+
+
+async def test_heater_mode_pwm_opening(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test an opening overrides the PWM phase without restarting the period."""
+    heater_switch = "input_boolean.test"
+    opening = "binary_sensor.window"
+    assert await async_setup_component(
+        hass, input_boolean.DOMAIN, {"input_boolean": {"test": None}}
+    )
+    setup_boolean(hass, opening, "closed")
+
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": heater_switch,
+                "target_sensor": common.ENT_SENSOR,
+                "initial_hvac_mode": HVACMode.HEAT,
+                "control_mode": "pwm",
+                "pwm_period": timedelta(minutes=10),
+                "pwm_proportional_band": 2,
+                "openings": [opening],
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    setup_sensor(hass, 19.5)
+    await common.async_set_temperature(hass, 20)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+    setup_boolean(hass, opening, "open")
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+    setup_sensor(hass, 18)
+    setup_boolean(hass, opening, "closed")
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_ON
+    assert hass.states.get(common.ENTITY).attributes["pwm_duty_cycle"] == 0.25
+
+    # the on phase still ends with the duty cycle of the period
+    now = dt_util.utcnow()
+    common.async_fire_time_changed(hass, now + timedelta(minutes=3))
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+
+async def test_heater_mode_pid_restores_integral(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test pid control continues with the integral of the restored state."""
+    heater_switch = "input_boolean.test"
+    assert await async_setup_component(
+        hass, input_boolean.DOMAIN, {"input_boolean": {"test": None}}
+    )
+    common.mock_restore_cache(
+        hass,
+        (
+            State(
+                common.ENTITY,
+                HVACMode.HEAT,
+                {ATTR_TEMPERATURE: "20", "control_integral": 0.3},
+            ),
+        ),
+    )
+
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": heater_switch,
+                "target_sensor": common.ENT_SENSOR,
+                "control_mode": "pid",
+                "pid_kp": 0.5,
+                "pid_ki": 0,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    setup_sensor(hass, 19.5)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(common.ENTITY)
+    assert state.attributes["control_integral"] == 0.3
+    assert state.attributes["pwm_duty_cycle"] == 0.55
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+
+async def test_heater_mode_thermal_model(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test the restored thermal model switches the heater early."""
+    heater_switch = "input_boolean.test"
+    outside_sensor = "sensor.outside"
+    assert await async_setup_component(
+        hass, input_boolean.DOMAIN, {"input_boolean": {"test": None}}
+    )
+    common.mock_restore_cache(
+        hass,
+        (
+            State(
+                common.ENTITY,
+                HVACMode.HEAT,
+                {
+                    ATTR_TEMPERATURE: "20",
+                    "heating_rate": 3,
+                    "cooling_rate": 0,
+                    "outdoor_coupling": 0.05,
+                    "thermal_model_samples": 50,
+                },
+            ),
+        ),
+    )
+    hass.states.async_set(outside_sensor, 10)
+
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": heater_switch,
+                "target_sensor": common.ENT_SENSOR,
+                "outside_sensor": outside_sensor,
+                "thermal_model": True,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    state = hass.states.get(common.ENTITY)
+    assert state.attributes["heating_rate"] == 3
+    assert state.attributes["outdoor_coupling"] == 0.05
+    assert state.attributes["thermal_model_samples"] == 50
+
+    # the temperature is going to drop below the cold tolerance
+    setup_sensor(hass, 19.85)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_OFF
+    setup_sensor(hass, 19.75)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_ON
+
+    # the heater is going to overshoot the hot tolerance
+    setup_sensor(hass, 20.1)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_ON
+    setup_sensor(hass, 20.2)
+    await hass.async_block_till_done()
+    assert hass.states.get(heater_switch).state == STATE_OFF
+
+
+async def test_heater_mode_thermal_model_partial_restore(
+    hass: HomeAssistant, setup_comp_1  # noqa: F811
+) -> None:
+    """Test a restored state without all model attributes starts a new fit."""
+    outside_sensor = "sensor.outside"
+    common.mock_restore_cache(
+        hass,
+        (
+            State(
+                common.ENTITY,
+                HVACMode.HEAT,
+                {ATTR_TEMPERATURE: "20", "thermal_model_samples": 50},
+            ),
+        ),
+    )
+    hass.states.async_set(outside_sensor, 10)
+
+    assert await async_setup_component(
+        hass,
+        CLIMATE,
+        {
+            "climate": {
+                "platform": DOMAIN,
+                "name": "test",
+                "heater": common.ENT_SWITCH,
+                "target_sensor": common.ENT_SENSOR,
+                "outside_sensor": outside_sensor,
+                "thermal_model": True,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get(common.ENTITY)
+    assert state.state == HVACMode.HEAT
+    assert state.attributes[ATTR_TEMPERATURE] == 20
+    assert state.attributes["heating_rate"] == 0
+    assert state.attributes["thermal_model_samples"] == 0
 
 
 def _mock_restore_cache(hass, temperature=20, hvac_mode=HVACMode.OFF):
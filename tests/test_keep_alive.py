@@ -0,0 +1,82 @@
+"""The tests for the dual_smart_thermostat keep-alive scheduler."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from custom_components.dual_smart_thermostat.keep_alive import KeepAliveScheduler
+
+from . import common
+
+
+def _register(scheduler, keys, calls, interval, max_rate=None) -> list:
+    def _action(key):
+        @callback
+        def _async_keep_alive(time) -> None:
+            calls.append((key, step[0]))
+
+        return _async_keep_alive
+
+    step = [0]
+    unsubs = [
+        scheduler.async_register(key, interval, _action(key), max_rate) for key in keys
+    ]
+    return step, unsubs
+
+
+async def test_keep_alive_shared_scheduler(hass: HomeAssistant) -> None:
+    """Test the platform shares one scheduler."""
+    assert KeepAliveScheduler.async_get(hass) is KeepAliveScheduler.async_get(hass)
+
+
+async def test_keep_alive_staggered(hass: HomeAssistant) -> None:
+    """Test thermostats sharing an interval fire at different phases."""
+    scheduler = KeepAliveScheduler.async_get(hass)
+    interval = timedelta(minutes=10)
+    keys = ["climate.test_1", "climate.test_2", "climate.test_3"]
+    calls = []
+    step, unsubs = _register(scheduler, keys, calls, interval)
+
+    phases = {KeepAliveScheduler.phase(key, 600) for key in keys}
+    assert len(phases) == len(keys)
+
+    now = dt_util.utcnow()
+    for step[0] in range(1, 11):
+        common.async_fire_time_changed(hass, now + timedelta(minutes=step[0]))
+        await hass.async_block_till_done()
+
+    assert sorted(key for key, _ in calls) == keys
+    assert len({minute for _, minute in calls}) > 1
+
+    for unsub in unsubs:
+        unsub()
+
+
+async def test_keep_alive_max_rate(hass: HomeAssistant) -> None:
+    """Test keep-alives due together are dispatched at most max_rate per second."""
+    scheduler = KeepAliveScheduler.async_get(hass)
+    interval = timedelta(minutes=10)
+    keys = [f"climate.test_{i}" for i in range(5)]
+    calls = []
+
+    with patch.object(KeepAliveScheduler, "phase", return_value=0.0):
+        step, unsubs = _register(scheduler, keys, calls, interval, max_rate=2)
+
+    now = dt_util.utcnow()
+    common.async_fire_time_changed(hass, now + interval)
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+    for step[0] in range(1, 3):
+        common.async_fire_time_changed(
+            hass, now + interval + timedelta(seconds=step[0])
+        )
+        await hass.async_block_till_done()
+
+    assert sorted(key for key, _ in calls) == keys
+    assert [minute for _, minute in calls] == [0, 0, 1, 1, 2]
+
+    for unsub in unsubs:
+        unsub()
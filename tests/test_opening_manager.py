@@ -0,0 +1,106 @@
+"""The tests for the dual_smart_thermostat opening manager."""
+
+import datetime
+from unittest.mock import patch
+
+from homeassistant.const import STATE_OFF, STATE_ON, STATE_OPEN, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant, State
+import homeassistant.util.dt as dt_util
+
+from custom_components.dual_smart_thermostat.opening_manager import OpeningManager
+
+from . import common
+
+OPENING_1 = "input_boolean.opening_1"
+OPENING_2 = "input_boolean.opening_2"
+
+
+def _opening_manager(hass: HomeAssistant) -> OpeningManager:
+    return OpeningManager(
+        hass,
+        [
+            OPENING_1,
+            {"entity_id": OPENING_2, "timeout": datetime.timedelta(seconds=10)},
+        ],
+    )
+
+
+async def test_seed(hass: HomeAssistant) -> None:
+    """Test open openings are read from the state machine."""
+    hass.states.async_set(OPENING_1, STATE_OPEN)
+    opening_manager = _opening_manager(hass)
+
+    opening_manager.seed()
+
+    assert opening_manager.any_opening_open
+
+
+async def test_opening_without_timeout(hass: HomeAssistant) -> None:
+    """Test an opening without timeout is open immediately."""
+    opening_manager = _opening_manager(hass)
+    assert not opening_manager.any_opening_open
+
+    opening_manager.update(OPENING_1, State(OPENING_1, STATE_ON))
+    assert opening_manager.any_opening_open
+
+    opening_manager.update(OPENING_1, State(OPENING_1, STATE_UNAVAILABLE))
+    assert not opening_manager.any_opening_open
+
+
+async def test_opening_with_timeout(hass: HomeAssistant) -> None:
+    """Test an opening with timeout is open once the timeout passed."""
+    opening_manager = _opening_manager(hass)
+
+    opening_manager.update(OPENING_2, State(OPENING_2, STATE_OPEN))
+    assert not opening_manager.any_opening_open
+
+    with patch(
+        "homeassistant.util.dt.utcnow",
+        return_value=dt_util.utcnow() + datetime.timedelta(seconds=11),
+    ):
+        assert opening_manager.any_opening_open
+
+    opening_manager.update(OPENING_2, State(OPENING_2, STATE_OFF))
+    assert not opening_manager.any_opening_open
+
+
+async def test_opening_timeout_timer(hass: HomeAssistant) -> None:
+    """Test a timed opening keeps one timer that is cancelled on close."""
+    opening_manager = _opening_manager(hass)
+    calls = []
+    unsub = opening_manager.async_listen_timeouts(calls.append)
+
+    # toggling the opening does not pile up timers
+    for _ in range(3):
+        opening_manager.update(OPENING_2, State(OPENING_2, STATE_OPEN))
+        opening_manager.update(OPENING_2, State(OPENING_2, STATE_OFF))
+    assert not opening_manager.is_timer_running(OPENING_2)
+
+    opening_manager.update(OPENING_2, State(OPENING_2, STATE_OPEN))
+    assert opening_manager.is_timer_running(OPENING_2)
+
+    common.async_fire_time_changed(
+        hass, dt_util.utcnow() + datetime.timedelta(seconds=11)
+    )
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert opening_manager.any_opening_open
+    assert not opening_manager.is_timer_running(OPENING_2)
+
+    opening_manager.update(OPENING_2, State(OPENING_2, STATE_OFF))
+    opening_manager.update(OPENING_2, State(OPENING_2, STATE_OPEN))
+    unsub()
+    assert not opening_manager.is_timer_running(OPENING_2)
+
+
+async def test_opening_timeout_timer_cancelled_on_shutdown(
+    hass: HomeAssistant,
+) -> None:
+    """Test a timeout pending at shutdown does not outlive Home Assistant."""
+    opening_manager = _opening_manager(hass)
+    opening_manager.async_listen_timeouts(lambda time: None)
+
+    opening_manager.update(OPENING_2, State(OPENING_2, STATE_OPEN))
+
+    assert opening_manager.is_timer_running(OPENING_2)
@@ -0,0 +1,55 @@
+"""The tests for the dual_smart_thermostat PID controller."""
+
+import pytest
+
+from custom_components.dual_smart_thermostat.pid import PidGains, PidState, pid_update
+
+
+def test_proportional_and_integral() -> None:
+    """Test the output adds the integral of the error over the intervals."""
+    gains = PidGains(0.5, 0.001)
+    state = PidState()
+
+    # the first update integrates a whole interval
+    assert pid_update(gains, state, 0.5, -19.5, 0, 100) == pytest.approx(0.3)
+    assert pid_update(gains, state, 0.5, -19.5, 50, 100) == pytest.approx(0.325)
+    # a long gap integrates at most one interval
+    assert pid_update(gains, state, 0.5, -19.5, 1000, 100) == pytest.approx(0.375)
+    assert state.integral == pytest.approx(0.125)
+    assert state.time == 1000
+
+
+def test_anti_windup() -> None:
+    """Test the integral stops growing while the output is saturated."""
+    gains = PidGains(0.5, 0.001)
+    state = PidState(integral=0.2)
+
+    for now in range(0, 1000, 100):
+        assert pid_update(gains, state, 4, -16, now, 100) == 1
+    assert state.integral == 0.2
+
+    # an error back within the band unwinds the integral right away
+    assert pid_update(gains, state, -0.2, -20.2, 1000, 100) == pytest.approx(0.08)
+    for now in range(1100, 2000, 100):
+        assert pid_update(gains, state, -2, -22, now, 100) == 0
+    assert state.integral == pytest.approx(0.18)
+
+
+def test_derivative_on_measurement() -> None:
+    """Test the derivative follows the measurement, not the target."""
+    gains = PidGains(0.5, kd=60)
+    state = PidState()
+
+    assert pid_update(gains, state, 1, -19, 0, 100) == 0.5
+    # a target change moves the error only
+    assert pid_update(gains, state, 0.5, -19, 60, 100) == 0.25
+    # a rising temperature damps the output
+    assert pid_update(gains, state, 0.4, -19.1, 120, 100) == pytest.approx(0.1)
+
+
+def test_slots() -> None:
+    """Test gains and state keep no instance dict."""
+    assert not hasattr(PidGains(1), "__dict__")
+    assert not hasattr(PidState(), "__dict__")
+    with pytest.raises(AttributeError):
+        PidGains(1).kp = 2
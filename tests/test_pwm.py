@@ -0,0 +1,168 @@
+"""The tests for the dual_smart_thermostat PWM controller."""
+
+from datetime import timedelta
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.const import STATE_OFF
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+import pytest
+
+from custom_components.dual_smart_thermostat.control_engine import (
+    ActuatorState,
+    ControlSnapshot,
+    Device,
+)
+from custom_components.dual_smart_thermostat.pid import PidGains
+from custom_components.dual_smart_thermostat.pwm import PwmController
+
+from . import common
+
+PERIOD = timedelta(minutes=10)
+# a proportional band of 2 degrees and an integral time of 20 minutes
+GAINS = PidGains(0.5, 0.5 / 1200)
+OFF = ActuatorState(STATE_OFF)
+
+
+def snapshot(cur_temp, now=0.0, **changes) -> ControlSnapshot:
+    """Return a heating snapshot with a target of 20."""
+    return ControlSnapshot(
+        **{
+            "hvac_mode": HVACMode.HEAT,
+            "now": now,
+            "cur_temp": cur_temp,
+            "target_temp": 20,
+            "cold_tolerance": 0.3,
+            "hot_tolerance": 0.3,
+            "heater": OFF,
+            **changes,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    ("cur_temp", "duty_cycle"), [(21, 0), (20, 0), (19.5, 0.25), (18, 1), (10, 1)]
+)
+def test_proportional(cur_temp, duty_cycle) -> None:
+    """Test the duty cycle is proportional to the error within the band."""
+    pwm = PwmController(None, PERIOD, PidGains(0.5))
+
+    pwm.start_period(snapshot(cur_temp))
+
+    assert pwm.device == Device.HEATER
+    assert pwm.duty_cycle == duty_cycle
+    assert pwm.is_on == (duty_cycle > 0)
+    assert not pwm.period_due
+
+
+def test_integral_and_anti_windup() -> None:
+    """Test the integral grows with a steady error and stops at saturation."""
+    pwm = PwmController(None, PERIOD, GAINS)
+
+    pwm.start_period(snapshot(19.5))
+    assert pwm.duty_cycle == 0.375
+    pwm.start_period(snapshot(19.5, now=600))
+    assert pwm.duty_cycle == 0.5
+
+    # a short period integrates only the time that passed
+    pwm.start_period(snapshot(19.5, now=720))
+    assert pwm.duty_cycle == pytest.approx(0.525)
+
+    # the integral does not wind up while the output is saturated
+    for now in range(1320, 12000, 600):
+        pwm.start_period(snapshot(16, now=now))
+    assert pwm.duty_cycle == 1
+    pwm.start_period(snapshot(20.2, now=12120))
+    assert pwm.duty_cycle == pytest.approx(0.125)
+
+
+def test_min_cycle_duration() -> None:
+    """Test on and off phases shorter than min_cycle_duration are dropped."""
+    pwm = PwmController(
+        None, PERIOD, PidGains(0.5), min_cycle_duration=timedelta(minutes=2)
+    )
+
+    pwm.start_period(snapshot(19.8))
+    assert pwm.duty_cycle == 0
+    pwm.start_period(snapshot(19.5))
+    assert pwm.duty_cycle == 0.25
+    pwm.start_period(snapshot(18.3))
+    assert pwm.duty_cycle == 1
+
+
+def test_aux_heater() -> None:
+    """Test the aux heater takes the periods once the heater ran too long."""
+    pwm = PwmController(None, PERIOD, PidGains(0.5))
+    aux = {
+        "aux_heater": OFF,
+        "aux_heater_timeout": 1200,
+        "heater": ActuatorState("on", since=0),
+    }
+
+    pwm.start_period(snapshot(17, now=600, **aux))
+    assert pwm.device == Device.HEATER
+    pwm.start_period(snapshot(17, now=1800, **aux))
+    assert pwm.device == Device.AUX_HEATER
+    assert pwm.duty_cycle == 1
+
+    # the aux heater keeps the periods while there is demand
+    pwm.start_period(snapshot(19.5, now=2400, **aux))
+    assert pwm.device == Device.AUX_HEATER
+    assert pwm.duty_cycle == 0.25
+    pwm.start_period(snapshot(20.5, now=3000, **aux))
+    assert pwm.device == Device.HEATER
+    assert pwm.duty_cycle == 0
+
+
+def test_demand() -> None:
+    """Test the device and error of each hvac mode."""
+    cooler = {"cooler": OFF}
+
+    assert PwmController.demand(snapshot(19)) == (Device.HEATER, 1)
+    assert PwmController.demand(snapshot(21, hvac_mode=HVACMode.COOL, **cooler)) == (
+        Device.COOLER,
+        1,
+    )
+    assert PwmController.demand(
+        snapshot(21, hvac_mode=HVACMode.COOL, ac_mode=True)
+    ) == (
+        Device.HEATER,
+        1,
+    )
+
+    heat_cool = {
+        "hvac_mode": HVACMode.HEAT_COOL,
+        "target_temp_low": 20,
+        "target_temp_high": 24,
+        **cooler,
+    }
+    assert PwmController.demand(snapshot(19, **heat_cool)) == (Device.HEATER, 1)
+    assert PwmController.demand(snapshot(23, **heat_cool)) == (Device.COOLER, -1)
+
+
+async def test_timers(hass: HomeAssistant) -> None:
+    """Test the on phase ends after the duty cycle and a new period starts."""
+    pwm = PwmController(hass, PERIOD, PidGains(0.5))
+    calls = []
+
+    @callback
+    def _async_switch() -> None:
+        calls.append((pwm.is_on, pwm.period_due))
+
+    cancel = pwm.async_listen(_async_switch)
+    pwm.start_period(snapshot(19.5))
+    now = dt_util.utcnow()
+
+    common.async_fire_time_changed(hass, now + timedelta(minutes=3))
+    await hass.async_block_till_done()
+    assert calls == [(False, False)]
+
+    common.async_fire_time_changed(hass, now + timedelta(minutes=11))
+    await hass.async_block_till_done()
+    assert calls == [(False, False), (False, True)]
+
+    pwm.start_period(snapshot(19.5))
+    cancel()
+    common.async_fire_time_changed(hass, now + timedelta(minutes=30))
+    await hass.async_block_till_done()
+    assert len(calls) == 2
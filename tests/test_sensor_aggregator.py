@@ -0,0 +1,67 @@
+"""The tests for the dual_smart_thermostat sensor aggregator."""
+
+import pytest
+
+from custom_components.dual_smart_thermostat.const import SensorAggregation
+from custom_components.dual_smart_thermostat.sensor_aggregator import SensorAggregator
+
+SENSOR_1 = "sensor.temp_1"
+SENSOR_2 = "sensor.temp_2"
+SENSOR_3 = "sensor.temp_3"
+
+
+def test_single_sensor() -> None:
+    """Test a single sensor passes its reading through."""
+    aggregator = SensorAggregator(SENSOR_1)
+
+    assert aggregator.sensor_entities == [SENSOR_1]
+    assert aggregator.update(SENSOR_1, 20.5) == 20.5
+    # a single sensor keeps the last reading when it becomes unavailable
+    assert aggregator.remove(SENSOR_1) is None
+
+
+@pytest.mark.parametrize(
+    ["aggregation", "expected", "expected_after_remove"],
+    [
+        (SensorAggregation.MEAN, 20, 18.5),
+        (SensorAggregation.MEDIAN, 19, 18.5),
+        (SensorAggregation.MIN, 18, 18),
+        (SensorAggregation.MAX, 23, 19),
+        (SensorAggregation.WEIGHTED, 19.2, 18.25),
+    ],
+)
+def test_aggregation(aggregation, expected, expected_after_remove) -> None:
+    """Test the aggregate of multiple sensors."""
+    aggregator = SensorAggregator(
+        [
+            SENSOR_1,
+            {"entity_id": SENSOR_2, "weight": 3.0},
+            {"entity_id": SENSOR_3, "weight": 1.0},
+        ],
+        aggregation,
+    )
+
+    aggregator.update(SENSOR_1, 21)
+    aggregator.update(SENSOR_2, 18)
+    aggregator.update(SENSOR_3, 22)
+    assert aggregator.update(SENSOR_3, 23) == pytest.approx(
+        {
+            SensorAggregation.MEAN: (21 + 18 + 23) / 3,
+            SensorAggregation.MEDIAN: 21,
+            SensorAggregation.MIN: 18,
+            SensorAggregation.MAX: 23,
+            SensorAggregation.WEIGHTED: (21 + 3 * 18 + 23) / 5,
+        }[aggregation]
+    )
+
+    assert aggregator.update(SENSOR_1, 19) == pytest.approx(expected)
+    assert aggregator.remove(SENSOR_3) == pytest.approx(expected_after_remove)
+
+
+def test_aggregation_no_readings() -> None:
+    """Test the aggregate is unknown when no sensor has a reading."""
+    aggregator = SensorAggregator([SENSOR_1, SENSOR_2], SensorAggregation.MIN)
+
+    assert aggregator.update(SENSOR_1, 20) == 20
+    assert aggregator.remove(SENSOR_1) is None
+    assert aggregator.remove(SENSOR_2) is None
@@ -0,0 +1,54 @@
+"""The tests for the dual_smart_thermostat sensor filter."""
+
+from custom_components.dual_smart_thermostat.sensor_filter import SensorFilter
+
+
+def test_no_filter() -> None:
+    """Test readings pass through without any stage configured."""
+    sensor_filter = SensorFilter()
+
+    assert sensor_filter.process(20.3, 0) == 20.3
+    assert sensor_filter.process(80, 1) == 80
+
+
+def test_median_window() -> None:
+    """Test the median of the last readings is used."""
+    sensor_filter = SensorFilter(median_window=3)
+
+    assert sensor_filter.process(20, 0) == 20
+    assert sensor_filter.process(22, 1) == 21
+    assert sensor_filter.process(21, 2) == 21
+    # a single jitter does not move the median
+    assert sensor_filter.process(25, 3) == 22
+    # the oldest reading leaves the window
+    assert sensor_filter.process(21, 4) == 21
+
+
+def test_ema() -> None:
+    """Test readings are smoothed by the moving average."""
+    sensor_filter = SensorFilter(ema_alpha=0.5)
+
+    assert sensor_filter.process(20, 0) == 20
+    assert sensor_filter.process(22, 1) == 21
+    assert sensor_filter.process(22, 2) == 21.5
+
+
+def test_max_slew_rate() -> None:
+    """Test spikes exceeding the slew rate are rejected."""
+    sensor_filter = SensorFilter(max_slew_rate=1)
+
+    assert sensor_filter.process(20, 0) == 20
+    # 60 degrees in 30 seconds is a spike
+    assert sensor_filter.process(80, 30) is None
+    assert sensor_filter.process(20.2, 60) == 20.2
+    # half a degree in a minute is within the rate
+    assert sensor_filter.process(20.7, 120) == 20.7
+
+
+def test_max_slew_rate_confirmed_jump() -> None:
+    """Test a jump confirmed by the next reading is accepted."""
+    sensor_filter = SensorFilter(max_slew_rate=1)
+
+    assert sensor_filter.process(20, 0) == 20
+    assert sensor_filter.process(25, 10) is None
+    assert sensor_filter.process(25.1, 20) == 25.1
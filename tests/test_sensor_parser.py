@@ -0,0 +1,37 @@
+"""The tests for the dual_smart_thermostat sensor state parser."""
+
+import logging
+
+import pytest
+
+from custom_components.dual_smart_thermostat.sensor_parser import SensorStateParser
+
+
+@pytest.mark.parametrize("state", ["", "nan", "NaN", "inf", "-inf", "None", "abc"])
+def test_parse_bad_state(state) -> None:
+    """Test bad states are rejected."""
+    parser = SensorStateParser("sensor.test")
+
+    assert parser.parse(state) is None
+
+
+def test_parse_state() -> None:
+    """Test valid states are parsed and cached."""
+    parser = SensorStateParser("sensor.test")
+
+    assert parser.parse("20.5") == 20.5
+    assert parser.parse("20.5") == 20.5
+    assert parser.parse("nan") is None
+    assert parser.parse("21") == 21
+
+
+def test_parse_error_log_rate_limited(caplog) -> None:
+    """Test bad states of a sensor are logged once per interval."""
+    parser = SensorStateParser("sensor.test")
+
+    with caplog.at_level(logging.ERROR):
+        for state in ("nan", "", "nan", "inf"):
+            parser.parse(state)
+
+    assert len(caplog.records) == 1
+    assert "sensor.test" in caplog.records[0].getMessage()
@@ -0,0 +1,71 @@
+"""The tests for the dual_smart_thermostat startup coordinator."""
+
+from datetime import timedelta
+
+from homeassistant.const import EVENT_HOMEASSISTANT_START
+from homeassistant.core import CoreState, HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from custom_components.dual_smart_thermostat.keep_alive import KeepAliveScheduler
+from custom_components.dual_smart_thermostat.startup_coordinator import (
+    StartupCoordinator,
+)
+
+from . import common
+
+
+def _action(started: list, key: str):
+    @callback
+    def _async_startup() -> None:
+        started.append(key)
+
+    return _async_startup
+
+
+async def test_startup_when_running(hass: HomeAssistant) -> None:
+    """Test thermostats without window start right away once running."""
+    coordinator = StartupCoordinator.async_get(hass)
+    assert coordinator is StartupCoordinator.async_get(hass)
+    started = []
+
+    coordinator.async_register("climate.test", _action(started, "climate.test"))
+
+    assert started == ["climate.test"]
+    assert coordinator.pending == 0
+    assert coordinator.time_to_ready is not None
+
+
+async def test_startup_staggered(hass: HomeAssistant) -> None:
+    """Test thermostats start after Home Assistant, spread across the window."""
+    hass.set_state(CoreState.starting)
+    coordinator = StartupCoordinator.async_get(hass)
+    window = timedelta(minutes=1)
+    keys = ["climate.test_1", "climate.test_2", "climate.test_3"]
+    started = []
+    for key in keys:
+        coordinator.async_register(key, _action(started, key), window)
+    unsub = coordinator.async_register(
+        "climate.removed", _action(started, "climate.removed"), window
+    )
+    unsub()
+
+    await hass.async_block_till_done()
+    assert started == []
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+    assert started == []
+    assert coordinator.pending == len(keys)
+    assert coordinator.time_to_ready is None
+
+    now = dt_util.utcnow()
+    phases = sorted(KeepAliveScheduler.phase(key, 60) for key in keys)
+    common.async_fire_time_changed(hass, now + timedelta(seconds=phases[0] + 0.1))
+    await hass.async_block_till_done()
+    assert len(started) == 1
+
+    common.async_fire_time_changed(hass, now + window)
+    await hass.async_block_till_done()
+    assert sorted(started) == keys
+    assert coordinator.pending == 0
+    assert coordinator.time_to_ready is not None
@@ -0,0 +1,53 @@
+"""The tests for the dual_smart_thermostat state dispatcher."""
+
+from homeassistant.core import HomeAssistant, callback
+
+from custom_components.dual_smart_thermostat.state_dispatcher import StateDispatcher
+
+SENSOR_1 = "sensor.zone_1"
+SENSOR_2 = "sensor.zone_2"
+SHARED = "binary_sensor.window"
+
+
+def _listener(events: list, name: str):
+    @callback
+    def _async_changed(event) -> None:
+        events.append((name, event.data["entity_id"]))
+
+    return _async_changed
+
+
+async def test_state_dispatcher_shared(hass: HomeAssistant) -> None:
+    """Test the platform shares one dispatcher."""
+    assert StateDispatcher.async_get(hass) is StateDispatcher.async_get(hass)
+
+
+async def test_state_dispatcher_routes_by_entity(hass: HomeAssistant) -> None:
+    """Test state changes reach the listeners tracking the entity only."""
+    dispatcher = StateDispatcher.async_get(hass)
+    events = []
+    unsub_1 = dispatcher.async_track([SENSOR_1, SHARED], _listener(events, "zone_1"))
+    unsub_2 = dispatcher.async_track([SENSOR_2, SHARED], _listener(events, "zone_2"))
+
+    hass.states.async_set(SENSOR_1, 20)
+    hass.states.async_set(SHARED, "on")
+    hass.states.async_set("sensor.other", 20)
+    await hass.async_block_till_done()
+
+    assert events == [
+        ("zone_1", SENSOR_1),
+        ("zone_1", SHARED),
+        ("zone_2", SHARED),
+    ]
+
+    unsub_1()
+    assert sorted(dispatcher.tracked_entities) == [SHARED, SENSOR_2]
+
+    events.clear()
+    hass.states.async_set(SENSOR_1, 21)
+    hass.states.async_set(SHARED, "off")
+    await hass.async_block_till_done()
+    assert events == [("zone_2", SHARED)]
+
+    unsub_2()
+    assert dispatcher.tracked_entities == []
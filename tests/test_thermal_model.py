@@ -0,0 +1,83 @@
+"""The tests for the dual_smart_thermostat thermal model."""
+
+from datetime import timedelta
+import math
+
+import pytest
+
+from custom_components.dual_smart_thermostat.thermal_model import ThermalModel
+
+HORIZON = timedelta(minutes=30)
+
+
+def test_fit() -> None:
+    """Test the fit finds the rates of a simulated zone."""
+    model = ThermalModel(HORIZON)
+    temp = 20.0
+    for minute in range(2 * 24 * 60):
+        heating = minute // 45 % 3 == 0
+        cooling = minute // 45 % 3 == 1 and minute // 180 % 2 == 0
+        outdoor = 5 + 5 * math.sin(minute / 300)
+        model.switch(minute * 60, heating, cooling)
+        if minute % 15 == 0:
+            model.observe(minute * 60, temp, outdoor)
+        temp += (2 * heating - 1.5 * cooling + 0.1 * (outdoor - temp)) / 60
+
+    assert model.samples == 191
+    assert model.ready
+    assert model.heating_rate == pytest.approx(2, rel=0.01)
+    assert model.cooling_rate == pytest.approx(1.5, rel=0.01)
+    assert model.outdoor_coupling == pytest.approx(0.1, rel=0.01)
+
+
+def test_sample_intervals() -> None:
+    """Test short intervals are skipped and long gaps restart the sample."""
+    model = ThermalModel(HORIZON)
+
+    model.observe(0, 20, 10)
+    model.observe(300, 20.1, 10)
+    assert model.samples == 0
+    model.observe(900, 20.2, 10)
+    assert model.samples == 1
+
+    model.observe(20000, 20.3, 10)
+    assert model.samples == 1
+    model.observe(21000, 20.3, None)
+    model.observe(22000, 20.3, 10)
+    assert model.samples == 1
+    model.observe(23000, 20.3, 10)
+    assert model.samples == 2
+
+
+def test_switch_share() -> None:
+    """Test a sample sees the share of the time each switch ran."""
+    model = ThermalModel(HORIZON)
+    temp = 20.0
+    model.observe(0, temp, temp)
+    for start in range(0, 36000, 1800):
+        model.switch(start + 600, True, False)
+        model.switch(start + 1500, False, False)
+        # with the outdoor temperature at the zone the rise is all heating
+        temp += 0.375
+        model.observe(start + 1800, temp, temp)
+
+    assert model.heating_rate == pytest.approx(1.5, rel=0.01)
+    assert model.cooling_rate == 0
+
+
+def test_restore_and_predict() -> None:
+    """Test restored rates predict right away."""
+    model = ThermalModel(HORIZON)
+    assert not model.ready
+
+    model.restore(2.0, 1.0, 0.5, 50)
+    assert model.ready
+    assert model.samples == 50
+    equilibrium = 10 + 2.0 / 0.5
+    assert model.predict(20, 10, True, False) == pytest.approx(
+        equilibrium + (20 - equilibrium) * math.exp(-0.25)
+    )
+
+    model.restore(2.0, 1.0, 0.0, 50)
+    assert model.predict(20, 10, False, True) == 19.5
+    assert model.predict(20, 10, True, True) == 20.5